@@ -41,18 +41,15 @@ def _matern_inf_fn(dists: jnp.ndarray, **kwargs) -> jnp.ndarray:
 def _matern_gen_fn(
     dists: jnp.ndarray, smoothness: float, **kwargs
 ) -> jnp.ndarray:
-    K = dists
-    diag_indices = jnp.arange(K.shape[1])
-    if len(K.shape) == 3:
-        K = K.at[:, diag_indices, diag_indices].set(1.0)
+    # Zero distances, which appear along the diagonals of dense kernel tensors
+    # and within packed kernel tensors, take the limiting value 1. Evaluating
+    # them at 1 instead keeps the Bessel function finite.
+    zeros = dists == 0.0
+    K = jnp.where(zeros, 1.0, dists)
     tmp = jnp.sqrt(2 * smoothness) * K
     const_val = (2 ** (1.0 - smoothness)) / jnp.exp(gammaln(smoothness))
-    if len(K.shape) == 2:
-        K = K.at[:, :].set(const_val)
-    elif len(K.shape) == 3:
-        K = K.at[:, :, :].set(const_val)
+    K = jnp.full(K.shape, const_val)
     K *= tmp**smoothness
     K *= tfp.math.bessel_kve(smoothness, tmp) / jnp.exp(jnp.abs(tmp))
-    if len(K.shape) == 3:
-        K = K.at[:, jnp.arange(K.shape[1]), jnp.arange(K.shape[1])].set(1.0)
+    K = jnp.where(zeros, 1.0, K)
     return K
@@ -3,38 +3,73 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Optional
 
 from scipy.special import gamma, kv
 
 import MuyGPyS._src.math.numpy as np
 
+# The kernel functions below write into `out` in place when it is given, which
+# may alias their distance tensor argument.
 
-def _rbf_fn(squared_dists: np.ndarray, **kwargs) -> np.ndarray:
-    return np.exp(-squared_dists / 2.0)
+
+def _rbf_fn(
+    squared_dists: np.ndarray, out: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    K = np.divide(squared_dists, -2.0, out=out)
+    return np.exp(K, out=K)
 
 
-def _matern_05_fn(dists: np.ndarray, **kwargs) -> np.ndarray:
-    return np.exp(-dists)
+def _matern_05_fn(
+    dists: np.ndarray, out: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    K = np.negative(dists, out=out)
+    return np.exp(K, out=K)
 
 
-def _matern_15_fn(dists: np.ndarray, **kwargs) -> np.ndarray:
-    K = dists * np.sqrt(3)
-    return (1.0 + K) * np.exp(-K)
+def _matern_15_fn(
+    dists: np.ndarray, out: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    K = np.multiply(dists, np.sqrt(3), out=out)
+    exp_K = np.negative(K)
+    np.exp(exp_K, out=exp_K)
+    K += 1.0
+    K *= exp_K
+    return K
 
 
-def _matern_25_fn(dists: np.ndarray, **kwargs) -> np.ndarray:
-    K = dists * np.sqrt(5)
-    return (1.0 + K + K**2 / 3.0) * np.exp(-K)
+def _matern_25_fn(
+    dists: np.ndarray, out: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    K = np.multiply(dists, np.sqrt(5), out=out)
+    exp_K = np.negative(K)
+    np.exp(exp_K, out=exp_K)
+    poly_K = np.square(K)
+    poly_K /= 3.0
+    K += 1.0
+    K += poly_K
+    K *= exp_K
+    return K
 
 
-def _matern_inf_fn(dists: np.ndarray, **kwargs) -> np.ndarray:
-    return np.exp(-(dists**2) / 2.0)
+def _matern_inf_fn(
+    dists: np.ndarray, out: Optional[np.ndarray] = None, **kwargs
+) -> np.ndarray:
+    K = np.square(dists, out=out)
+    K /= -2.0
+    return np.exp(K, out=K)
 
 
 def _matern_gen_fn(
-    dists: np.ndarray, smoothness: float, **kwargs
+    dists: np.ndarray,
+    smoothness: float,
+    out: Optional[np.ndarray] = None,
+    **kwargs,
 ) -> np.ndarray:
     K = dists
+    if out is not None and out is not dists:
+        out[...] = dists
+        K = out
     K[K == 0.0] += np.finfo(float).eps
     tmp = np.sqrt(2 * smoothness) * K
     K.fill((2 ** (1.0 - smoothness)) / gamma(smoothness))
@@ -11,6 +11,16 @@ from MuyGPyS._src.util import _collect_implementation
     _muygps_fast_posterior_mean,
     _muygps_fast_posterior_mean_precompute,
     _mmuygps_fast_posterior_mean,
+    _muygps_cholesky_factor,
+    _muygps_cholesky_whiten,
+    _muygps_cholesky_solve,
+    _muygps_eigen_factor,
+    _muygps_eigen_rotate,
+    _muygps_eigen_whiten,
+    _muygps_eigen_solve,
+    _muygps_whitened_posterior_mean,
+    _muygps_whitened_diagonal_variance,
+    _muygps_posterior,
 ) = _collect_implementation(
     "MuyGPyS._src.gp.muygps",
     "_muygps_posterior_mean",
@@ -18,4 +28,14 @@ from MuyGPyS._src.util import _collect_implementation
     "_muygps_fast_posterior_mean",
     "_muygps_fast_posterior_mean_precompute",
     "_mmuygps_fast_posterior_mean",
+    "_muygps_cholesky_factor",
+    "_muygps_cholesky_whiten",
+    "_muygps_cholesky_solve",
+    "_muygps_eigen_factor",
+    "_muygps_eigen_rotate",
+    "_muygps_eigen_whiten",
+    "_muygps_eigen_solve",
+    "_muygps_whitened_posterior_mean",
+    "_muygps_whitened_diagonal_variance",
+    "_muygps_posterior",
 )
@@ -3,7 +3,10 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Tuple
+
 from jax import jit
+from jax.scipy.linalg import cho_solve, solve_triangular
 
 import MuyGPyS._src.math.jax as jnp
 
@@ -60,3 +63,99 @@ def _muygps_fast_posterior_mean_precompute(
     train_nn_targets_fast: jnp.ndarray,
 ) -> jnp.ndarray:
     return jnp.linalg.solve(K, train_nn_targets_fast)
+
+
+@jit
+def _muygps_cholesky_factor(K: jnp.ndarray) -> jnp.ndarray:
+    return jnp.linalg.cholesky(K)
+
+
+@jit
+def _muygps_cholesky_whiten(L: jnp.ndarray, B: jnp.ndarray) -> jnp.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return solve_triangular(
+        L, B.reshape(batch_count, nn_count, -1), lower=True
+    ).reshape(B.shape)
+
+
+@jit
+def _muygps_cholesky_solve(L: jnp.ndarray, B: jnp.ndarray) -> jnp.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return cho_solve((L, True), B.reshape(batch_count, nn_count, -1)).reshape(
+        B.shape
+    )
+
+
+@jit
+def _muygps_eigen_factor(K: jnp.ndarray) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    return jnp.linalg.eigh(K)
+
+
+@jit
+def _muygps_eigen_rotate(Q: jnp.ndarray, B: jnp.ndarray) -> jnp.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return jnp.einsum(
+        "ijk,ijl->ikl", Q, B.reshape(batch_count, nn_count, -1)
+    ).reshape(B.shape)
+
+
+@jit
+def _muygps_eigen_whiten(
+    eigenvalues: jnp.ndarray, rotated: jnp.ndarray, noise: float
+) -> jnp.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return (
+        rotated.reshape(batch_count, nn_count, -1)
+        / jnp.sqrt(eigenvalues + noise)[:, :, None]
+    ).reshape(rotated.shape)
+
+
+@jit
+def _muygps_eigen_solve(
+    Q: jnp.ndarray, eigenvalues: jnp.ndarray, rotated: jnp.ndarray, noise: float
+) -> jnp.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return jnp.einsum(
+        "ijk,ikl->ijl",
+        Q,
+        rotated.reshape(batch_count, nn_count, -1)
+        / (eigenvalues + noise)[:, :, None],
+    ).reshape(rotated.shape)
+
+
+@jit
+def _muygps_whitened_posterior_mean(
+    Kcross_whitened: jnp.ndarray,
+    batch_nn_targets_whitened: jnp.ndarray,
+) -> jnp.ndarray:
+    return jnp.einsum("ij,ijk->ik", Kcross_whitened, batch_nn_targets_whitened)
+
+
+@jit
+def _muygps_whitened_diagonal_variance(
+    Kcross_whitened: jnp.ndarray,
+) -> jnp.ndarray:
+    return 1 - jnp.sum(Kcross_whitened**2, axis=1)
+
+
+@jit
+def _muygps_posterior(
+    K: jnp.ndarray,
+    Kcross: jnp.ndarray,
+    batch_nn_targets: jnp.ndarray,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    batch_count, nn_count, response_count = batch_nn_targets.shape
+    whitened = _muygps_cholesky_whiten(
+        _muygps_cholesky_factor(K),
+        jnp.concatenate(
+            (batch_nn_targets, Kcross.reshape(batch_count, nn_count, 1)),
+            axis=2,
+        ),
+    )
+    Kcross_whitened = whitened[:, :, response_count]
+    return (
+        _muygps_whitened_posterior_mean(
+            Kcross_whitened, whitened[:, :, :response_count]
+        ),
+        _muygps_whitened_diagonal_variance(Kcross_whitened),
+    )
@@ -2,36 +2,23 @@
 # MuyGPyS Project Developers. See the top-level COPYRIGHT file for details.
 #
 # SPDX-License-Identifier: MIT
-import MuyGPyS._src.math.numpy as np
+
+# These functions act independently upon each batch element, so each rank
+# evaluates them upon its own chunk of the distributed tensors.
 from MuyGPyS._src.gp.muygps.numpy import (
     _muygps_posterior_mean,
     _muygps_diagonal_variance,
+    _muygps_fast_posterior_mean,
+    _mmuygps_fast_posterior_mean,
+    _muygps_fast_posterior_mean_precompute,
+    _muygps_cholesky_factor,
+    _muygps_cholesky_whiten,
+    _muygps_cholesky_solve,
+    _muygps_eigen_factor,
+    _muygps_eigen_rotate,
+    _muygps_eigen_whiten,
+    _muygps_eigen_solve,
+    _muygps_whitened_posterior_mean,
+    _muygps_whitened_diagonal_variance,
+    _muygps_posterior,
 )
-
-
-def _muygps_fast_posterior_mean(
-    Kcross: np.ndarray,
-    coeffs_tensor: np.ndarray,
-) -> np.ndarray:
-    raise NotImplementedError(
-        'Function "muygps_fast_posterior_mean" does not support mpi!'
-    )
-
-
-def _mmuygps_fast_posterior_mean(
-    Kcross: np.ndarray,
-    coeffs_tensor: np.ndarray,
-) -> np.ndarray:
-    raise NotImplementedError(
-        'Function "mmuygps_fast_posterior_mean" does not support mpi!'
-    )
-
-
-def _muygps_fast_posterior_mean_precompute(
-    K: np.ndarray,
-    train_nn_targets_fast: np.ndarray,
-    **kwargs,
-) -> np.ndarray:
-    raise NotImplementedError(
-        'Function "muygps_fast_posterior_mean_precompute" does not support mpi!'
-    )
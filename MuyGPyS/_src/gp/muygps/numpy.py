@@ -3,6 +3,10 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Tuple
+
+from scipy.linalg import get_lapack_funcs
+
 import MuyGPyS._src.math.numpy as np
 
 
@@ -56,3 +60,118 @@ def _muygps_fast_posterior_mean_precompute(
     **kwargs,
 ) -> np.ndarray:
     return np.linalg.solve(K, train_nn_targets_fast)
+
+
+def _muygps_cholesky_factor(K: np.ndarray) -> np.ndarray:
+    return np.linalg.cholesky(K)
+
+
+def _muygps_cholesky_whiten(L: np.ndarray, B: np.ndarray) -> np.ndarray:
+    # numpy has no batched triangular solve, so call LAPACK once per batch
+    # element.
+    batch_count, nn_count = B.shape[:2]
+    B3 = B.reshape(batch_count, nn_count, -1)
+    (trtrs,) = get_lapack_funcs(("trtrs",), (L, B3))
+    W = np.empty_like(B3)
+    for i in range(batch_count):
+        W[i], info = trtrs(L[i], B3[i], lower=1)
+        _check_lapack_info(info)
+    return W.reshape(B.shape)
+
+
+def _muygps_cholesky_solve(L: np.ndarray, B: np.ndarray) -> np.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    B3 = B.reshape(batch_count, nn_count, -1)
+    (potrs,) = get_lapack_funcs(("potrs",), (L, B3))
+    X = np.empty_like(B3)
+    for i in range(batch_count):
+        # potrs does not inspect the pivots of the factor, so check for a zero
+        # pivot here as trtrs does.
+        if np.any(L[i].diagonal() == 0.0):
+            raise np.linalg.LinAlgError("Singular matrix")
+        X[i], info = potrs(L[i], B3[i], lower=1)
+        _check_lapack_info(info)
+    return X.reshape(B.shape)
+
+
+def _check_lapack_info(info: int) -> None:
+    # Mirror the errors that the np.linalg routines raise upon failure.
+    if info > 0:
+        raise np.linalg.LinAlgError("Singular matrix")
+    if info < 0:
+        raise np.linalg.LinAlgError(
+            f"Illegal value in argument {-info} of the LAPACK routine"
+        )
+
+
+def _muygps_eigen_factor(K: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    return np.linalg.eigh(K)
+
+
+def _muygps_eigen_rotate(Q: np.ndarray, B: np.ndarray) -> np.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return np.einsum(
+        "ijk,ijl->ikl", Q, B.reshape(batch_count, nn_count, -1)
+    ).reshape(B.shape)
+
+
+def _muygps_eigen_whiten(
+    eigenvalues: np.ndarray, rotated: np.ndarray, noise: float
+) -> np.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return (
+        rotated.reshape(batch_count, nn_count, -1)
+        / np.sqrt(eigenvalues + noise)[:, :, None]
+    ).reshape(rotated.shape)
+
+
+def _muygps_eigen_solve(
+    Q: np.ndarray, eigenvalues: np.ndarray, rotated: np.ndarray, noise: float
+) -> np.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return np.einsum(
+        "ijk,ikl->ijl",
+        Q,
+        rotated.reshape(batch_count, nn_count, -1)
+        / (eigenvalues + noise)[:, :, None],
+    ).reshape(rotated.shape)
+
+
+def _muygps_whitened_posterior_mean(
+    Kcross_whitened: np.ndarray,
+    batch_nn_targets_whitened: np.ndarray,
+    **kwargs,
+) -> np.ndarray:
+    return np.einsum("ij,ijk->ik", Kcross_whitened, batch_nn_targets_whitened)
+
+
+def _muygps_whitened_diagonal_variance(
+    Kcross_whitened: np.ndarray,
+    **kwargs,
+) -> np.ndarray:
+    return 1 - np.sum(Kcross_whitened**2, axis=1)
+
+
+def _muygps_posterior(
+    K: np.ndarray,
+    Kcross: np.ndarray,
+    batch_nn_targets: np.ndarray,
+    **kwargs,
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Whiten the targets and the cross-covariance together, so that both
+    # moments share a single factorization and forward substitution.
+    batch_count, nn_count, response_count = batch_nn_targets.shape
+    whitened = _muygps_cholesky_whiten(
+        _muygps_cholesky_factor(K),
+        np.concatenate(
+            (batch_nn_targets, Kcross.reshape(batch_count, nn_count, 1)),
+            axis=2,
+        ),
+    )
+    Kcross_whitened = whitened[:, :, response_count]
+    return (
+        _muygps_whitened_posterior_mean(
+            Kcross_whitened, whitened[:, :, :response_count]
+        ),
+        _muygps_whitened_diagonal_variance(Kcross_whitened),
+    )
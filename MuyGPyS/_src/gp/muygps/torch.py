@@ -3,6 +3,8 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Tuple
+
 import MuyGPyS._src.math.torch as torch
 
 
@@ -53,3 +55,98 @@ def _muygps_fast_posterior_mean_precompute(
     train_nn_targets_fast: torch.ndarray,
 ) -> torch.ndarray:
     return torch.linalg.solve(K, train_nn_targets_fast)
+
+
+def _muygps_cholesky_factor(K: torch.ndarray) -> torch.ndarray:
+    return torch.linalg.cholesky(K)
+
+
+def _muygps_cholesky_whiten(
+    L: torch.ndarray, B: torch.ndarray
+) -> torch.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return torch.linalg.solve_triangular(
+        L, B.reshape(batch_count, nn_count, -1), upper=False
+    ).reshape(B.shape)
+
+
+def _muygps_cholesky_solve(L: torch.ndarray, B: torch.ndarray) -> torch.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return torch.cholesky_solve(
+        B.reshape(batch_count, nn_count, -1), L, upper=False
+    ).reshape(B.shape)
+
+
+def _muygps_eigen_factor(
+    K: torch.ndarray,
+) -> Tuple[torch.ndarray, torch.ndarray]:
+    return torch.linalg.eigh(K)
+
+
+def _muygps_eigen_rotate(Q: torch.ndarray, B: torch.ndarray) -> torch.ndarray:
+    batch_count, nn_count = B.shape[:2]
+    return torch.einsum(
+        "ijk,ijl->ikl", Q, B.reshape(batch_count, nn_count, -1)
+    ).reshape(B.shape)
+
+
+def _muygps_eigen_whiten(
+    eigenvalues: torch.ndarray, rotated: torch.ndarray, noise: float
+) -> torch.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return (
+        rotated.reshape(batch_count, nn_count, -1)
+        / torch.sqrt(eigenvalues + noise)[:, :, None]
+    ).reshape(rotated.shape)
+
+
+def _muygps_eigen_solve(
+    Q: torch.ndarray,
+    eigenvalues: torch.ndarray,
+    rotated: torch.ndarray,
+    noise: float,
+) -> torch.ndarray:
+    batch_count, nn_count = rotated.shape[:2]
+    return torch.einsum(
+        "ijk,ikl->ijl",
+        Q,
+        rotated.reshape(batch_count, nn_count, -1)
+        / (eigenvalues + noise)[:, :, None],
+    ).reshape(rotated.shape)
+
+
+def _muygps_whitened_posterior_mean(
+    Kcross_whitened: torch.ndarray,
+    batch_nn_targets_whitened: torch.ndarray,
+) -> torch.ndarray:
+    return torch.einsum(
+        "ij,ijk->ik", Kcross_whitened, batch_nn_targets_whitened
+    )
+
+
+def _muygps_whitened_diagonal_variance(
+    Kcross_whitened: torch.ndarray,
+) -> torch.ndarray:
+    return 1 - torch.sum(Kcross_whitened**2, axis=1)
+
+
+def _muygps_posterior(
+    K: torch.ndarray,
+    Kcross: torch.ndarray,
+    batch_nn_targets: torch.ndarray,
+) -> Tuple[torch.ndarray, torch.ndarray]:
+    batch_count, nn_count, response_count = batch_nn_targets.shape
+    whitened = _muygps_cholesky_whiten(
+        _muygps_cholesky_factor(K),
+        torch.cat(
+            (batch_nn_targets, Kcross.reshape(batch_count, nn_count, 1)),
+            dim=2,
+        ),
+    )
+    Kcross_whitened = whitened[:, :, response_count]
+    return (
+        _muygps_whitened_posterior_mean(
+            Kcross_whitened, whitened[:, :, :response_count]
+        ),
+        _muygps_whitened_diagonal_variance(Kcross_whitened),
+    )
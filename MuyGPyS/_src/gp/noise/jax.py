@@ -3,23 +3,40 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Optional
+
 from jax import jit
 
 import MuyGPyS._src.math.jax as jnp
+from MuyGPyS._src.gp.tensors.jax import (
+    _packed_diagonal_indices,
+    _packed_nn_count,
+)
 
 
 @jit
 def _homoscedastic_perturb(
-    K: jnp.ndarray, noise_variance: float
+    K: jnp.ndarray, noise_variance: float, out: Optional[jnp.ndarray] = None
 ) -> jnp.ndarray:
+    # jax arrays are immutable, so `out` is ignored.
+    if len(K.shape) == 2:
+        _, packed_count = K.shape
+        diagonal = _packed_diagonal_indices(_packed_nn_count(packed_count))
+        return K.at[:, diagonal].add(noise_variance)
     _, nn_count, _ = K.shape
     return K + noise_variance * jnp.eye(nn_count)
 
 
 @jit
 def _heteroscedastic_perturb(
-    K: jnp.ndarray, noise_variances: jnp.ndarray
+    K: jnp.ndarray,
+    noise_variances: jnp.ndarray,
+    out: Optional[jnp.ndarray] = None,
 ) -> jnp.ndarray:
+    if len(K.shape) == 2:
+        _, packed_count = K.shape
+        diagonal = _packed_diagonal_indices(_packed_nn_count(packed_count))
+        return K.at[:, diagonal].add(noise_variances)
     batch_count, nn_count, _ = K.shape
     ret = K.copy()
     indices = (
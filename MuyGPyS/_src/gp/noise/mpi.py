@@ -3,10 +3,14 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Optional
+
 from MuyGPyS._src.gp.noise.numpy import _homoscedastic_perturb, np
 
 
 def _heteroscedastic_perturb(
-    K: np.ndarray, noise_variances: np.ndarray
+    K: np.ndarray,
+    noise_variances: np.ndarray,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     raise NotImplementedError("heteroscedastic noise does not support mpi!")
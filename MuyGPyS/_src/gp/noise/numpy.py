@@ -3,23 +3,50 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Optional, Tuple
+
 import MuyGPyS._src.math.numpy as np
+from MuyGPyS._src.gp.tensors.numpy import (
+    _packed_diagonal_indices,
+    _packed_nn_count,
+)
 
 
-def _homoscedastic_perturb(K: np.ndarray, noise_variance: float) -> np.ndarray:
-    _, nn_count, _ = K.shape
-    return K + noise_variance * np.eye(nn_count)
+def _homoscedastic_perturb(
+    K: np.ndarray, noise_variance: float, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    ret = _perturb_output(K, out)
+    ret[_diagonal_indices(K)] += noise_variance
+    return ret
 
 
 def _heteroscedastic_perturb(
-    K: np.ndarray, noise_variances: np.ndarray
+    K: np.ndarray,
+    noise_variances: np.ndarray,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
-    ret = K.copy()
-    batch_count, nn_count, _ = K.shape
-    indices = (
-        np.repeat(range(batch_count), nn_count),
-        np.tile(np.arange(nn_count), batch_count),
-        np.tile(np.arange(nn_count), batch_count),
-    )
-    ret[indices] += noise_variances.flatten()
+    ret = _perturb_output(K, out)
+    ret[_diagonal_indices(K)] += noise_variances
     return ret
+
+
+def _perturb_output(K: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    # Copy `K` into the tensor to be perturbed, so that its diagonal can be
+    # updated in place without modifying `K` unless `out` is `K`.
+    if out is None:
+        return K.copy()
+    if out is not K:
+        out[...] = K
+    return out
+
+
+def _diagonal_indices(K: np.ndarray) -> Tuple:
+    if len(K.shape) == 2:
+        _, packed_count = K.shape
+        return (
+            slice(None),
+            _packed_diagonal_indices(_packed_nn_count(packed_count)),
+        )
+    _, nn_count, _ = K.shape
+    diagonal = np.arange(nn_count)
+    return slice(None), diagonal, diagonal
@@ -3,25 +3,52 @@
 #
 # SPDX-License-Identifier: MIT
 
+from typing import Optional, Tuple
+
 import MuyGPyS._src.math.torch as torch
+from MuyGPyS._src.gp.tensors.torch import (
+    _packed_diagonal_indices,
+    _packed_nn_count,
+)
 
 
 def _homoscedastic_perturb(
-    K: torch.ndarray, noise_variance: float
+    K: torch.ndarray, noise_variance: float, out: Optional[torch.ndarray] = None
 ) -> torch.ndarray:
-    _, nn_count, _ = K.shape
-    return K + noise_variance * torch.eye(nn_count)
+    ret = _perturb_output(K, out)
+    ret[_diagonal_indices(K)] += noise_variance
+    return ret
 
 
 def _heteroscedastic_perturb(
-    K: torch.ndarray, noise_variances: torch.ndarray
+    K: torch.ndarray,
+    noise_variances: torch.ndarray,
+    out: Optional[torch.ndarray] = None,
 ) -> torch.ndarray:
-    ret = K.clone()
-    batch_count, nn_count, _ = K.shape
-    indices = (
-        torch.repeat(torch.arange(batch_count), nn_count),
-        torch.arange(nn_count).repeat(batch_count),
-        torch.arange(nn_count).repeat(batch_count),
-    )
-    ret[indices] += noise_variances.flatten()
+    ret = _perturb_output(K, out)
+    ret[_diagonal_indices(K)] += noise_variances
     return ret
+
+
+def _perturb_output(
+    K: torch.ndarray, out: Optional[torch.ndarray]
+) -> torch.ndarray:
+    # Copy `K` into the tensor to be perturbed, so that its diagonal can be
+    # updated in place without modifying `K` unless `out` is `K`.
+    if out is None:
+        return K.clone()
+    if out is not K:
+        out.copy_(K)
+    return out
+
+
+def _diagonal_indices(K: torch.ndarray) -> Tuple:
+    if len(K.shape) == 2:
+        _, packed_count = K.shape
+        return (
+            slice(None),
+            _packed_diagonal_indices(_packed_nn_count(packed_count)),
+        )
+    _, nn_count, _ = K.shape
+    diagonal = torch.arange(nn_count)
+    return slice(None), diagonal, diagonal
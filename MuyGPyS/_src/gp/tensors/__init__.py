@@ -9,27 +9,58 @@ from MuyGPyS._src.util import _collect_implementation
     _make_predict_tensors,
     _make_fast_predict_tensors,
     _make_train_tensors,
+    _make_predict_sq_dists_tensors,
+    _make_train_sq_dists_tensors,
+    _make_predict_kernels,
     _batch_features_tensor,
     _crosswise_differences,
     _crosswise_tensor,
     _pairwise_differences,
     _pairwise_tensor,
+    _crosswise_sq_distances,
+    _crosswise_sq_dists_tensor,
+    _pairwise_sq_distances,
+    _pairwise_sq_dists_tensor,
     _fast_nn_update,
+    _fast_coefficients_tensor,
+    _locality_order,
+    _inverse_order,
     _make_heteroscedastic_tensor,
     _F2,
     _l2,
+    _pack_pairwise_tensor,
+    _unpack_pairwise_tensor,
 ) = _collect_implementation(
     "MuyGPyS._src.gp.tensors",
     "_make_predict_tensors",
     "_make_fast_predict_tensors",
     "_make_train_tensors",
+    "_make_predict_sq_dists_tensors",
+    "_make_train_sq_dists_tensors",
+    "_make_predict_kernels",
     "_batch_features_tensor",
     "_crosswise_differences",
     "_crosswise_tensor",
     "_pairwise_differences",
     "_pairwise_tensor",
+    "_crosswise_sq_distances",
+    "_crosswise_sq_dists_tensor",
+    "_pairwise_sq_distances",
+    "_pairwise_sq_dists_tensor",
     "_fast_nn_update",
+    "_fast_coefficients_tensor",
+    "_locality_order",
+    "_inverse_order",
     "_make_heteroscedastic_tensor",
     "_F2",
     "_l2",
+    "_pack_pairwise_tensor",
+    "_unpack_pairwise_tensor",
 )
+
+
+def _expand_kernel_tensor(K):
+    # Packed kernel tensors are only expanded immediately ahead of a solve.
+    if len(K.shape) == 2:
+        return _unpack_pairwise_tensor(K)
+    return K
@@ -4,7 +4,8 @@
 # SPDX-License-Identifier: MIT
 
 from functools import partial
-from typing import Tuple
+from math import isqrt
+from typing import Callable, Optional, Tuple
 
 from jax import jit
 
@@ -41,14 +42,17 @@ def _make_fast_predict_tensors(
     return pairwise_diffs_fast, batch_nn_targets_fast
 
 
-@jit
+@partial(jit, static_argnames=("packed",))
 def _make_predict_tensors(
     batch_indices: jnp.ndarray,
     batch_nn_indices: jnp.ndarray,
     test_features: jnp.ndarray,
     train_features: jnp.ndarray,
     train_targets: jnp.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
 ) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    # jax arrays are immutable, so `out` is ignored.
     if test_features is None:
         test_features = train_features
     crosswise_diffs = _crosswise_tensor(
@@ -57,17 +61,50 @@ def _make_predict_tensors(
         batch_indices,
         batch_nn_indices,
     )
-    pairwise_diffs = _pairwise_tensor(train_features, batch_nn_indices)
+    if packed is True:
+        pairwise_diffs = _packed_pairwise_tensor(
+            train_features, batch_nn_indices
+        )
+    else:
+        pairwise_diffs = _pairwise_tensor(train_features, batch_nn_indices)
     batch_nn_targets = train_targets[batch_nn_indices, :]
     return crosswise_diffs, pairwise_diffs, batch_nn_targets
 
 
-@jit
+@partial(jit, static_argnames=("packed",))
+def _make_predict_sq_dists_tensors(
+    batch_indices: jnp.ndarray,
+    batch_nn_indices: jnp.ndarray,
+    test_features: jnp.ndarray,
+    train_features: jnp.ndarray,
+    train_targets: jnp.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    if test_features is None:
+        test_features = train_features
+    crosswise_sq_dists = _crosswise_sq_dists_tensor(
+        test_features, train_features, batch_indices, batch_nn_indices
+    )
+    if packed is True:
+        pairwise_sq_dists = _packed_pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices
+        )
+    else:
+        pairwise_sq_dists = _pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices
+        )
+    batch_nn_targets = train_targets[batch_nn_indices, :]
+    return crosswise_sq_dists, pairwise_sq_dists, batch_nn_targets
+
+
+@partial(jit, static_argnames=("packed",))
 def _make_train_tensors(
     batch_indices: jnp.ndarray,
     batch_nn_indices: jnp.ndarray,
     train_features: jnp.ndarray,
     train_targets: jnp.ndarray,
+    packed: bool = False,
 ) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
     crosswise_diffs, pairwise_diffs, batch_nn_targets = _make_predict_tensors(
         batch_indices,
@@ -75,11 +112,84 @@ def _make_train_tensors(
         train_features,
         train_features,
         train_targets,
+        packed=packed,
     )
     batch_targets = train_targets[batch_indices, :]
     return crosswise_diffs, pairwise_diffs, batch_targets, batch_nn_targets
 
 
+@partial(jit, static_argnames=("packed",))
+def _make_train_sq_dists_tensors(
+    batch_indices: jnp.ndarray,
+    batch_nn_indices: jnp.ndarray,
+    train_features: jnp.ndarray,
+    train_targets: jnp.ndarray,
+    packed: bool = False,
+) -> Tuple[jnp.ndarray, jnp.ndarray, jnp.ndarray, jnp.ndarray]:
+    (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_nn_targets,
+    ) = _make_predict_sq_dists_tensors(
+        batch_indices,
+        batch_nn_indices,
+        train_features,
+        train_features,
+        train_targets,
+        packed=packed,
+    )
+    batch_targets = train_targets[batch_indices, :]
+    return (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_targets,
+        batch_nn_targets,
+    )
+
+
+def _make_predict_kernels(
+    kernel_fn: Callable,
+    batch_indices: jnp.ndarray,
+    batch_nn_indices: jnp.ndarray,
+    test_features: jnp.ndarray,
+    train_features: jnp.ndarray,
+    tensor_form: str,
+    tile_count: int,
+    out: Optional[Tuple] = None,
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    # jax arrays are immutable, so the tiles are concatenated once at the end
+    # rather than assigned into preallocated outputs.
+    if test_features is None:
+        test_features = train_features
+    batch_count, _ = batch_nn_indices.shape
+    K_tiles = list()
+    Kcross_tiles = list()
+    for start in range(0, batch_count, tile_count):
+        tile = slice(start, start + tile_count)
+        crosswise, pairwise = _tile_tensors(
+            test_features[batch_indices[tile]],
+            train_features[batch_nn_indices[tile]],
+            tensor_form,
+        )
+        K_tiles.append(kernel_fn(pairwise, tensor_form=tensor_form))
+        Kcross_tiles.append(kernel_fn(crosswise, tensor_form=tensor_form))
+    return jnp.concatenate(K_tiles), jnp.concatenate(Kcross_tiles)
+
+
+def _tile_tensors(
+    locations: jnp.ndarray, points: jnp.ndarray, tensor_form: str
+) -> Tuple[jnp.ndarray, jnp.ndarray]:
+    if tensor_form == "sq_dists":
+        return (
+            _crosswise_sq_distances(locations, points),
+            _pairwise_sq_distances(points),
+        )
+    return (
+        _crosswise_differences(locations, points),
+        _pairwise_differences(points),
+    )
+
+
 @jit
 def _batch_features_tensor(
     features: jnp.ndarray,
@@ -126,6 +236,105 @@ def _pairwise_tensor(
     return _pairwise_differences(points)
 
 
+@jit
+def _crosswise_sq_dists_tensor(
+    data: jnp.ndarray,
+    nn_data: jnp.ndarray,
+    data_indices: jnp.ndarray,
+    nn_indices: jnp.ndarray,
+) -> jnp.ndarray:
+    locations = data[data_indices]
+    points = nn_data[nn_indices]
+    return _crosswise_sq_distances(locations, points)
+
+
+@jit
+def _pairwise_sq_dists_tensor(
+    data: jnp.ndarray,
+    nn_indices: jnp.ndarray,
+) -> jnp.ndarray:
+    points = data[nn_indices]
+    return _pairwise_sq_distances(points)
+
+
+@jit
+def _crosswise_sq_distances(
+    locations: jnp.ndarray, points: jnp.ndarray
+) -> jnp.ndarray:
+    return _F2(_crosswise_differences(locations, points))
+
+
+@jit
+def _pairwise_sq_distances(points: jnp.ndarray) -> jnp.ndarray:
+    if len(points.shape) not in (2, 3):
+        raise ValueError(f"points shape {points.shape} is not supported.")
+    points = points - jnp.mean(points, axis=-2, keepdims=True)
+    sq_norms = jnp.sum(points**2, axis=-1)
+    sq_dists = (
+        sq_norms[..., :, None]
+        + sq_norms[..., None, :]
+        - 2 * (points @ points.swapaxes(-1, -2))
+    )
+    diagonal = jnp.arange(sq_dists.shape[-1])
+    sq_dists = sq_dists.at[..., diagonal, diagonal].set(0.0)
+    return jnp.clip(sq_dists, 0.0)
+
+
+def _packed_nn_count(packed_count: int) -> int:
+    nn_count = (isqrt(8 * packed_count + 1) - 1) // 2
+    if nn_count * (nn_count + 1) // 2 != packed_count:
+        raise ValueError(
+            f"{packed_count} is not the size of a packed triangular matrix"
+        )
+    return nn_count
+
+
+def _packed_diagonal_indices(nn_count: int) -> jnp.ndarray:
+    indices = jnp.arange(nn_count)
+    return indices * nn_count - indices * (indices - 1) // 2
+
+
+@jit
+def _packed_pairwise_tensor(
+    data: jnp.ndarray,
+    nn_indices: jnp.ndarray,
+) -> jnp.ndarray:
+    points = data[nn_indices]
+    _, nn_count, _ = points.shape
+    # Gather the upper triangle's pairs directly, so that the dense pairwise
+    # tensor is never formed.
+    rows, cols = jnp.triu_indices(nn_count)
+    return points[:, rows] - points[:, cols]
+
+
+@jit
+def _packed_pairwise_sq_dists_tensor(
+    data: jnp.ndarray,
+    nn_indices: jnp.ndarray,
+) -> jnp.ndarray:
+    points = data[nn_indices]
+    _, nn_count, _ = points.shape
+    rows, cols = jnp.triu_indices(nn_count)
+    return jnp.sum((points[:, rows] - points[:, cols]) ** 2, axis=-1)
+
+
+@jit
+def _pack_pairwise_tensor(tensor: jnp.ndarray) -> jnp.ndarray:
+    _, nn_count = tensor.shape[:2]
+    rows, cols = jnp.triu_indices(nn_count)
+    return tensor[:, rows, cols]
+
+
+@jit
+def _unpack_pairwise_tensor(packed: jnp.ndarray) -> jnp.ndarray:
+    batch_count, packed_count = packed.shape
+    nn_count = _packed_nn_count(packed_count)
+    rows, cols = jnp.triu_indices(nn_count)
+    tensor = jnp.zeros((batch_count, nn_count, nn_count))
+    tensor = tensor.at[:, rows, cols].set(packed)
+    return tensor.at[:, cols, rows].set(packed)
+
+
 @jit
 def _F2(diffs: jnp.ndarray) -> jnp.ndarray:
     return jnp.sum(diffs**2, axis=-1)
@@ -136,6 +345,39 @@ def _l2(diffs: jnp.ndarray) -> jnp.ndarray:
     return jnp.sqrt(_F2(diffs))
 
 
+@jit
+def _locality_order(batch_features: jnp.ndarray) -> jnp.ndarray:
+    # Order the batch along a Z-order (Morton) curve through its features. The
+    # codes must fit in the configured integer type, which is 32 bits wide
+    # unless 64 bit types are enabled.
+    batch_count, feature_count = batch_features.shape
+    code_bits = 62 if jnp.itype == jnp.int64 else 30
+    feature_count = min(feature_count, code_bits)
+    bits = min(16, code_bits // feature_count)
+    features = batch_features[:, :feature_count]
+    lower = jnp.min(features, axis=0)
+    span = jnp.clip(jnp.max(features, axis=0) - lower, 1e-30)
+    grid = ((features - lower) / span * (2**bits - 1)).astype(jnp.itype)
+    codes = jnp.zeros(batch_count, dtype=jnp.itype)
+    for bit in range(bits):
+        for i in range(feature_count):
+            codes |= ((grid[:, i] >> bit) & 1) << (bit * feature_count + i)
+    return jnp.argsort(codes)
+
+
+@jit
+def _inverse_order(order: jnp.ndarray) -> jnp.ndarray:
+    return jnp.argsort(order)
+
+
+@jit
+def _fast_coefficients_tensor(
+    coeffs_tensor: jnp.ndarray,
+    closest_index: jnp.ndarray,
+) -> jnp.ndarray:
+    return coeffs_tensor[closest_index]
+
+
 @jit
 def _fast_nn_update(
     train_nn_indices: jnp.ndarray,
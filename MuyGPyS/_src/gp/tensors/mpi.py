@@ -3,22 +3,31 @@
 #
 # SPDX-License-Identifier: MIT
 
-
-from typing import Tuple
+from functools import partial
+from typing import Callable, Optional, Tuple
 
 import MuyGPyS._src.math.numpy as np
 from MuyGPyS._src.mpi_utils import (
-    _chunk_function_tensor,
+    _distribute_function_tensor,
+    _distributed_take,
 )
 from MuyGPyS._src.gp.tensors.numpy import (
     _crosswise_tensor as _crosswise_tensor_n,
     _pairwise_tensor as _pairwise_tensor_n,
     _batch_features_tensor as _batch_features_tensor_n,
+    _crosswise_sq_dists_tensor as _crosswise_sq_dists_tensor_n,
+    _pairwise_sq_dists_tensor as _pairwise_sq_dists_tensor_n,
     _make_train_tensors as _make_train_tensors_n,
     _make_predict_tensors as _make_predict_tensors_n,
+    _make_train_sq_dists_tensors as _make_train_sq_dists_tensors_n,
+    _make_predict_sq_dists_tensors as _make_predict_sq_dists_tensors_n,
+    _make_predict_kernels as _make_predict_kernels_n,
     _make_heteroscedastic_tensor as _make_heteroscedatic_tensor_n,
+    _fast_nn_update,
     _F2,
     _l2,
+    _pack_pairwise_tensor,
+    _unpack_pairwise_tensor,
 )
 
 
@@ -26,10 +35,10 @@ def _make_heteroscedastic_tensor(
     measurement_noise: np.ndarray,
     batch_nn_indices: np.ndarray,
 ) -> np.ndarray:
-    return _chunk_function_tensor(
-        _make_heteroscedatic_tensor_n,
-        measurement_noise,
-        batch_nn_indices,
+    return _distribute_function_tensor(
+        lambda indices, noise: _make_heteroscedatic_tensor_n(noise, indices),
+        (batch_nn_indices,),
+        (measurement_noise,),
     )
 
 
@@ -37,9 +46,18 @@ def _make_fast_predict_tensors(
     batch_nn_indices: np.ndarray,
     train_features: np.ndarray,
     train_targets: np.ndarray,
-) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    raise NotImplementedError(
-        'Function "make_fast_predict_tensors" does not support mpi!'
+) -> Tuple[np.ndarray, np.ndarray]:
+    # Each rank builds the tensors of its own chunk of the training points, and
+    # so owns the fast coefficients of that chunk.
+    if batch_nn_indices is not None:
+        batch_nn_indices = _fast_nn_update(batch_nn_indices)
+    return _distribute_function_tensor(
+        lambda nn_indices, features, targets: (
+            _pairwise_tensor_n(features, nn_indices),
+            targets[nn_indices],
+        ),
+        (batch_nn_indices,),
+        (train_features, train_targets),
     )
 
 
@@ -49,15 +67,14 @@ def _make_predict_tensors(
     test_features: np.ndarray,
     train_features: np.ndarray,
     train_targets: np.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    return _chunk_function_tensor(
-        _make_predict_tensors_n,
-        batch_indices,
-        batch_nn_indices,
-        test_features,
-        train_features,
-        train_targets,
-        return_count=3,
+    # Each rank allocates only its own chunk, so `out` is ignored.
+    return _distribute_function_tensor(
+        partial(_make_predict_tensors_n, packed=packed),
+        (batch_indices, batch_nn_indices),
+        (test_features, train_features, train_targets),
     )
 
 
@@ -66,14 +83,61 @@ def _make_train_tensors(
     batch_nn_indices: np.ndarray,
     train_features: np.ndarray,
     train_targets: np.ndarray,
+    packed: bool = False,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
-    return _chunk_function_tensor(
-        _make_train_tensors_n,
-        batch_indices,
-        batch_nn_indices,
-        train_features,
-        train_targets,
-        return_count=4,
+    return _distribute_function_tensor(
+        partial(_make_train_tensors_n, packed=packed),
+        (batch_indices, batch_nn_indices),
+        (train_features, train_targets),
+    )
+
+
+def _make_predict_sq_dists_tensors(
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    test_features: np.ndarray,
+    train_features: np.ndarray,
+    train_targets: np.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return _distribute_function_tensor(
+        partial(_make_predict_sq_dists_tensors_n, packed=packed),
+        (batch_indices, batch_nn_indices),
+        (test_features, train_features, train_targets),
+    )
+
+
+def _make_train_sq_dists_tensors(
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    train_features: np.ndarray,
+    train_targets: np.ndarray,
+    packed: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    return _distribute_function_tensor(
+        partial(_make_train_sq_dists_tensors_n, packed=packed),
+        (batch_indices, batch_nn_indices),
+        (train_features, train_targets),
+    )
+
+
+def _make_predict_kernels(
+    kernel_fn: Callable,
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    test_features: np.ndarray,
+    train_features: np.ndarray,
+    tensor_form: str,
+    tile_count: int,
+    out: Optional[Tuple] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    return _distribute_function_tensor(
+        lambda *args: _make_predict_kernels_n(
+            kernel_fn, *args, tensor_form, tile_count
+        ),
+        (batch_indices, batch_nn_indices),
+        (test_features, train_features),
     )
 
 
@@ -81,11 +145,10 @@ def _batch_features_tensor(
     features: np.ndarray,
     batch_indices: np.ndarray,
 ) -> np.ndarray:
-    _batch_features_tensor_n
-    return _chunk_function_tensor(
-        _batch_features_tensor_n,
-        features,
-        batch_indices,
+    return _distribute_function_tensor(
+        lambda indices, features: _batch_features_tensor_n(features, indices),
+        (batch_indices,),
+        (features,),
     )
 
 
@@ -95,12 +158,12 @@ def _crosswise_tensor(
     data_indices: np.ndarray,
     nn_indices: np.ndarray,
 ) -> np.ndarray:
-    return _chunk_function_tensor(
-        _crosswise_tensor_n,
-        data,
-        nn_data,
-        data_indices,
-        nn_indices,
+    return _distribute_function_tensor(
+        lambda data_indices, nn_indices, data, nn_data: _crosswise_tensor_n(
+            data, nn_data, data_indices, nn_indices
+        ),
+        (data_indices, nn_indices),
+        (data, nn_data),
     )
 
 
@@ -116,10 +179,10 @@ def _pairwise_tensor(
     data: np.ndarray,
     nn_indices: np.ndarray,
 ) -> np.ndarray:
-    return _chunk_function_tensor(
-        _pairwise_tensor_n,
-        data,
-        nn_indices,
+    return _distribute_function_tensor(
+        lambda nn_indices, data: _pairwise_tensor_n(data, nn_indices),
+        (nn_indices,),
+        (data,),
     )
 
 
@@ -129,9 +192,62 @@ def _pairwise_differences(points: np.ndarray) -> np.ndarray:
     )
 
 
-def _fast_nn_update(
-    train_nn_indices: np.ndarray,
+def _crosswise_sq_dists_tensor(
+    data: np.ndarray,
+    nn_data: np.ndarray,
+    data_indices: np.ndarray,
+    nn_indices: np.ndarray,
+) -> np.ndarray:
+    return _distribute_function_tensor(
+        lambda data_indices, nn_indices, data, nn_data: _crosswise_sq_dists_tensor_n(
+            data, nn_data, data_indices, nn_indices
+        ),
+        (data_indices, nn_indices),
+        (data, nn_data),
+    )
+
+
+def _pairwise_sq_dists_tensor(
+    data: np.ndarray,
+    nn_indices: np.ndarray,
+) -> np.ndarray:
+    return _distribute_function_tensor(
+        lambda nn_indices, data: _pairwise_sq_dists_tensor_n(data, nn_indices),
+        (nn_indices,),
+        (data,),
+    )
+
+
+def _crosswise_sq_distances(
+    locations: np.ndarray, points: np.ndarray
 ) -> np.ndarray:
     raise NotImplementedError(
-        'Function "muygps_fast_nn_update" does not support mpi!'
+        'Function "crosswise_sq_distances" does not support mpi!'
+    )
+
+
+def _pairwise_sq_distances(points: np.ndarray) -> np.ndarray:
+    raise NotImplementedError(
+        'Function "pairwise_sq_distances" does not support mpi!'
+    )
+
+
+def _locality_order(batch_features: np.ndarray) -> np.ndarray:
+    raise NotImplementedError('Function "locality_order" does not support mpi!')
+
+
+def _inverse_order(order: np.ndarray) -> np.ndarray:
+    raise NotImplementedError('Function "inverse_order" does not support mpi!')
+
+
+def _fast_coefficients_tensor(
+    coeffs_tensor: np.ndarray,
+    closest_index: np.ndarray,
+) -> np.ndarray:
+    # `coeffs_tensor` is this rank's chunk of the training coefficients, while
+    # `closest_index` lists global training indices. Each rank requests the
+    # coefficients of its chunk of the batch from the ranks that own them.
+    local_index = _distribute_function_tensor(
+        lambda indices: indices, (closest_index,), ()
     )
+    return _distributed_take(coeffs_tensor, local_index)
@@ -3,7 +3,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Tuple
+from math import isqrt
+from typing import Callable, Optional, Tuple
 
 import MuyGPyS._src.math.numpy as np
 
@@ -43,22 +44,72 @@ def _make_predict_tensors(
     test_features: np.ndarray,
     train_features: np.ndarray,
     train_targets: np.ndarray,
+    out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    packed: bool = False,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     if test_features is None:
         test_features = train_features
+    crosswise_out, pairwise_out, targets_out = _outputs(out, 3)
     crosswise_diffs = _crosswise_tensor(
-        test_features, train_features, batch_indices, batch_nn_indices
+        test_features,
+        train_features,
+        batch_indices,
+        batch_nn_indices,
+        out=crosswise_out,
+    )
+    if packed is True:
+        pairwise_diffs = _packed_pairwise_tensor(
+            train_features, batch_nn_indices, out=pairwise_out
+        )
+    else:
+        pairwise_diffs = _pairwise_tensor(
+            train_features, batch_nn_indices, out=pairwise_out
+        )
+    batch_nn_targets = np.take(
+        train_targets, batch_nn_indices, axis=0, out=targets_out
     )
-    pairwise_diffs = _pairwise_tensor(train_features, batch_nn_indices)
-    batch_nn_targets = train_targets[batch_nn_indices, :]
     return crosswise_diffs, pairwise_diffs, batch_nn_targets
 
 
+def _make_predict_sq_dists_tensors(
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    test_features: np.ndarray,
+    train_features: np.ndarray,
+    train_targets: np.ndarray,
+    out: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None,
+    packed: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if test_features is None:
+        test_features = train_features
+    crosswise_out, pairwise_out, targets_out = _outputs(out, 3)
+    crosswise_sq_dists = _crosswise_sq_dists_tensor(
+        test_features,
+        train_features,
+        batch_indices,
+        batch_nn_indices,
+        out=crosswise_out,
+    )
+    if packed is True:
+        pairwise_sq_dists = _packed_pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices, out=pairwise_out
+        )
+    else:
+        pairwise_sq_dists = _pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices, out=pairwise_out
+        )
+    batch_nn_targets = np.take(
+        train_targets, batch_nn_indices, axis=0, out=targets_out
+    )
+    return crosswise_sq_dists, pairwise_sq_dists, batch_nn_targets
+
+
 def _make_train_tensors(
     batch_indices: np.ndarray,
     batch_nn_indices: np.ndarray,
     train_features: np.ndarray,
     train_targets: np.ndarray,
+    packed: bool = False,
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
     crosswise_diffs, pairwise_diffs, batch_nn_targets = _make_predict_tensors(
         batch_indices,
@@ -66,11 +117,90 @@ def _make_train_tensors(
         train_features,
         train_features,
         train_targets,
+        packed=packed,
     )
     batch_targets = train_targets[batch_indices, :]
     return crosswise_diffs, pairwise_diffs, batch_targets, batch_nn_targets
 
 
+def _make_train_sq_dists_tensors(
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    train_features: np.ndarray,
+    train_targets: np.ndarray,
+    packed: bool = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_nn_targets,
+    ) = _make_predict_sq_dists_tensors(
+        batch_indices,
+        batch_nn_indices,
+        train_features,
+        train_features,
+        train_targets,
+        packed=packed,
+    )
+    batch_targets = train_targets[batch_indices, :]
+    return (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_targets,
+        batch_nn_targets,
+    )
+
+
+def _make_predict_kernels(
+    kernel_fn: Callable,
+    batch_indices: np.ndarray,
+    batch_nn_indices: np.ndarray,
+    test_features: np.ndarray,
+    train_features: np.ndarray,
+    tensor_form: str,
+    tile_count: int,
+    out: Optional[Tuple[np.ndarray, np.ndarray]] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    if test_features is None:
+        test_features = train_features
+    batch_count, nn_count = batch_nn_indices.shape
+    if out is None:
+        K = np.zeros((batch_count, nn_count, nn_count), dtype=np.ftype)
+        Kcross = np.zeros((batch_count, nn_count), dtype=np.ftype)
+    else:
+        K, Kcross = out
+    for start in range(0, batch_count, tile_count):
+        tile = slice(start, start + tile_count)
+        crosswise, pairwise = _tile_tensors(
+            test_features[batch_indices[tile]],
+            train_features[batch_nn_indices[tile]],
+            tensor_form,
+        )
+        K[tile] = kernel_fn(pairwise, tensor_form=tensor_form)
+        Kcross[tile] = kernel_fn(crosswise, tensor_form=tensor_form)
+    return K, Kcross
+
+
+def _outputs(out: Optional[Tuple], count: int) -> Tuple:
+    if out is None:
+        return (None,) * count
+    return out
+
+
+def _tile_tensors(
+    locations: np.ndarray, points: np.ndarray, tensor_form: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    if tensor_form == "sq_dists":
+        return (
+            _crosswise_sq_distances(locations, points),
+            _pairwise_sq_distances(points),
+        )
+    return (
+        _crosswise_differences(locations, points),
+        _pairwise_differences(points),
+    )
+
+
 def _batch_features_tensor(
     features: np.ndarray,
     batch_indices: np.ndarray,
@@ -83,35 +213,184 @@ def _crosswise_tensor(
     nn_data: np.ndarray,
     data_indices: np.ndarray,
     nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     locations = data[data_indices]
     points = nn_data[nn_indices]
-    return _crosswise_differences(locations, points)
+    return _crosswise_differences(locations, points, out=out)
 
 
 def _pairwise_tensor(
     data: np.ndarray,
     nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
     points = data[nn_indices]
-    return _pairwise_differences(points)
+    return _pairwise_differences(points, out=out)
 
 
 def _crosswise_differences(
-    locations: np.ndarray, points: np.ndarray
+    locations: np.ndarray,
+    points: np.ndarray,
+    out: Optional[np.ndarray] = None,
 ) -> np.ndarray:
-    return locations[:, None, :] - points
+    return np.subtract(locations[:, None, :], points, out=out)
 
 
-def _pairwise_differences(points: np.ndarray) -> np.ndarray:
+def _pairwise_differences(
+    points: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     if len(points.shape) == 3:
-        return points[:, :, None, :] - points[:, None, :, :]
+        return np.subtract(
+            points[:, :, None, :], points[:, None, :, :], out=out
+        )
     elif len(points.shape) == 2:
-        return points[:, None, :] - points[None, :, :]
+        return np.subtract(points[:, None, :], points[None, :, :], out=out)
     else:
         raise ValueError(f"points shape {points.shape} is not supported.")
 
 
+def _crosswise_sq_dists_tensor(
+    data: np.ndarray,
+    nn_data: np.ndarray,
+    data_indices: np.ndarray,
+    nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    locations = data[data_indices]
+    points = nn_data[nn_indices]
+    return _crosswise_sq_distances(locations, points, out=out)
+
+
+def _pairwise_sq_dists_tensor(
+    data: np.ndarray,
+    nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    points = data[nn_indices]
+    return _pairwise_sq_distances(points, out=out)
+
+
+def _crosswise_sq_distances(
+    locations: np.ndarray,
+    points: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    # The crosswise differences are no larger than `points`, so there is no
+    # need to resort to the Gram identity here.
+    diffs = _crosswise_differences(locations, points)
+    return np.sum(diffs**2, axis=-1, out=out)
+
+
+def _pairwise_sq_distances(
+    points: np.ndarray, out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    if len(points.shape) not in (2, 3):
+        raise ValueError(f"points shape {points.shape} is not supported.")
+    # Centering each neighborhood limits the cancellation error of the Gram
+    # identity |x - y|^2 = |x|^2 + |y|^2 - 2 <x, y>. The Gram matrices are a
+    # batched matmul, which dispatches to BLAS, and the identity is accumulated
+    # in place so that `out` is the only full-sized allocation. Clamping at
+    # zero removes any remaining negative cancellation error.
+    points = points - np.mean(points, axis=-2, keepdims=True)
+    sq_norms = np.sum(points**2, axis=-1)
+    sq_dists = np.matmul(points, points.swapaxes(-1, -2), out=out)
+    sq_dists *= -2
+    sq_dists += sq_norms[..., :, None]
+    sq_dists += sq_norms[..., None, :]
+    diagonal = np.arange(sq_dists.shape[-1])
+    sq_dists[..., diagonal, diagonal] = 0.0
+    return np.maximum(sq_dists, 0.0, out=sq_dists)
+
+
+def _packed_nn_count(packed_count: int) -> int:
+    nn_count = (isqrt(8 * packed_count + 1) - 1) // 2
+    if nn_count * (nn_count + 1) // 2 != packed_count:
+        raise ValueError(
+            f"{packed_count} is not the size of a packed triangular matrix"
+        )
+    return nn_count
+
+
+def _packed_diagonal_indices(nn_count: int) -> np.ndarray:
+    # Positions of the diagonal within the row-major packed upper triangle.
+    indices = np.arange(nn_count)
+    return indices * nn_count - indices * (indices - 1) // 2
+
+
+def _packed_pairwise_tensor(
+    data: np.ndarray,
+    nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    points = data[nn_indices]
+    batch_count, nn_count, feature_count = points.shape
+    if out is None:
+        out = np.empty(
+            (batch_count, nn_count * (nn_count + 1) // 2, feature_count),
+            dtype=points.dtype,
+        )
+    # Fill the packed triangle one row at a time, so that the dense pairwise
+    # tensor is never formed.
+    start = 0
+    for i in range(nn_count):
+        end = start + nn_count - i
+        np.subtract(
+            points[:, i, None, :], points[:, i:, :], out=out[:, start:end]
+        )
+        start = end
+    return out
+
+
+def _packed_pairwise_sq_dists_tensor(
+    data: np.ndarray,
+    nn_indices: np.ndarray,
+    out: Optional[np.ndarray] = None,
+    row_block: int = 8,
+) -> np.ndarray:
+    points = data[nn_indices]
+    batch_count, nn_count, _ = points.shape
+    if out is None:
+        out = np.empty(
+            (batch_count, nn_count * (nn_count + 1) // 2), dtype=points.dtype
+        )
+    # As in _pairwise_sq_distances, but the Gram identity is evaluated for a
+    # block of `row_block` rows of the triangle at a time, so that the only
+    # intermediate is of shape `(batch_count, row_block, nn_count)`.
+    points = points - np.mean(points, axis=-2, keepdims=True)
+    sq_norms = np.sum(points**2, axis=-1)
+    points_t = points.swapaxes(-1, -2)
+    start = 0
+    for first in range(0, nn_count, row_block):
+        last = min(first + row_block, nn_count)
+        block = np.matmul(points[:, first:last], points_t[:, :, first:])
+        block *= -2
+        block += sq_norms[:, first:last, None]
+        block += sq_norms[:, None, first:]
+        for i in range(first, last):
+            end = start + nn_count - i
+            out[:, start:end] = block[:, i - first, i - first :]
+            start = end
+    out[:, _packed_diagonal_indices(nn_count)] = 0.0
+    return np.maximum(out, 0.0, out=out)
+
+
+def _pack_pairwise_tensor(tensor: np.ndarray) -> np.ndarray:
+    _, nn_count = tensor.shape[:2]
+    rows, cols = np.triu_indices(nn_count)
+    return tensor[:, rows, cols]
+
+
+def _unpack_pairwise_tensor(packed: np.ndarray) -> np.ndarray:
+    batch_count, packed_count = packed.shape
+    nn_count = _packed_nn_count(packed_count)
+    rows, cols = np.triu_indices(nn_count)
+    tensor = np.zeros((batch_count, nn_count, nn_count))
+    tensor[:, rows, cols] = packed
+    tensor[:, cols, rows] = packed
+    return tensor
+
+
 def _F2(diffs: np.ndarray) -> np.ndarray:
     return np.sum(diffs**2, axis=-1)
 
@@ -120,6 +399,37 @@ def _l2(diffs: np.ndarray) -> np.ndarray:
     return np.sqrt(_F2(diffs))
 
 
+def _locality_order(batch_features: np.ndarray) -> np.ndarray:
+    # Order the batch along a Z-order (Morton) curve through its features.
+    # Consecutive batch elements are then close together and share most of
+    # their nearest neighbors, so gathering the training data for a run of them
+    # rereads the same rows while they are still in cache. Resolving each
+    # feature to 16 bits is already far finer than any neighborhood.
+    batch_count, feature_count = batch_features.shape
+    feature_count = min(feature_count, 62)
+    bits = min(16, 62 // feature_count)
+    features = batch_features[:, :feature_count]
+    lower = np.min(features, axis=0)
+    span = np.maximum(np.max(features, axis=0) - lower, 1e-30)
+    grid = ((features - lower) / span * (2**bits - 1)).astype(np.int64)
+    codes = np.zeros(batch_count, dtype=np.int64)
+    for bit in range(bits):
+        for i in range(feature_count):
+            codes |= ((grid[:, i] >> bit) & 1) << (bit * feature_count + i)
+    return np.argsort(codes, kind="stable")
+
+
+def _inverse_order(order: np.ndarray) -> np.ndarray:
+    return np.argsort(order)
+
+
+def _fast_coefficients_tensor(
+    coeffs_tensor: np.ndarray,
+    closest_index: np.ndarray,
+) -> np.ndarray:
+    return coeffs_tensor[closest_index]
+
+
 def _fast_nn_update(
     train_nn_indices: np.ndarray,
 ) -> np.ndarray:
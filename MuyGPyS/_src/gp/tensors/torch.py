@@ -3,7 +3,8 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Tuple
+from math import isqrt
+from typing import Callable, Optional, Tuple
 
 import MuyGPyS._src.math.torch as torch
 
@@ -43,7 +44,11 @@ def _make_predict_tensors(
     test_features: torch.ndarray,
     train_features: torch.ndarray,
     train_targets: torch.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
 ) -> Tuple[torch.ndarray, torch.ndarray, torch.ndarray]:
+    # Only the fused kernel evaluation writes into `out`; the difference
+    # tensors are allocated as usual.
     if test_features is None:
         test_features = train_features
     crosswise_dists = _crosswise_tensor(
@@ -52,16 +57,48 @@ def _make_predict_tensors(
         batch_indices,
         batch_nn_indices,
     )
-    pairwise_dists = _pairwise_tensor(train_features, batch_nn_indices)
+    if packed is True:
+        pairwise_dists = _packed_pairwise_tensor(
+            train_features, batch_nn_indices
+        )
+    else:
+        pairwise_dists = _pairwise_tensor(train_features, batch_nn_indices)
     batch_nn_targets = train_targets[batch_nn_indices, :]
     return crosswise_dists, pairwise_dists, batch_nn_targets
 
 
+def _make_predict_sq_dists_tensors(
+    batch_indices: torch.ndarray,
+    batch_nn_indices: torch.ndarray,
+    test_features: torch.ndarray,
+    train_features: torch.ndarray,
+    train_targets: torch.ndarray,
+    out: Optional[Tuple] = None,
+    packed: bool = False,
+) -> Tuple[torch.ndarray, torch.ndarray, torch.ndarray]:
+    if test_features is None:
+        test_features = train_features
+    crosswise_sq_dists = _crosswise_sq_dists_tensor(
+        test_features, train_features, batch_indices, batch_nn_indices
+    )
+    if packed is True:
+        pairwise_sq_dists = _packed_pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices
+        )
+    else:
+        pairwise_sq_dists = _pairwise_sq_dists_tensor(
+            train_features, batch_nn_indices
+        )
+    batch_nn_targets = train_targets[batch_nn_indices, :]
+    return crosswise_sq_dists, pairwise_sq_dists, batch_nn_targets
+
+
 def _make_train_tensors(
     batch_indices: torch.ndarray,
     batch_nn_indices: torch.ndarray,
     train_features: torch.ndarray,
     train_targets: torch.ndarray,
+    packed: bool = False,
 ) -> Tuple[torch.ndarray, torch.ndarray, torch.ndarray, torch.ndarray]:
     crosswise_dists, pairwise_dists, batch_nn_targets = _make_predict_tensors(
         batch_indices,
@@ -69,11 +106,84 @@ def _make_train_tensors(
         train_features,
         train_features,
         train_targets,
+        packed=packed,
     )
     batch_targets = train_targets[batch_indices, :]
     return crosswise_dists, pairwise_dists, batch_targets, batch_nn_targets
 
 
+def _make_train_sq_dists_tensors(
+    batch_indices: torch.ndarray,
+    batch_nn_indices: torch.ndarray,
+    train_features: torch.ndarray,
+    train_targets: torch.ndarray,
+    packed: bool = False,
+) -> Tuple[torch.ndarray, torch.ndarray, torch.ndarray, torch.ndarray]:
+    (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_nn_targets,
+    ) = _make_predict_sq_dists_tensors(
+        batch_indices,
+        batch_nn_indices,
+        train_features,
+        train_features,
+        train_targets,
+        packed=packed,
+    )
+    batch_targets = train_targets[batch_indices, :]
+    return (
+        crosswise_sq_dists,
+        pairwise_sq_dists,
+        batch_targets,
+        batch_nn_targets,
+    )
+
+
+def _make_predict_kernels(
+    kernel_fn: Callable,
+    batch_indices: torch.ndarray,
+    batch_nn_indices: torch.ndarray,
+    test_features: torch.ndarray,
+    train_features: torch.ndarray,
+    tensor_form: str,
+    tile_count: int,
+    out: Optional[Tuple] = None,
+) -> Tuple[torch.ndarray, torch.ndarray]:
+    if test_features is None:
+        test_features = train_features
+    batch_count, nn_count = batch_nn_indices.shape
+    if out is None:
+        K = torch.zeros((batch_count, nn_count, nn_count))
+        Kcross = torch.zeros((batch_count, nn_count))
+    else:
+        K, Kcross = out
+    for start in range(0, batch_count, tile_count):
+        tile = slice(start, start + tile_count)
+        crosswise, pairwise = _tile_tensors(
+            test_features[batch_indices[tile]],
+            train_features[batch_nn_indices[tile]],
+            tensor_form,
+        )
+        K[tile] = kernel_fn(pairwise, tensor_form=tensor_form)
+        Kcross[tile] = kernel_fn(crosswise, tensor_form=tensor_form)
+    return K, Kcross
+
+
+def _tile_tensors(
+    locations: torch.ndarray, points: torch.ndarray, tensor_form: str
+) -> Tuple[torch.ndarray, torch.ndarray]:
+    if tensor_form == "sq_dists":
+        return (
+            _crosswise_sq_distances(locations, points),
+            _pairwise_sq_distances(points),
+        )
+    return (
+        _crosswise_differences(locations, points),
+        _pairwise_differences(points),
+    )
+
+
 def _batch_features_tensor(
     features: torch.ndarray,
     batch_indices: torch.ndarray,
@@ -115,6 +225,117 @@ def _pairwise_differences(points: torch.ndarray) -> torch.ndarray:
         raise ValueError(f"points shape {points.shape} is not supported.")
 
 
+def _crosswise_sq_dists_tensor(
+    data: torch.ndarray,
+    nn_data: torch.ndarray,
+    data_indices: torch.ndarray,
+    nn_indices: torch.ndarray,
+) -> torch.ndarray:
+    locations = data[data_indices]
+    points = nn_data[nn_indices]
+    return _crosswise_sq_distances(locations, points)
+
+
+def _pairwise_sq_dists_tensor(
+    data: torch.ndarray,
+    nn_indices: torch.ndarray,
+) -> torch.ndarray:
+    points = data[nn_indices]
+    return _pairwise_sq_distances(points)
+
+
+def _crosswise_sq_distances(
+    locations: torch.ndarray, points: torch.ndarray
+) -> torch.ndarray:
+    return _F2(_crosswise_differences(locations, points))
+
+
+def _pairwise_sq_distances(points: torch.ndarray) -> torch.ndarray:
+    if len(points.shape) not in (2, 3):
+        raise ValueError(f"points shape {points.shape} is not supported.")
+    points = points - torch.mean(points, dim=-2, keepdim=True)
+    sq_norms = torch.sum(points**2, axis=-1)
+    sq_dists = (
+        sq_norms[..., :, None]
+        + sq_norms[..., None, :]
+        - 2 * (points @ points.swapaxes(-1, -2))
+    )
+    diagonal = torch.arange(sq_dists.shape[-1])
+    sq_dists[..., diagonal, diagonal] = 0.0
+    return sq_dists.clamp(min=0.0)
+
+
+def _packed_nn_count(packed_count: int) -> int:
+    nn_count = (isqrt(8 * packed_count + 1) - 1) // 2
+    if nn_count * (nn_count + 1) // 2 != packed_count:
+        raise ValueError(
+            f"{packed_count} is not the size of a packed triangular matrix"
+        )
+    return nn_count
+
+
+def _packed_diagonal_indices(nn_count: int) -> torch.ndarray:
+    indices = torch.arange(nn_count)
+    return indices * nn_count - indices * (indices - 1) // 2
+
+
+def _packed_pairwise_tensor(
+    data: torch.ndarray,
+    nn_indices: torch.ndarray,
+) -> torch.ndarray:
+    points = data[nn_indices]
+    _, nn_count, _ = points.shape
+    # Concatenate the rows of the packed triangle, so that the dense pairwise
+    # tensor is never formed.
+    return torch.cat(
+        [points[:, i, None, :] - points[:, i:, :] for i in range(nn_count)],
+        dim=1,
+    )
+
+
+def _packed_pairwise_sq_dists_tensor(
+    data: torch.ndarray,
+    nn_indices: torch.ndarray,
+    row_block: int = 8,
+) -> torch.ndarray:
+    points = data[nn_indices]
+    _, nn_count, _ = points.shape
+    # As in _pairwise_sq_distances, but evaluated for a block of `row_block`
+    # rows of the triangle at a time.
+    points = points - torch.mean(points, dim=-2, keepdim=True)
+    sq_norms = torch.sum(points**2, axis=-1)
+    rows = list()
+    for first in range(0, nn_count, row_block):
+        last = min(first + row_block, nn_count)
+        block = (
+            sq_norms[:, first:last, None]
+            + sq_norms[:, None, first:]
+            - 2 * (points[:, first:last] @ points[:, first:].swapaxes(-1, -2))
+        )
+        rows.extend(
+            block[:, i - first, i - first :] for i in range(first, last)
+        )
+    packed = torch.cat(rows, dim=1)
+    packed[:, _packed_diagonal_indices(nn_count)] = 0.0
+    return packed.clamp(min=0.0)
+
+
+def _pack_pairwise_tensor(tensor: torch.ndarray) -> torch.ndarray:
+    _, nn_count = tensor.shape[:2]
+    rows, cols = torch.triu_indices(nn_count, nn_count)
+    return tensor[:, rows, cols]
+
+
+def _unpack_pairwise_tensor(packed: torch.ndarray) -> torch.ndarray:
+    batch_count, packed_count = packed.shape
+    nn_count = _packed_nn_count(packed_count)
+    rows, cols = torch.triu_indices(nn_count, nn_count)
+    tensor = torch.zeros((batch_count, nn_count, nn_count))
+    tensor[:, rows, cols] = packed
+    tensor[:, cols, rows] = packed
+    return tensor
+
+
 def _F2(diffs: torch.ndarray) -> torch.ndarray:
     return torch.sum(diffs**2, axis=-1)
 
@@ -123,6 +344,33 @@ def _l2(diffs: torch.ndarray) -> torch.ndarray:
     return torch.norm(diffs, dim=-1)
 
 
+def _locality_order(batch_features: torch.ndarray) -> torch.ndarray:
+    # Order the batch along a Z-order (Morton) curve through its features.
+    batch_count, feature_count = batch_features.shape
+    feature_count = min(feature_count, 62)
+    bits = min(16, 62 // feature_count)
+    features = batch_features[:, :feature_count]
+    lower = features.amin(dim=0)
+    span = (features.amax(dim=0) - lower).clamp(min=1e-30)
+    grid = ((features - lower) / span * (2**bits - 1)).to(torch.int64)
+    codes = torch.zeros(batch_count, dtype=torch.int64)
+    for bit in range(bits):
+        for i in range(feature_count):
+            codes |= ((grid[:, i] >> bit) & 1) << (bit * feature_count + i)
+    return torch.argsort(codes, stable=True)
+
+
+def _inverse_order(order: torch.ndarray) -> torch.ndarray:
+    return torch.argsort(order)
+
+
+def _fast_coefficients_tensor(
+    coeffs_tensor: torch.ndarray,
+    closest_index: torch.ndarray,
+) -> torch.ndarray:
+    return coeffs_tensor[closest_index]
+
+
 def _fast_nn_update(
     train_nn_indices: torch.ndarray,
 ) -> torch.ndarray:
@@ -10,6 +10,7 @@ from jax.numpy import (
     any,
     argmax,
     argmin,
+    argsort,
     atleast_1d,
     atleast_2d,
     clip,
@@ -45,6 +46,7 @@ from jax.numpy import (
     sqrt,
     sum,
     tile,
+    triu_indices,
     unique,
     where,
     vstack,
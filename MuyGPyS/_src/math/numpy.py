@@ -9,48 +9,74 @@ from numpy import (
     any,
     argmax,
     argmin,
+    argpartition,
+    argsort,
+    array_equal,
+    asarray,
+    ascontiguousarray,
     atleast_1d,
     atleast_2d,
+    bincount,
+    broadcast_to,
     concatenate,
     copy,
     corrcoef,
     cov,
     count_nonzero,
+    cumsum,
     choose,
     divide,
+    dtype,
     einsum,
+    empty,
+    empty_like,
     exp,
     expand_dims,
     finfo,
     float32,
     float64,
+    frombuffer,
     histogram,
     inf,
     int32,
     int64,
     isclose,
     isnan,
+    lexsort,
     linalg,
+    load,
     log,
     logical_and,
     logical_or,
+    matmul,
     max,
+    maximum,
     mean,
     median,
     meshgrid,
     min,
     mod,
+    multiply,
     nan,
     ndarray,
+    negative,
+    nonzero,
     number,
     outer,
     prod,
     random,
     repeat,
     reshape,
+    save,
+    searchsorted,
     sqrt,
+    square,
+    subtract,
     sum,
+    take,
     tile,
+    triu_indices,
+    uint8,
     unique,
     where,
     vstack,
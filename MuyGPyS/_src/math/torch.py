@@ -8,9 +8,11 @@ from torch import tensor as _array, Tensor as ndarray
 from torch import (
     all,
     allclose,
+    argsort,
     atleast_1d,
     atleast_2d,
     cat,
+    cholesky_solve,
     clone,
     cov,
     corrcoef,
@@ -39,6 +41,7 @@ from torch import (
     reshape,
     sqrt,
     tile,
+    triu_indices,
     unique,
     unsqueeze,
     vstack,
@@ -4,7 +4,7 @@
 # SPDX-License-Identifier: MIT
 
 import warnings
-from typing import Callable
+from typing import Callable, Tuple
 
 import MuyGPyS._src.math.numpy as np
 from MuyGPyS import config
@@ -40,48 +40,136 @@ def _get_chunk_sizes(count: int, size: int):
     ]
 
 
-def _prepare_parallel_data(size, chunk_sizes, *args):
-    count = len(args)
-    ret = [list() for _ in range(count)]
-    offsets = np.array(
-        [np.sum(chunk_sizes[:i]) for i in range(size)], dtype=int
+# MPI counts and displacements are C ints, and many implementations mishandle
+# messages of 2 GB or more, so larger transfers are split into rounds.
+_MPI_MESSAGE_BYTES = 2**31 - 1
+
+
+def _get_offsets(chunk_sizes):
+    return [sum(chunk_sizes[:i]) for i in range(len(chunk_sizes))]
+
+
+def _row_count(row_shape) -> int:
+    count = 1
+    for dim in row_shape:
+        count *= dim
+    return count
+
+
+def _row_datatype(dtype, row_shape):
+    """
+    Build an MPI datatype spanning one contiguous row of a tensor, so that
+    counts and displacements are expressed in rows rather than elements.
+    """
+    from mpi4py.util.dtlib import from_numpy_dtype
+
+    return (
+        from_numpy_dtype(dtype)
+        .Create_contiguous(max(1, _row_count(row_shape)))
+        .Commit()
     )
-    for i in range(size):
-        for j, arg in enumerate(args):
-            ret[j].append(arg[offsets[i] : offsets[i] + chunk_sizes[i]])
-    return ret
 
 
-def _big_scatter(chunks, root=0):
+def _round_rows(dtype, row_shape) -> int:
     """
-    Based upon this reply from a mpi4py dev
-    https://github.com/mpi4py/mpi4py/issues/119#issuecomment-945390731
+    The number of rows that each rank transfers per round. Depends only upon
+    metadata shared by all ranks, so that every rank agrees upon the rounds.
     """
-    if size == 0:
-        my_chunk = chunks
-    elif rank == 0:
-        for i, chunk in enumerate(chunks):
-            if i == 0:
-                my_chunk = chunk
-            else:
-                world.send(chunk, dest=i)
+    row_bytes = max(1, _row_count(row_shape)) * dtype.itemsize
+    return max(1, _MPI_MESSAGE_BYTES // row_bytes)
+
+
+def _scatter_tensor(tensor, root=0):
+    """
+    Scatter the rows of a tensor held by `root` into chunks of the sizes given
+    by `_get_chunk_sizes` using buffer-based `Scatterv`.
+    """
+    if rank == root:
+        tensor = np.ascontiguousarray(tensor)
+        meta = (tensor.shape, tensor.dtype)
     else:
-        my_chunk = world.recv(source=0)
-    return my_chunk
+        meta = None
+    shape, dtype = world.bcast(meta, root=root)
+    chunk_sizes = _get_chunk_sizes(shape[0], size)
+    offsets = _get_offsets(chunk_sizes)
+    local = np.empty((chunk_sizes[rank],) + tuple(shape[1:]), dtype=dtype)
+    row_type = _row_datatype(dtype, shape[1:])
+    round_rows = _round_rows(dtype, shape[1:])
+    try:
+        for start in range(0, max(chunk_sizes), round_rows):
+            counts = [
+                min(max(chunk_size - start, 0), round_rows)
+                for chunk_size in chunk_sizes
+            ]
+            displs = [offset + start for offset in offsets]
+            sendbuf = (
+                [tensor, counts, displs, row_type] if rank == root else None
+            )
+            recvbuf = [local[start : start + counts[rank]], row_type]
+            world.Scatterv(sendbuf, recvbuf, root=root)
+    finally:
+        row_type.Free()
+    return local
 
 
-def _chunk_tensor(tensors, return_count=1):
-    if rank == 0:
-        if return_count == 1:
-            tensors = [tensors]
-        data_count = tensors[0].shape[0]
-        chunk_sizes = _get_chunk_sizes(data_count, size)
-        tensor_chunks = _prepare_parallel_data(size, chunk_sizes, *tensors)
+def _allgather_tensor(tensor):
+    """
+    Concatenate each rank's chunk of a tensor along its first dimension upon
+    every rank using buffer-based `Allgatherv`.
+    """
+    tensor = np.ascontiguousarray(tensor)
+    chunk_sizes = world.allgather(tensor.shape[0])
+    offsets = _get_offsets(chunk_sizes)
+    gathered = np.empty(
+        (sum(chunk_sizes),) + tensor.shape[1:], dtype=tensor.dtype
+    )
+    row_type = _row_datatype(tensor.dtype, tensor.shape[1:])
+    round_rows = _round_rows(tensor.dtype, tensor.shape[1:])
+    try:
+        for start in range(0, max(chunk_sizes), round_rows):
+            counts = [
+                min(max(chunk_size - start, 0), round_rows)
+                for chunk_size in chunk_sizes
+            ]
+            displs = [offset + start for offset in offsets]
+            world.Allgatherv(
+                [tensor[start : start + counts[rank]], row_type],
+                [gathered, counts, displs, row_type],
+            )
+    finally:
+        row_type.Free()
+    return gathered
+
+
+def _bcast_tensor(tensor, root=0):
+    """
+    Broadcast a tensor held by `root` to every rank using buffer-based `Bcast`.
+    `None` is broadcast as is.
+    """
+    if rank == root:
+        if tensor is not None:
+            tensor = np.ascontiguousarray(tensor)
+            meta = (tensor.shape, tensor.dtype)
+        else:
+            meta = None
     else:
-        tensor_chunks = [None for _ in range(return_count)]
-    local_chunks = list()
-    for chunks in tensor_chunks:
-        local_chunks.append(_big_scatter(chunks, root=0))
+        meta = None
+    meta = world.bcast(meta, root=root)
+    if meta is None:
+        return None
+    shape, dtype = meta
+    if rank != root:
+        tensor = np.empty(shape, dtype=dtype)
+    flat = tensor.reshape(-1).view(np.uint8)
+    for start in range(0, flat.shape[0], _MPI_MESSAGE_BYTES):
+        world.Bcast(flat[start : start + _MPI_MESSAGE_BYTES], root=root)
+    return tensor
+
+
+def _chunk_tensor(tensors, return_count=1):
+    if return_count == 1 or rank != 0:
+        tensors = [tensors] if return_count == 1 else [None] * return_count
+    local_chunks = [_scatter_tensor(tensor, root=0) for tensor in tensors]
     if return_count == 1:
         local_chunks = local_chunks[0]
     return local_chunks
@@ -95,6 +183,111 @@ def _chunk_function_tensor(func: Callable, *args, return_count=1):
     return _chunk_tensor(tensors, return_count=return_count)
 
 
+def _distribute_function_tensor(
+    func: Callable, indexed_args: Tuple, shared_args: Tuple
+):
+    """
+    Evaluate a tensor construction function upon each rank's chunk of a batch.
+
+    Rather than evaluating `func` upon the whole batch on rank 0 and scattering
+    its outputs, distribute the (small) batch index arguments and have every
+    rank construct the tensors of its own chunk locally. Rank 0 therefore never
+    holds more than its own chunk of the outputs, and construction scales with
+    the number of ranks.
+
+    Arguments that every rank already holds are used in place, so that no
+    communication occurs if the data is replicated. Otherwise, they are assumed
+    to be held by rank 0 and are distributed from there.
+
+    Args:
+        func:
+            The serial function, which is called as
+            `func(*local_indexed_args, *shared_args)`.
+        indexed_args:
+            Tensors whose leading dimension indexes the batch, e.g. the batch
+            indices and nearest neighbor indices. Each rank receives the chunk
+            assigned to it by `_get_chunk_sizes`.
+        shared_args:
+            Tensors that every rank requires in full, e.g. the features and
+            targets. `None` values are passed through.
+
+    Returns:
+        The outputs of `func` upon the local chunk of the batch.
+    """
+    present = tuple(arg is not None for arg in indexed_args + shared_args)
+    replicated = [all(flags) for flags in zip(*world.allgather(present))]
+    local_args = list()
+    for i, arg in enumerate(indexed_args):
+        if replicated[i] is True:
+            chunk_sizes = _get_chunk_sizes(arg.shape[0], size)
+            offset = sum(chunk_sizes[:rank])
+            local_args.append(arg[offset : offset + chunk_sizes[rank]])
+        else:
+            local_args.append(_chunk_tensor(arg))
+    for i, arg in enumerate(shared_args):
+        if replicated[len(indexed_args) + i] is False:
+            arg = _bcast_tensor(arg, root=0)
+        local_args.append(arg)
+    return func(*local_args)
+
+
+def _distributed_take(chunk: np.ndarray, indices: np.ndarray) -> np.ndarray:
+    """
+    Gather rows of a tensor distributed across ranks by their global indices.
+
+    Each rank holds a contiguous chunk of the rows of a global tensor, in rank
+    order, and requests an arbitrary set of global row indices. Each request is
+    routed to the rank that owns the row, which serves it from its chunk, so
+    that no rank ever holds more of the global tensor than its own chunk and
+    the rows it requested.
+
+    Args:
+        chunk:
+            This rank's chunk of the global tensor, of shape
+            `(chunk_count, ...)`.
+        indices:
+            A vector of global row indices of shape `(count,)` requested by
+            this rank.
+
+    Returns:
+        A tensor of shape `(count, ...)` containing the requested rows.
+    """
+    from mpi4py.util.dtlib import from_numpy_dtype
+
+    chunk = np.ascontiguousarray(chunk)
+    indices = np.ascontiguousarray(indices, dtype=np.itype)
+    chunk_sizes = world.allgather(chunk.shape[0])
+    offsets = _get_offsets(chunk_sizes)
+    owners = np.searchsorted(offsets, indices, side="right") - 1
+    order = np.argsort(owners, kind="stable")
+    requests = indices[order]
+    send_counts = [int(count) for count in np.bincount(owners, minlength=size)]
+    recv_counts = world.alltoall(send_counts)
+    send_displs = _get_offsets(send_counts)
+    recv_displs = _get_offsets(recv_counts)
+
+    index_type = from_numpy_dtype(requests.dtype)
+    requested = np.empty((sum(recv_counts),), dtype=requests.dtype)
+    world.Alltoallv(
+        [requests, send_counts, send_displs, index_type],
+        [requested, recv_counts, recv_displs, index_type],
+    )
+
+    served = np.ascontiguousarray(chunk[requested - offsets[rank]])
+    rows = np.empty((indices.shape[0],) + chunk.shape[1:], dtype=chunk.dtype)
+    row_type = _row_datatype(chunk.dtype, chunk.shape[1:])
+    try:
+        world.Alltoallv(
+            [served, recv_counts, recv_displs, row_type],
+            [rows, send_counts, send_displs, row_type],
+        )
+    finally:
+        row_type.Free()
+    gathered = np.empty_like(rows)
+    gathered[order] = rows
+    return gathered
+
+
 def _consistent_unchunk_tensor(tensor: np.ndarray) -> np.ndarray:
     """
     If we are using an MPI implementation, allgather the tensor across all
@@ -115,10 +308,7 @@ def _consistent_unchunk_tensor(tensor: np.ndarray) -> np.ndarray:
     if tensor is None:
         return tensor
     if _is_mpi_mode() is True:
-        if len(tensor.shape) > 1:
-            return np.vstack(config.mpi_state.comm_world.allgather(tensor))
-        else:
-            return np.concatenate(config.mpi_state.comm_world.allgather(tensor))
+        return _allgather_tensor(tensor)
     else:
         return tensor
 
@@ -139,5 +329,86 @@ def _consistent_reduce_scalar(scalar):
         return scalar
 
 
+def _allreduce_sum_tensor(tensor: np.ndarray) -> np.ndarray:
+    """
+    Sum a contiguous tensor elementwise across all ranks in place.
+    """
+    from mpi4py import MPI
+
+    world.Allreduce(MPI.IN_PLACE, tensor, op=MPI.SUM)
+    return tensor
+
+
+def _allreduce_nearest(
+    nn_dists: np.ndarray, nn_indices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Merge per-rank nearest neighbor candidates into the global nearest
+    neighbors.
+
+    Each rank contributes the `nn_count` best candidates that it knows of for
+    each row, and every rank receives the `nn_count` best candidates of each
+    row across all ranks. The merge is a user-defined MPI reduction over whole
+    rows, so that no rank ever holds more than two candidate lists per row.
+    Ties in distance are broken by index, which makes the reduction
+    commutative.
+
+    Args:
+        nn_dists:
+            Candidate distances of shape `(count, nn_count)`. Missing
+            candidates should have infinite distance.
+        nn_indices:
+            Global candidate indices of shape `(count, nn_count)`. Must be
+            less than `2**53`.
+
+    Returns
+    -------
+    nn_dists:
+        The merged distances of shape `(count, nn_count)`, sorted in ascending
+        order along each row.
+    nn_indices:
+        The merged global indices of shape `(count, nn_count)`.
+    """
+    from mpi4py import MPI
+
+    count, nn_count = nn_dists.shape
+    # Pack each row as its distances followed by its indices, so that a single
+    # derived datatype describes a row and MPI never splits rows apart.
+    packed = np.concatenate(
+        (
+            np.asarray(nn_dists, dtype=np.float64),
+            np.asarray(nn_indices, dtype=np.float64),
+        ),
+        axis=1,
+    )
+
+    def _merge(in_buf, inout_buf, datatype):
+        lhs = np.frombuffer(in_buf, dtype=np.float64).reshape(-1, 2 * nn_count)
+        rhs = np.frombuffer(inout_buf, dtype=np.float64).reshape(
+            -1, 2 * nn_count
+        )
+        dists = np.concatenate((lhs[:, :nn_count], rhs[:, :nn_count]), axis=1)
+        indices = np.concatenate((lhs[:, nn_count:], rhs[:, nn_count:]), axis=1)
+        order = np.lexsort((indices, dists), axis=1)[:, :nn_count]
+        rows = np.arange(dists.shape[0])[:, None]
+        rhs[:, :nn_count] = dists[rows, order]
+        rhs[:, nn_count:] = indices[rows, order]
+
+    row_type = MPI.DOUBLE.Create_contiguous(2 * nn_count).Commit()
+    merge_op = MPI.Op.Create(_merge, commute=True)
+    try:
+        world.Allreduce(MPI.IN_PLACE, [packed, count, row_type], op=merge_op)
+    finally:
+        merge_op.Free()
+        row_type.Free()
+    # A single rank never applies the reduction, so sort explicitly.
+    order = np.lexsort((packed[:, nn_count:], packed[:, :nn_count]), axis=1)
+    rows = np.arange(count)[:, None]
+    return (
+        packed[:, :nn_count][rows, order],
+        packed[:, nn_count:][rows, order].astype(np.itype),
+    )
+
+
 def _is_mpi_mode() -> bool:
     return config.state.backend == "mpi"
@@ -28,3 +28,20 @@ def _analytic_scale_optim(
     return _analytic_scale_optim_unnormalized(K, nn_targets) / (
         batch_count * nn_count
     )
+
+
+@jit
+def _analytic_scale_optim_whitened_unnormalized(
+    nn_targets_whitened: jnp.ndarray,
+) -> jnp.ndarray:
+    return jnp.sum(nn_targets_whitened**2, axis=(0, 1))
+
+
+@jit
+def _analytic_scale_optim_whitened(
+    nn_targets_whitened: jnp.ndarray,
+) -> jnp.ndarray:
+    batch_count, nn_count, _ = nn_targets_whitened.shape
+    return _analytic_scale_optim_whitened_unnormalized(nn_targets_whitened) / (
+        nn_count * batch_count
+    )
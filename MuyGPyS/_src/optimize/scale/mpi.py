@@ -9,6 +9,7 @@ import MuyGPyS._src.math.numpy as np
 from MuyGPyS import config
 from MuyGPyS._src.optimize.scale.numpy import (
     _analytic_scale_optim_unnormalized,
+    _analytic_scale_optim_whitened_unnormalized,
 )
 
 world = config.mpi_state.comm_world
@@ -25,3 +26,13 @@ def _analytic_scale_optim(
     global_sum = world.allreduce(local_sum, op=MPI.SUM)
     global_batch_count = world.allreduce(local_batch_count, op=MPI.SUM)
     return global_sum / (nn_count * global_batch_count)
+
+
+def _analytic_scale_optim_whitened(
+    nn_targets_whitened: np.ndarray,
+) -> np.ndarray:
+    local_batch_count, nn_count, _ = nn_targets_whitened.shape
+    local_sum = _analytic_scale_optim_whitened_unnormalized(nn_targets_whitened)
+    global_sum = world.allreduce(local_sum, op=MPI.SUM)
+    global_batch_count = world.allreduce(local_batch_count, op=MPI.SUM)
+    return global_sum / (nn_count * global_batch_count)
@@ -26,3 +26,18 @@ def _analytic_scale_optim(
     return _analytic_scale_optim_unnormalized(K, nn_targets) / (
         nn_count * batch_count
     )
+
+
+def _analytic_scale_optim_whitened_unnormalized(
+    nn_targets_whitened: torch.ndarray,
+) -> torch.ndarray:
+    return torch.sum(nn_targets_whitened**2, axis=(0, 1))
+
+
+def _analytic_scale_optim_whitened(
+    nn_targets_whitened: torch.ndarray,
+) -> torch.ndarray:
+    batch_count, nn_count, _ = nn_targets_whitened.shape
+    return _analytic_scale_optim_whitened_unnormalized(nn_targets_whitened) / (
+        nn_count * batch_count
+    )
@@ -14,6 +14,7 @@ from MuyGPyS.optimize import Bayes_optimize, L_BFGS_B_optimize
 if config.muygpys_hnswlib_enabled is True:  # type: ignore
     _basic_nn_kwarg_options = [
         {"nn_method": "exact", "algorithm": "ball_tree"},
+        {"nn_method": "brute_blas"},
         {
             "nn_method": "hnsw",
             "space": "l2",
@@ -24,6 +25,7 @@ if config.muygpys_hnswlib_enabled is True:  # type: ignore
 else:
     _basic_nn_kwarg_options = [
         {"nn_method": "exact", "algorithm": "ball_tree"},
+        {"nn_method": "brute_blas"},
     ]
 
 _exact_nn_kwarg_options = ({"nn_method": "exact", "algorithm": "ball_tree"},)
@@ -27,8 +27,7 @@ import MuyGPyS._src.math as mm
 from MuyGPyS.gp import MuyGPS, MultivariateMuyGPS as MMuyGPS
 from MuyGPyS.examples.from_indices import fast_posterior_mean_from_indices
 from MuyGPyS.examples.regress import _decide_and_make_regressor
-from MuyGPyS.gp.tensors import fast_nn_update
-from MuyGPyS.gp.tensors import pairwise_tensor
+from MuyGPyS.gp.tensors import fast_nn_update, make_fast_predict_tensors
 from MuyGPyS.neighbors import NN_Wrapper
 from MuyGPyS.optimize import Bayes_optimize, OptimizeFn
 from MuyGPyS.optimize.loss import LossFn, lool_fn
@@ -71,10 +70,11 @@ def make_fast_regressor(
     nn_indices, _ = nbrs_lookup.get_batch_nns(
         mm.arange(0, num_training_samples)
     )
+    pairwise_diffs_fast, train_nn_targets = make_fast_predict_tensors(
+        nn_indices, train_features, train_targets
+    )
     nn_indices = fast_nn_update(nn_indices)
-
-    train_nn_targets = train_targets[nn_indices]
-    K = muygps.kernel(pairwise_tensor(train_features, nn_indices))
+    K = muygps.kernel(pairwise_diffs_fast)
 
     precomputed_coefficients_matrix = muygps.fast_coefficients(
         K, train_nn_targets
@@ -120,9 +120,10 @@ def make_fast_multivariate_regressor(
         mm.arange(0, num_training_samples)
     )
 
+    pairwise_diffs_fast, train_nn_targets = make_fast_predict_tensors(
+        nn_indices, train_features, train_targets
+    )
     nn_indices = fast_nn_update(nn_indices)
-    pairwise_diffs_fast = pairwise_tensor(train_features, nn_indices)
-    train_nn_targets = train_targets[nn_indices]
     precomputed_coefficients_matrix = mmuygps.fast_coefficients(
         pairwise_diffs_fast, train_nn_targets
     )
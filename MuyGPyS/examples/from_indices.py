@@ -9,10 +9,15 @@ Convenience wrapper for GP prediction from indices.
 
 import numpy as np
 
-from typing import Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, Union
 
+import MuyGPyS._src.math as mm
+from MuyGPyS import config
+from MuyGPyS._src.mpi_utils import _is_mpi_mode
 from MuyGPyS.gp.tensors import (
     crosswise_tensor,
+    fast_coefficients_tensor,
     make_predict_tensors,
     make_train_tensors,
 )
@@ -39,6 +44,126 @@ def tensors_from_indices(
     return pairwise_tensor, crosswise_tensor, batch_nn_targets
 
 
+def _predict_chunk_size(
+    memory_budget: int,
+    nn_count: int,
+    feature_count: int,
+    response_count: int,
+) -> int:
+    # Approximate the bytes held per batch element while predicting: the
+    # difference tensors, the kernel tensors, the perturbed kernel and its
+    # factor plus kernel temporaries, and the (whitened) targets.
+    element_bytes = int(config.state.ftype) // 8
+    batch_bytes = element_bytes * (
+        nn_count * nn_count * (feature_count + 6)
+        + nn_count * (feature_count + 2 * response_count + 3)
+    )
+    return max(1, memory_budget // batch_bytes)
+
+
+def _output_shape(
+    output: str,
+    muygps: Union[MuyGPS, MMuyGPS],
+    batch_count: int,
+    targets: np.ndarray,
+) -> Tuple[int, ...]:
+    # A MuyGPS model's variance has one column per variance scale, rather than
+    # per response.
+    if output == "variance" and isinstance(muygps, MuyGPS):
+        return (batch_count,) + muygps.scale.shape
+    return (batch_count, targets.shape[-1])
+
+
+def _predict_in_chunks(
+    predict_fn: Callable,
+    outputs: Tuple[str, ...],
+    muygps: Union[MuyGPS, MMuyGPS],
+    indices: np.ndarray,
+    nn_indices: np.ndarray,
+    test: np.ndarray,
+    train: np.ndarray,
+    targets: np.ndarray,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
+):
+    batch_count, nn_count = nn_indices.shape
+    if workers is None or workers <= 1:
+        workers = 1
+    elif config.state.backend != "numpy":
+        raise ValueError(
+            "threaded prediction is only supported by the numpy backend, not "
+            f"{config.state.backend}"
+        )
+    if chunk_size is None and memory_budget is not None:
+        _, feature_count = train.shape
+        chunk_size = _predict_chunk_size(
+            memory_budget // workers, nn_count, feature_count, targets.shape[-1]
+        )
+    if chunk_size is None and workers > 1:
+        # Several chunks per worker even out the load across the threads.
+        chunk_size = -(-batch_count // (4 * workers))
+    if chunk_size is None or chunk_size >= batch_count:
+        return predict_fn(
+            *tensors_from_indices(
+                muygps, indices, nn_indices, test, train, targets
+            )
+        )
+    if _is_mpi_mode() is True:
+        raise ValueError(
+            "chunked prediction is not supported by the mpi backend, whose "
+            "predictions are distributed across ranks"
+        )
+
+    def predict_chunk(start):
+        end = min(start + chunk_size, batch_count)
+        chunk_results = predict_fn(
+            *tensors_from_indices(
+                muygps,
+                indices[start:end],
+                nn_indices[start:end],
+                test,
+                train,
+                targets,
+            )
+        )
+        if not isinstance(chunk_results, tuple):
+            chunk_results = (chunk_results,)
+        return chunk_results
+
+    def store_chunk(start, chunk_results):
+        end = min(start + chunk_size, batch_count)
+        for i, chunk_result in enumerate(chunk_results):
+            if config.state.backend == "jax":
+                # jax arrays are immutable, so assign out of place.
+                results[i] = mm.assign(
+                    results[i], chunk_result, slice(start, end)
+                )
+            else:
+                results[i][start:end] = chunk_result
+
+    results = [
+        mm.zeros(_output_shape(output, muygps, batch_count, targets))
+        for output in outputs
+    ]
+    starts = range(0, batch_count, chunk_size)
+    if workers > 1:
+        # numpy releases the GIL within its kernels, so the threads evaluate
+        # and solve their chunks concurrently and write disjoint slices of the
+        # results.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    lambda start: store_chunk(start, predict_chunk(start)),
+                    starts,
+                )
+            )
+    else:
+        for start in starts:
+            store_chunk(start, predict_chunk(start))
+    return results[0] if len(results) == 1 else tuple(results)
+
+
 def posterior_mean_from_indices(
     muygps: Union[MuyGPS, MMuyGPS],
     indices: np.ndarray,
@@ -46,13 +171,23 @@ def posterior_mean_from_indices(
     test: np.ndarray,
     train: np.ndarray,
     targets: np.ndarray,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
     **kwargs,
 ) -> np.ndarray:
-    pairwise_tensor, crosswise_tensor, batch_nn_targets = tensors_from_indices(
-        muygps, indices, nn_indices, test, train, targets
-    )
-    return muygps.posterior_mean(
-        pairwise_tensor, crosswise_tensor, batch_nn_targets
+    return _predict_in_chunks(
+        muygps.posterior_mean,
+        ("mean",),
+        muygps,
+        indices,
+        nn_indices,
+        test,
+        train,
+        targets,
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+        workers=workers,
     )
 
 
@@ -63,13 +198,23 @@ def posterior_variance_from_indices(
     test: np.ndarray,
     train: np.ndarray,
     targets: np.ndarray,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
     **kwargs,
 ) -> np.ndarray:
-    pairwise_tensor, crosswise_tensor, batch_nn_targets = tensors_from_indices(
-        muygps, indices, nn_indices, test, train, targets
-    )
-    return muygps.posterior_variance(
-        pairwise_tensor, crosswise_tensor, **kwargs
+    return _predict_in_chunks(
+        lambda K, Kcross, _: muygps.posterior_variance(K, Kcross, **kwargs),
+        ("variance",),
+        muygps,
+        indices,
+        nn_indices,
+        test,
+        train,
+        targets,
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+        workers=workers,
     )
 
 
@@ -80,14 +225,26 @@ def regress_from_indices(
     test: np.ndarray,
     train: np.ndarray,
     targets: np.ndarray,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
     **kwargs,
 ) -> Tuple[np.ndarray, np.ndarray]:
-    pairwise_tensor, crosswise_tensor, batch_nn_targets = tensors_from_indices(
-        muygps, indices, nn_indices, test, train, targets
+    return _predict_in_chunks(
+        lambda K, Kcross, batch_nn_targets: muygps.posterior(
+            K, Kcross, batch_nn_targets, **kwargs
+        ),
+        ("mean", "variance"),
+        muygps,
+        indices,
+        nn_indices,
+        test,
+        train,
+        targets,
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+        workers=workers,
     )
-    return muygps.posterior_mean(
-        pairwise_tensor, crosswise_tensor, batch_nn_targets
-    ), muygps.posterior_variance(pairwise_tensor, crosswise_tensor, **kwargs)
 
 
 def fast_posterior_mean_from_indices(
@@ -109,12 +266,12 @@ def fast_posterior_mean_from_indices(
         Kcross = muygps.kernel(crosswise_diffs)
         return muygps.fast_posterior_mean(
             Kcross,
-            coeffs_tensor[closest_index, :, :],
+            fast_coefficients_tensor(coeffs_tensor, closest_index),
         )
     else:
         return muygps.fast_posterior_mean(
             crosswise_diffs,
-            coeffs_tensor[closest_index, :, :],
+            fast_coefficients_tensor(coeffs_tensor, closest_index),
         )
 
 
@@ -119,13 +119,7 @@ def predict_single_model(
     Kcross = model.GP_layer.muygps_model.kernel(crosswise_diffs)
     K = model.GP_layer.muygps_model.kernel(pairwise_diffs)
 
-    predictions = model.GP_layer.muygps_model.posterior_mean(
-        K, Kcross, test_nn_targets
-    )
-
-    variances = model.GP_layer.muygps_model.posterior_variance(K, Kcross)
-
-    return predictions, variances
+    return model.GP_layer.muygps_model.posterior(K, Kcross, test_nn_targets)
 
 
 def predict_multiple_model(
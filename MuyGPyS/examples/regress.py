@@ -18,11 +18,11 @@ above and :func:`~MuyGPyS.examples.regress.regress_any`.
 """
 import numpy as np
 from time import perf_counter
-from typing import Dict, List, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from MuyGPyS.examples.from_indices import regress_from_indices
 from MuyGPyS.gp import MuyGPS, MultivariateMuyGPS as MMuyGPS
-from MuyGPyS.gp.tensors import make_train_tensors
+from MuyGPyS.gp.tensors import locality_order, make_train_tensors
 from MuyGPyS.neighbors import NN_Wrapper
 from MuyGPyS.optimize import Bayes_optimize, OptimizeFn
 from MuyGPyS.optimize.batch import sample_batch
@@ -468,6 +468,10 @@ def do_regress(
     nn_kwargs: Dict = dict(),
     opt_kwargs: Dict = dict(),
     verbose: bool = False,
+    reorder: bool = False,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> Tuple[Union[MuyGPS, MMuyGPS], NN_Wrapper, np.ndarray, np.ndarray]:
     """
     Convenience function initializing a model and performing regression.
@@ -557,6 +561,19 @@ def do_regress(
             corresponding library for supported parameters.
         verbose:
             If `True`, print summary statistics.
+        reorder:
+            If `True`, predict the test data in locality order. See
+            :func:`~MuyGPyS.examples.regress.regress_any`.
+        chunk_size:
+            If given, predict at most `chunk_size` test items at a time. See
+            :func:`~MuyGPyS.examples.regress.regress_any`.
+        memory_budget:
+            An approximate memory bound in bytes, used to choose the chunk size
+            if `chunk_size` is not given. See
+            :func:`~MuyGPyS.examples.regress.regress_any`.
+        workers:
+            The number of threads predicting chunks concurrently. See
+            :func:`~MuyGPyS.examples.regress.regress_any`.
 
     Returns
     -------
@@ -590,6 +607,10 @@ def do_regress(
         train_features,
         nbrs_lookup,
         train_targets,
+        reorder=reorder,
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+        workers=workers,
     )
 
     return regressor, nbrs_lookup, posterior_mean, posterior_variance
@@ -601,6 +622,10 @@ def regress_any(
     train_features: np.ndarray,
     train_nbrs_lookup: NN_Wrapper,
     train_targets: np.ndarray,
+    reorder: bool = False,
+    chunk_size: Optional[int] = None,
+    memory_budget: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> Tuple[np.ndarray, np.ndarray, Dict[str, float]]:
     """
     Simultaneously predicts the response for each test item.
@@ -617,6 +642,28 @@ def regress_any(
         train_targets:
             Observed response for all training data of shape
             `(train_count, class_count)`.
+        reorder:
+            If `True`, predict the test data in the order given by
+            :func:`~MuyGPyS.gp.tensors.locality_order`, so that consecutive
+            test items share most of their neighbors' training data while it
+            is in cache, and return the predictions in the original order. Not
+            supported by the mpi backend.
+        chunk_size:
+            If given, build the kernel tensors and solve them for at most
+            `chunk_size` test items at a time, writing the predictions into
+            preallocated outputs. Peak memory then depends upon `chunk_size`
+            rather than `test_count`. Not supported by the mpi backend.
+        memory_budget:
+            An approximate bound in bytes upon the memory used by the tensors
+            of all concurrently predicted chunks, from which the chunk size is
+            chosen. Ignored if `chunk_size` is given.
+        workers:
+            If greater than one, predict the chunks concurrently upon a pool of
+            `workers` threads. numpy releases the GIL while evaluating kernels
+            and factoring, so this uses several cores even when each small
+            solve is single-threaded. Splits the test data into four chunks
+            per worker if neither `chunk_size` nor `memory_budget` is given.
+            Only supported by the numpy backend.
 
     Returns
     -------
@@ -641,14 +688,25 @@ def regress_any(
 
     time_agree = perf_counter()
 
+    test_indices = np.arange(test_count)
+    if reorder is True:
+        order, inverse = locality_order(test_features)
+        test_indices = test_indices[order]
+        test_nn_indices = test_nn_indices[order]
     posterior_mean, posterior_variance = regress_from_indices(
         regressor,
-        np.arange(test_count),
+        test_indices,
         test_nn_indices,
         test_features,
         train_features,
         train_targets,
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+        workers=workers,
     )
+    if reorder is True:
+        posterior_mean = posterior_mean[inverse]
+        posterior_variance = posterior_variance[inverse]
     time_pred = perf_counter()
 
     timing = {
@@ -8,7 +8,10 @@ from typing import List, Tuple, Callable, Dict
 import MuyGPyS._src.math as mm
 from MuyGPyS._src.util import auto_str
 
-from MuyGPyS.gp.deformation.deformation_fn import DeformationFn
+from MuyGPyS.gp.deformation.deformation_fn import (
+    DeformationFn,
+    _get_sq_dist_fn,
+)
 from MuyGPyS.gp.hyperparameter import ScalarParam
 
 
@@ -31,7 +34,9 @@ class Anisotropy(DeformationFn):
             `(..., feature_count)` whose last dimension lists the elementwise
             differences between a pair of feature vectors and returns a tensor
             of shape `(...)`, having collapsed the last dimension into a
-            scalar difference.
+            scalar difference. Only :func:`~MuyGPyS.gp.deformation.F2` and
+            :func:`~MuyGPyS.gp.deformation.l2` also support tensors of squared
+            differences, i.e. `tensor_form="sq_diffs"`.
         length_scales:
             Keyword arguments `length_scale#`, mapping to scalar
             hyperparameters.
@@ -43,6 +48,7 @@ class Anisotropy(DeformationFn):
         **length_scales,
     ):
         self._dist_fn = metric
+        self._sq_dist_fn = _get_sq_dist_fn(metric)
         for i, key in enumerate(length_scales.keys()):
             if key != "length_scale" + str(i):
                 raise ValueError(
@@ -62,7 +68,9 @@ class Anisotropy(DeformationFn):
             )
         self.length_scale = length_scales
 
-    def __call__(self, diffs: mm.ndarray, **length_scales) -> mm.ndarray:
+    def __call__(
+        self, diffs: mm.ndarray, tensor_form: str = "diffs", **length_scales
+    ) -> mm.ndarray:
         """
         Apply anisotropic deformation to an elementwise difference tensor.
 
@@ -73,7 +81,11 @@ class Anisotropy(DeformationFn):
         Args:
             diffs:
                 A tensor of pairwise differences of shape
-                `(..., feature_count)`.
+                `(..., feature_count)`, or of their squares if
+                `tensor_form="sq_diffs"`.
+            tensor_form:
+                Either `"diffs"` or `"sq_diffs"`, identifying the form of
+                `diffs`.
             batch_features:
                 A `(batch_count, feature_count)` matrix of features to be used
                 with a hierarchical hyperparameter. `None` otherwise.
@@ -86,10 +98,66 @@ class Anisotropy(DeformationFn):
             `(data_count, nn_count, nn_count)` whose last two dimensions are
             pairwise distance matrices.
         """
+        if tensor_form not in ["diffs", "sq_diffs"]:
+            raise ValueError(
+                "Anisotropy requires feature-wise difference tensors, not "
+                f"{tensor_form}"
+            )
         length_scale_array = self._length_scale_array(
             diffs.shape, **length_scales
         )
-        return self._dist_fn(diffs / length_scale_array)
+        if tensor_form == "diffs":
+            return self._dist_fn(diffs / length_scale_array)
+        if self._sq_dist_fn is None:
+            raise ValueError(
+                "Squared difference tensors are only supported by the F2 and "
+                "l2 metrics"
+            )
+        return self._sq_dist_fn(diffs @ (1 / length_scale_array**2))
+
+    def supports(self, tensor_form: str) -> bool:
+        """
+        Report whether the deformation accepts tensors of the given form.
+
+        Args:
+            tensor_form:
+                A tensor form, e.g. `"diffs"` or `"sq_diffs"`.
+
+        Returns:
+            `True` if embedded kernel functions accept the `tensor_form`.
+        """
+        if tensor_form == "sq_diffs":
+            return self._sq_dist_fn is not None
+        return tensor_form == "diffs"
+
+    def precompute(
+        self, diffs: mm.ndarray, tensor_form: str = "diffs"
+    ) -> Tuple[mm.ndarray, str]:
+        """
+        Square a difference tensor elementwise, if possible.
+
+        With the `F2` and `l2` metrics, each subsequent evaluation then only
+        contracts the feature dimension against the inverse squared length
+        scales, rather than scaling, squaring, and summing the differences.
+
+        Args:
+            diffs:
+                A tensor of pairwise differences of shape
+                `(..., feature_count)`, or an already reduced tensor.
+            tensor_form:
+                The form of `diffs`.
+
+        Returns
+        -------
+            tensor:
+                A tensor of squared differences of shape `(..., feature_count)`
+                if supported by the metric, otherwise `diffs`.
+            tensor_form:
+                The form of `tensor`.
+        """
+        if tensor_form == "diffs" and self._sq_dist_fn is not None:
+            return diffs**2, "sq_diffs"
+        return diffs, tensor_form
 
     def _length_scale_array(
         self, shape: mm.ndarray, **length_scales
@@ -158,10 +226,13 @@ class Anisotropy(DeformationFn):
             the last tensor dimension by collapsing the feature-wise differences
             into scalar distances. Propagates any `length_scaleN` kwargs to the
             deformation fn, making the function drivable by keyword
-            optimization.
+            optimization. Also adds a `tensor_form` kwarg identifying whether
+            `diffs` is a difference or squared difference tensor.
         """
 
-        def embedded_fn(diffs, *args, length_scale=None, **kwargs):
+        def embedded_fn(
+            diffs, *args, length_scale=None, tensor_form="diffs", **kwargs
+        ):
             length_scales = {
                 key: kwargs[key]
                 for key in kwargs
@@ -172,6 +243,10 @@ class Anisotropy(DeformationFn):
                 for key in kwargs
                 if not key.startswith("length_scale")
             }
-            return fn(self(diffs, **length_scales), *args, **kwargs)
+            return fn(
+                self(diffs, tensor_form=tensor_form, **length_scales),
+                *args,
+                **kwargs,
+            )
 
         return embedded_fn
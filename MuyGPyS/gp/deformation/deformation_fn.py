@@ -4,9 +4,24 @@
 # SPDX-License-Identifier: MIT
 
 
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import MuyGPyS._src.math as mm
+from MuyGPyS._src.gp.tensors import _F2, _l2
+
+
+def _identity(sq_dists: mm.ndarray) -> mm.ndarray:
+    return sq_dists
+
+
+def _get_sq_dist_fn(metric: Callable) -> Optional[Callable]:
+    # The function mapping scaled squared distances to the output of `metric`,
+    # if there is one.
+    if metric is _F2:
+        return _identity
+    elif metric is _l2:
+        return mm.sqrt
+    return None
 
 
 class DeformationFn:
@@ -61,6 +76,47 @@ class DeformationFn:
             "Cannot call DeformationFn base class functions!"
         )
 
+    def supports(self, tensor_form: str) -> bool:
+        """
+        Report whether the deformation accepts tensors of the given form.
+
+        Args:
+            tensor_form:
+                A tensor form, e.g. `"diffs"` or `"sq_dists"`.
+
+        Returns:
+            `True` if embedded kernel functions accept the `tensor_form`.
+        """
+        return tensor_form == "diffs"
+
+    def precompute(
+        self, diffs: mm.ndarray, tensor_form: str = "diffs"
+    ) -> Tuple[mm.ndarray, str]:
+        """
+        Reduce a difference tensor ahead of repeated kernel evaluations.
+
+        Deformations whose dependence upon the feature dimension does not
+        involve their hyperparameters override this to perform that reduction
+        once, e.g. prior to optimization. The default returns its input
+        unchanged.
+
+        Args:
+            diffs:
+                A tensor of pairwise differences of shape
+                `(..., feature_count)`, or an already reduced tensor.
+            tensor_form:
+                The form of `diffs`.
+
+        Returns
+        -------
+            tensor:
+                The reduced tensor.
+            tensor_form:
+                The form of `tensor`, to be passed as the `tensor_form` kwarg
+                of the embedded kernel function.
+        """
+        return diffs, tensor_form
+
     def embed_fn(self, fn: Callable) -> Callable:
         """
         Augments a function to automatically apply the deformation to a
@@ -7,8 +7,13 @@
 from typing import Callable, Dict, List, Optional, Tuple
 
 import MuyGPyS._src.math as mm
+from MuyGPyS._src.gp.tensors import _F2
 from MuyGPyS._src.util import auto_str
-from MuyGPyS.gp.deformation.deformation_fn import DeformationFn
+from MuyGPyS.gp.deformation.deformation_fn import (
+    DeformationFn,
+    _get_sq_dist_fn,
+    _identity,
+)
 from MuyGPyS.gp.hyperparameter import ScalarParam
 
 
@@ -31,7 +36,9 @@ class Isotropy(DeformationFn):
             `(..., feature_count)` whose last dimension lists the elementwise
             differences between a pair of feature vectors and returns a tensor
             of shape `(...)`, having collapsed the last dimension into a
-            scalar difference.
+            scalar difference. Only :func:`~MuyGPyS.gp.deformation.F2` and
+            :func:`~MuyGPyS.gp.deformation.l2` also support squared distance
+            tensors, i.e. `tensor_form="sq_dists"`.
         length_scale:
             Some scalar nonnegative hyperparameter object.
     """
@@ -48,9 +55,15 @@ class Isotropy(DeformationFn):
             )
         self.length_scale = length_scale
         self._dist_fn = metric
+        self._sq_dist_fn = _get_sq_dist_fn(metric)
 
     def __call__(
-        self, diffs: mm.ndarray, length_scale: Optional[float] = None, **kwargs
+        self,
+        diffs: mm.ndarray,
+        length_scale: Optional[float] = None,
+        tensor_form: str = "diffs",
+        out: Optional[mm.ndarray] = None,
+        **kwargs,
     ) -> mm.ndarray:
         """
         Apply isotropic deformation to an elementwise difference tensor.
@@ -62,9 +75,16 @@ class Isotropy(DeformationFn):
         Args:
             diffs:
                 A tensor of pairwise differences of shape
-                `(..., feature_count)`.
+                `(..., feature_count)`, or a tensor of squared distances of
+                shape `(...)` if `tensor_form="sq_dists"`.
             length_scale:
                 A floating point length scale.
+            tensor_form:
+                Either `"diffs"` or `"sq_dists"`, identifying the form of
+                `diffs`.
+            out:
+                If provided, a tensor of shape `(...)` into which to write the
+                distances, which are then returned.
         Returns:
             A crosswise distance matrix of shape `(data_count, nn_count)` or a
             pairwise distance tensor of shape
@@ -73,7 +93,72 @@ class Isotropy(DeformationFn):
         """
         if length_scale is None:
             length_scale = self.length_scale()
-        return self._dist_fn(diffs / length_scale)
+        if tensor_form == "diffs":
+            dists = self._dist_fn(diffs / length_scale)
+            if out is None:
+                return dists
+            out[...] = dists
+            return out
+        elif tensor_form == "sq_dists":
+            if self._sq_dist_fn is None:
+                raise ValueError(
+                    "Squared distance tensors are only supported by the F2 "
+                    "and l2 metrics"
+                )
+            if out is None:
+                return self._sq_dist_fn(diffs / length_scale**2)
+            # Scale into `out` and finish the metric in place, so that `out`
+            # is the only distance-sized tensor touched.
+            mm.divide(diffs, length_scale**2, out=out)
+            if self._sq_dist_fn is not _identity:
+                self._sq_dist_fn(out, out=out)
+            return out
+        else:
+            raise ValueError(f"Unsupported tensor form {tensor_form}")
+
+    def supports(self, tensor_form: str) -> bool:
+        """
+        Report whether the deformation accepts tensors of the given form.
+
+        Args:
+            tensor_form:
+                A tensor form, e.g. `"diffs"` or `"sq_dists"`.
+
+        Returns:
+            `True` if embedded kernel functions accept the `tensor_form`.
+        """
+        if tensor_form == "sq_dists":
+            return self._sq_dist_fn is not None
+        return tensor_form == "diffs"
+
+    def precompute(
+        self, diffs: mm.ndarray, tensor_form: str = "diffs"
+    ) -> Tuple[mm.ndarray, str]:
+        """
+        Reduce a difference tensor to squared distances, if possible.
+
+        The length scale only divides the squared distances, so the `F2` and
+        `l2` metrics allow the feature dimension to be collapsed once rather
+        than upon every kernel evaluation.
+
+        Args:
+            diffs:
+                A tensor of pairwise differences of shape
+                `(..., feature_count)`, or an already reduced tensor.
+            tensor_form:
+                The form of `diffs`.
+
+        Returns
+        -------
+            tensor:
+                A tensor of squared distances of shape `(...)` if supported by
+                the metric, otherwise `diffs`.
+            tensor_form:
+                The form of `tensor`.
+        """
+        if tensor_form == "diffs" and self._sq_dist_fn is not None:
+            return _F2(diffs), "sq_dists"
+        return diffs, tensor_form
 
     def get_opt_params(
         self,
@@ -122,10 +207,29 @@ class Isotropy(DeformationFn):
             A new Callable that applies the deformation to `diffs`, removing
             the last tensor dimension by collapsing the feature-wise differences
             into scalar distances. Also adds a `length_scale` kwarg, making the
-            function drivable by keyword optimization.
+            function drivable by keyword optimization, and a `tensor_form`
+            kwarg identifying whether `diffs` is a difference or squared
+            distance tensor. An `out` kwarg, if given, receives the distances
+            and is forwarded to `fn`, which the numpy kernel functions evaluate
+            in place.
         """
 
-        def embedded_fn(diffs, *args, length_scale=None, **kwargs):
-            return fn(self(diffs, length_scale=length_scale), *args, **kwargs)
+        def embedded_fn(
+            diffs,
+            *args,
+            length_scale=None,
+            tensor_form="diffs",
+            out=None,
+            **kwargs,
+        ):
+            dists = self(
+                diffs,
+                length_scale=length_scale,
+                tensor_form=tensor_form,
+                out=out,
+            )
+            if out is not None:
+                kwargs["out"] = out
+            return fn(dists, *args, **kwargs)
 
         return embedded_fn
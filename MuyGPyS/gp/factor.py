@@ -0,0 +1,285 @@
+# Copyright 2021-2023 Lawrence Livermore National Security, LLC and other
+# MuyGPyS Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Batched factorizations of kernel tensors
+"""
+
+from copy import copy
+from typing import Callable, Dict, Tuple
+
+import MuyGPyS._src.math as mm
+from MuyGPyS._src.gp.muygps import (
+    _muygps_cholesky_factor,
+    _muygps_cholesky_solve,
+    _muygps_cholesky_whiten,
+    _muygps_eigen_factor,
+    _muygps_eigen_rotate,
+    _muygps_eigen_solve,
+    _muygps_eigen_whiten,
+)
+from MuyGPyS._src.gp.noise import _homoscedastic_perturb
+from MuyGPyS._src.gp.tensors import _expand_kernel_tensor
+
+
+class KernelFactor:
+    """
+    Base class of the batched factorizations of noise-perturbed kernel tensors.
+
+    Posterior means, posterior variances, fast posterior mean coefficients and
+    the analytic :math:`\\sigma^2` scale accept any `KernelFactor` in place of
+    `K`. Subclasses expose the perturbed kernel tensor as `K`, and implement
+    :func:`whiten` and :func:`solve`.
+    """
+
+    K: mm.ndarray
+
+    def whiten(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Apply a whitening transformation of the factored kernel tensor to a
+        batch of right hand sides.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            A tensor :math:`W B` of the same shape as `B`, where
+            :math:`W^T W = (K + \\varepsilon)^{-1}`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement whiten"
+        )
+
+    def solve(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Solve a batch of right hand sides against the factored kernel tensor.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            A tensor of the same shape as `B` containing
+            :math:`(K + \\varepsilon)^{-1} B`.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not implement solve"
+        )
+
+
+class CholeskyFactor(KernelFactor):
+    """
+    The batched Cholesky factorization of a noise-perturbed kernel tensor.
+
+    Factors each `(nn_count, nn_count)` matrix of a perturbed kernel tensor
+    :math:`K + \\varepsilon` as :math:`L L^T`, where :math:`L` is lower
+    triangular. Posterior means, posterior variances and the analytic
+    :math:`\\sigma^2` scale all need solves against the same perturbed kernel
+    tensor, and each of them accepts a `CholeskyFactor` in place of `K`.
+    The factorization is then computed once and shared between them.
+
+    Each of these quantities is an inner product of the form
+    :math:`a^T (K + \\varepsilon)^{-1} b = (L^{-1} a)^T (L^{-1} b)`, so they
+    only need the forward solves that :func:`whiten` computes. `whiten`
+    remembers its results, so the cross-covariance is only whitened once when
+    computing both the posterior mean and variance.
+
+    Factors are usually obtained from
+    :func:`~MuyGPyS.gp.muygps.MuyGPS.factor`, which applies the model's noise
+    perturbation first.
+
+    Example:
+        >>> K = muygps.kernel(pairwise_diffs)
+        >>> Kcross = muygps.kernel(crosswise_diffs)
+        >>> factor = muygps.factor(K)
+        >>> mean = muygps.posterior_mean(factor, Kcross, batch_nn_targets)
+        >>> variance = muygps.posterior_variance(factor, Kcross)
+
+    Args:
+        K:
+            A tensor of shape `(batch_count, nn_count, nn_count)` containing
+            the already perturbed `(nn_count, nn_count)`-shaped kernel matrices
+            corresponding to each of the batch elements, or their packed upper
+            triangles of shape `(batch_count, nn_count * (nn_count + 1) // 2)`.
+    """
+
+    def __init__(
+        self,
+        K: mm.ndarray,
+        _backend_factor_fn: Callable = _muygps_cholesky_factor,
+        _backend_whiten_fn: Callable = _muygps_cholesky_whiten,
+        _backend_solve_fn: Callable = _muygps_cholesky_solve,
+    ):
+        self.K = _expand_kernel_tensor(K)
+        self.L = _backend_factor_fn(self.K)
+        self._whiten_fn = _backend_whiten_fn
+        self._solve_fn = _backend_solve_fn
+        self._whitened: Dict[int, Tuple[mm.ndarray, mm.ndarray]] = dict()
+
+    def whiten(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Forward solve a batch of right hand sides against the factor.
+
+        Results are remembered for as long as the factor lives, keyed upon the
+        identity of `B`, so repeated calls with the same array are free.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            A tensor of the same shape as `B` containing :math:`L^{-1} B`.
+        """
+        cached = self._whitened.get(id(B))
+        if cached is not None and cached[0] is B:
+            return cached[1]
+        W = self._whiten_fn(self.L, B)
+        self._whitened[id(B)] = (B, W)
+        return W
+
+    def solve(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Solve a batch of right hand sides against the factored kernel tensor.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            A tensor of the same shape as `B` containing
+            :math:`(K + \\varepsilon)^{-1} B`.
+        """
+        return self._solve_fn(self.L, B)
+
+
+class EigenFactor(KernelFactor):
+    """
+    The batched eigendecomposition of a kernel tensor under homoscedastic noise.
+
+    Decomposes each unperturbed `(nn_count, nn_count)` matrix of a kernel
+    tensor as :math:`K = Q \\Lambda Q^T`. The perturbed matrix
+    :math:`K + \\tau^2 I = Q (\\Lambda + \\tau^2 I) Q^T` shares the same
+    eigenvectors for every homoscedastic noise prior variance :math:`\\tau^2`,
+    so once `K` and the right hand sides are rotated into the eigenbasis, any
+    noise value's solves reduce to diagonal rescalings. :func:`perturb` returns
+    a factor of a different noise value that shares the decomposition and the
+    rotated right hand sides, which makes evaluating many noise values against
+    the same kernel tensor cheap, e.g. when only the noise is optimized.
+
+    An `EigenFactor` can be passed anywhere a
+    :class:`~MuyGPyS.gp.factor.CholeskyFactor` is accepted. The
+    eigendecomposition costs several times as much as a Cholesky
+    factorization, so it only pays off when it is reused across noise values.
+
+    Example:
+        >>> K = muygps.kernel(pairwise_diffs)
+        >>> Kcross = muygps.kernel(crosswise_diffs)
+        >>> factor = EigenFactor(K, 1e-3)
+        >>> for noise in [1e-4, 1e-3, 1e-2]:
+        ...     mean = muygps.posterior_mean(
+        ...         factor.perturb(noise), Kcross, batch_nn_targets
+        ...     )
+
+    Args:
+        K:
+            A tensor of shape `(batch_count, nn_count, nn_count)` containing
+            the unperturbed `(nn_count, nn_count)`-shaped kernel matrices
+            corresponding to each of the batch elements, or their packed upper
+            triangles of shape `(batch_count, nn_count * (nn_count + 1) // 2)`.
+        noise:
+            The homoscedastic noise prior variance :math:`\\tau^2`.
+    """
+
+    def __init__(
+        self,
+        K: mm.ndarray,
+        noise: float,
+        _backend_factor_fn: Callable = _muygps_eigen_factor,
+        _backend_rotate_fn: Callable = _muygps_eigen_rotate,
+        _backend_whiten_fn: Callable = _muygps_eigen_whiten,
+        _backend_solve_fn: Callable = _muygps_eigen_solve,
+        _backend_perturb_fn: Callable = _homoscedastic_perturb,
+    ):
+        self._K = _expand_kernel_tensor(K)
+        self.eigenvalues, self.eigenvectors = _backend_factor_fn(self._K)
+        self.noise = noise
+        self._rotate_fn = _backend_rotate_fn
+        self._whiten_fn = _backend_whiten_fn
+        self._solve_fn = _backend_solve_fn
+        self._perturb_fn = _backend_perturb_fn
+        self._rotated: Dict[int, Tuple[mm.ndarray, mm.ndarray]] = dict()
+
+    @property
+    def K(self) -> mm.ndarray:
+        return self._perturb_fn(self._K, self.noise)
+
+    def perturb(self, noise: float) -> "EigenFactor":
+        """
+        Returns the factor of the kernel tensor under a different noise value.
+
+        The returned factor shares the eigendecomposition and the rotated right
+        hand sides of this factor, so creating it is free.
+
+        Args:
+            noise:
+                The homoscedastic noise prior variance :math:`\\tau^2`.
+
+        Returns:
+            An `EigenFactor` of :math:`K + \\tau^2 I`.
+        """
+        factor = copy(self)
+        factor.noise = noise
+        return factor
+
+    def _rotate(self, B: mm.ndarray) -> mm.ndarray:
+        # Rotations do not depend upon the noise, so they are remembered and
+        # shared by all of the factors returned by `perturb`.
+        cached = self._rotated.get(id(B))
+        if cached is not None and cached[0] is B:
+            return cached[1]
+        R = self._rotate_fn(self.eigenvectors, B)
+        self._rotated[id(B)] = (B, R)
+        return R
+
+    def whiten(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Whiten a batch of right hand sides against the perturbed eigenbasis.
+
+        Computes :math:`(\\Lambda + \\tau^2 I)^{-1/2} Q^T B`. The rotation
+        :math:`Q^T B` is remembered, keyed upon the identity of `B`, so
+        whitening the same array under another noise value is a diagonal
+        rescaling.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            The whitened tensor, of the same shape as `B`.
+        """
+        return self._whiten_fn(self.eigenvalues, self._rotate(B), self.noise)
+
+    def solve(self, B: mm.ndarray) -> mm.ndarray:
+        """
+        Solve a batch of right hand sides against the perturbed kernel tensor.
+
+        Args:
+            B:
+                A tensor of shape `(batch_count, nn_count)` or
+                `(batch_count, nn_count, response_count)`.
+
+        Returns:
+            A tensor of the same shape as `B` containing
+            :math:`(K + \\tau^2 I)^{-1} B`.
+        """
+        return self._solve_fn(
+            self.eigenvectors, self.eigenvalues, self._rotate(B), self.noise
+        )
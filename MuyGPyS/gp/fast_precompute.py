@@ -13,6 +13,7 @@ import MuyGPyS._src.math as mm
 from MuyGPyS._src.gp.muygps import (
     _muygps_fast_posterior_mean_precompute,
 )
+from MuyGPyS.gp.factor import KernelFactor
 from MuyGPyS.gp.noise import NoiseFn
 
 
@@ -32,4 +33,6 @@ class FastPrecomputeCoefficients:
         train_nn_targets_fast: mm.ndarray,
         **kwargs,
     ) -> mm.ndarray:
+        if isinstance(K, KernelFactor):
+            return K.solve(train_nn_targets_fast)
         return self._fn(K, train_nn_targets_fast, **kwargs)
@@ -11,11 +11,14 @@ from typing import Callable, Tuple, Type
 
 import MuyGPyS._src.math as mm
 import MuyGPyS._src.math.numpy as np
+from MuyGPyS._src.gp.tensors import _expand_kernel_tensor
 from MuyGPyS._src.util import _fullname
 from MuyGPyS._src.optimize.scale import (
     _analytic_scale_optim,
     _analytic_scale_optim_unnormalized,
+    _analytic_scale_optim_whitened,
 )
+from MuyGPyS.gp.factor import KernelFactor
 
 
 class ScaleFn:
@@ -182,9 +185,15 @@ class AnalyticScale(ScaleFn):
             The integer number of response dimensions.
     """
 
-    def __init__(self, _backend_fn: Callable = _analytic_scale_optim, **kwargs):
+    def __init__(
+        self,
+        _backend_fn: Callable = _analytic_scale_optim,
+        _backend_whitened_fn: Callable = _analytic_scale_optim_whitened,
+        **kwargs,
+    ):
         super().__init__(**kwargs)
         self._fn = _backend_fn
+        self._whitened_fn = _backend_whitened_fn
 
     def get_opt_fn(self, muygps) -> Callable:
         """
@@ -216,11 +225,17 @@ class AnalyticScale(ScaleFn):
             `(K, nn_targets, *args, **kwargs) -> mm.ndarray` that perturbs the
             `(batch_count, nn_count, nn_count)` tensor `K` with `muygps`'s noise
             model before solving it against the
-            `(batch_count, nn_count, response_count)` tensor `nn_targets`.
+            `(batch_count, nn_count, response_count)` tensor `nn_targets`. `K`
+            may instead be a :class:`~MuyGPyS.gp.factor.KernelFactor` of the
+            perturbed kernel tensor, whose factorization is then reused.
         """
 
         def analytic_scale_opt_fn(K, nn_targets, *args, **kwargs):
-            return self._fn(muygps.noise.perturb(K), nn_targets)
+            if isinstance(K, KernelFactor):
+                return self._whitened_fn(K.whiten(nn_targets))
+            return self._fn(
+                _expand_kernel_tensor(muygps.noise.perturb(K)), nn_targets
+            )
 
         return analytic_scale_opt_fn
 
@@ -273,13 +288,16 @@ class DownSampleScale(ScaleFn):
         """
 
         def downsample_analytic_scale_opt_fn(K, nn_targets, *args, **kwargs):
-            batch_count, nn_count, _ = K.shape
+            if isinstance(K, KernelFactor):
+                pK = K.K
+            else:
+                pK = _expand_kernel_tensor(muygps.noise.perturb(K))
+            batch_count, nn_count, _ = pK.shape
             if nn_count <= self._down_count:
                 raise ValueError(
                     f"bad attempt to downsample {self._down_count} elements "
                     f"from a set of only {nn_count} options"
                 )
-            pK = muygps.noise.perturb(K)
             scales = []
             for _ in range(self._iteration_count):
                 sampled_indices = np.random.choice(
@@ -94,7 +94,12 @@ class RBF(KernelFn):
                 `(data_count, nn_count, nn_count, feature_count)` or
                 `(data_count, nn_count, feature_count)`. In the four dimensional
                 case, it is assumed that the diagonals dists
-                diffs[i, j, j, :] == 0.
+                diffs[i, j, j, :] == 0. If the kwarg `tensor_form="sq_dists"`
+                is passed, instead a tensor of squared distances of shape
+                `(data_count, nn_count, nn_count)` or `(data_count, nn_count)`.
+                Only supported by isotropic deformations. If the kwarg `out`
+                is passed, the kernel tensor is written into it and returned
+                under the numpy and mpi backends, avoiding a new allocation.
 
         Returns:
             A cross-covariance matrix of shape `(data_count, nn_count)` or a
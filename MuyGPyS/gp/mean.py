@@ -10,7 +10,11 @@ MuyGPs implementation
 from typing import Callable
 
 import MuyGPyS._src.math as mm
-from MuyGPyS._src.gp.muygps import _muygps_posterior_mean
+from MuyGPyS._src.gp.muygps import (
+    _muygps_posterior_mean,
+    _muygps_whitened_posterior_mean,
+)
+from MuyGPyS.gp.factor import KernelFactor
 from MuyGPyS.gp.noise import NoiseFn
 
 
@@ -19,10 +23,12 @@ class PosteriorMean:
         self,
         noise: NoiseFn,
         _backend_fn: Callable = _muygps_posterior_mean,
+        _backend_whitened_fn: Callable = _muygps_whitened_posterior_mean,
         **kwargs,
     ):
         self._fn = _backend_fn
         self._fn = noise.perturb_fn(self._fn)
+        self._whitened_fn = _backend_whitened_fn
 
     def __call__(
         self,
@@ -31,7 +37,11 @@ class PosteriorMean:
         batch_nn_targets: mm.ndarray,
         **kwargs,
     ) -> mm.ndarray:
+        if isinstance(K, KernelFactor):
+            return self._whitened_fn(
+                K.whiten(Kcross), K.whiten(batch_nn_targets)
+            )
         return self._fn(K, Kcross, batch_nn_targets, **kwargs)
 
     def get_opt_fn(self) -> Callable:
-        return self._fn
+        return self.__call__
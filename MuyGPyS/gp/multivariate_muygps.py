@@ -6,6 +6,8 @@
 """
 Multivariate MuyGPs implementation
 """
+from typing import Tuple
+
 import MuyGPyS._src.math as mm
 from MuyGPyS._src.gp.muygps import _mmuygps_fast_posterior_mean
 from MuyGPyS.gp.hyperparameter import FixedScale
@@ -217,6 +219,67 @@ class MultivariateMuyGPS:
             )
         return diagonal_variance
 
+    def posterior(
+        self,
+        pairwise_diffs: mm.ndarray,
+        crosswise_diffs: mm.ndarray,
+        batch_nn_targets: mm.ndarray,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        """
+        Returns the posterior mean and variance from the provided difference
+        tensors and the target matrix.
+
+        Equivalent to calling :func:`posterior_mean` and then
+        :func:`posterior_variance`, save that each internal model realizes its
+        kernel tensors and factors them only once.
+
+        Args:
+            pairwise_diffs:
+                A tensor of shape
+                `(batch_count, nn_count, nn_count, feature_count)` containing
+                the `(nn_count, nn_count, feature_count)`-shaped pairwise
+                nearest neighbor difference tensors corresponding to each of the
+                batch elements.
+            crosswise_diffs:
+                A matrix of shape `(batch_count, nn_count, feature_count)` whose
+                rows list the difference between each feature of each batch
+                element element and its nearest neighbors.
+            batch_nn_targets:
+                A tensor of shape `(batch_count, nn_count, response_count)`
+                listing the vector-valued responses for the nearest neighbors
+                of each batch element.
+
+        Returns
+        -------
+            mean:
+                A matrix of shape `(batch_count, response_count)` whose rows are
+                the predicted response for each of the given indices.
+            variance:
+                A vector of shape `(batch_count, response_count)` consisting of
+                the diagonal elements of the posterior variance for each model.
+        """
+        batch_count, nn_count, response_count = batch_nn_targets.shape
+        responses = mm.zeros((batch_count, response_count))
+        diagonal_variance = mm.zeros((batch_count, response_count))
+        for i, model in enumerate(self.models):
+            K = model.kernel(pairwise_diffs)
+            Kcross = model.kernel(crosswise_diffs)
+            mean, variance = model.posterior(
+                K,
+                Kcross,
+                batch_nn_targets[:, :, i].reshape(batch_count, nn_count, 1),
+            )
+            responses = mm.assign(
+                responses, mean.reshape(batch_count), slice(None), i
+            )
+            diagonal_variance = mm.assign(
+                diagonal_variance,
+                variance.reshape(batch_count) * self.scale()[i],
+                slice(None),
+                i,
+            )
+        return responses, diagonal_variance
+
     def fast_coefficients(
         self,
         pairwise_diffs_fast: mm.ndarray,
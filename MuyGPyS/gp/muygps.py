@@ -7,10 +7,11 @@
 MuyGPs implementation
 """
 
-from typing import Callable, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import MuyGPyS._src.math as mm
 from MuyGPyS._src.util import auto_str
+from MuyGPyS.gp.factor import CholeskyFactor, KernelFactor
 from MuyGPyS.gp.fast_precompute import (
     _muygps_fast_posterior_mean_precompute,
     FastPrecomputeCoefficients,
@@ -20,6 +21,8 @@ from MuyGPyS.gp.hyperparameter import FixedScale, ScaleFn
 from MuyGPyS.gp.kernels import KernelFn
 from MuyGPyS.gp.mean import _muygps_posterior_mean, PosteriorMean
 from MuyGPyS.gp.noise import HomoscedasticNoise, NoiseFn
+from MuyGPyS.gp.posterior import _muygps_posterior, Posterior
+from MuyGPyS.gp.tensors import Workspace
 from MuyGPyS.gp.variance import _muygps_diagonal_variance, PosteriorVariance
 
 
@@ -98,6 +101,7 @@ class MuyGPS:
         _backend_var_fn: Callable = _muygps_diagonal_variance,
         _backend_fast_mean_fn: Callable = _muygps_fast_posterior_mean,
         _backend_fast_precompute_fn: Callable = _muygps_fast_posterior_mean_precompute,
+        _backend_posterior_fn: Callable = _muygps_posterior,
     ):
         self.kernel = kernel
         self.scale = scale
@@ -106,6 +110,7 @@ class MuyGPS:
         self._backend_var_fn = _backend_var_fn
         self._backend_fast_mean_fn = _backend_fast_mean_fn
         self._backend_fast_precompute_fn = _backend_fast_precompute_fn
+        self._backend_posterior_fn = _backend_posterior_fn
         self._make()
 
     def _make(self) -> None:
@@ -122,6 +127,9 @@ class MuyGPS:
         self._fast_precompute_fn = FastPrecomputeCoefficients(
             self.noise, _backend_fn=self._backend_fast_precompute_fn
         )
+        self._posterior_fn = Posterior(
+            self.noise, self.scale, _backend_fn=self._backend_posterior_fn
+        )
 
     def fixed(self) -> bool:
         """
@@ -159,8 +167,40 @@ class MuyGPS:
         self.noise.append_lists("noise", names, params, bounds)
         return names, mm.array(params), mm.array(bounds)
 
+    def factor(self, K: mm.ndarray) -> CholeskyFactor:
+        """
+        Returns the Cholesky factorization of the noise-perturbed kernel tensor.
+
+        The returned :class:`~MuyGPyS.gp.factor.CholeskyFactor` can be passed
+        in place of `K` to :func:`posterior_mean`, :func:`posterior_variance`
+        and :func:`fast_coefficients`, as well as to the optimization function
+        of the `scale` parameter, so that they share a single factorization
+        instead of each solving the perturbed kernel tensor from scratch.
+
+        Example:
+            >>> K = muygps.kernel(pairwise_diffs)
+            >>> Kcross = muygps.kernel(crosswise_diffs)
+            >>> factor = muygps.factor(K)
+            >>> mean = muygps.posterior_mean(factor, Kcross, batch_nn_targets)
+            >>> variance = muygps.posterior_variance(factor, Kcross)
+
+        Args:
+            K:
+                A tensor of shape `(batch_count, nn_count, nn_count)` containing
+                the `(nn_count, nn_count)`-shaped kernel matrices corresponding
+                to each of the batch elements.
+
+        Returns:
+            The batched Cholesky factor of `K` perturbed by the noise model.
+        """
+        return CholeskyFactor(self.noise.perturb(K))
+
     def posterior_mean(
-        self, K: mm.ndarray, Kcross: mm.ndarray, batch_nn_targets: mm.ndarray
+        self,
+        K: Union[mm.ndarray, KernelFactor],
+        Kcross: mm.ndarray,
+        batch_nn_targets: mm.ndarray,
+        workspace: Optional[Workspace] = None,
     ) -> mm.ndarray:
         """
         Returns the posterior mean from the provided covariance,
@@ -191,7 +231,10 @@ class MuyGPS:
             K:
                 A tensor of shape `(batch_count, nn_count, nn_count)` containing
                 the `(nn_count, nn_count)`-shaped kernel matrices corresponding
-                to each of the batch elements.
+                to each of the batch elements, or their
+                :class:`~MuyGPyS.gp.factor.KernelFactor`, such as the
+                :class:`~MuyGPyS.gp.factor.CholeskyFactor` returned by
+                :func:`factor`.
             Kcross:
                 A matrix of shape `(batch_count, nn_count)` whose rows consist
                 of `(1, nn_count)`-shaped cross-covariance vector corresponding
@@ -200,17 +243,24 @@ class MuyGPS:
                 A tensor of shape `(batch_count, nn_count, response_count)`
                 whose last dimension lists the vector-valued responses for the
                 nearest neighbors of each batch element.
+            workspace:
+                If provided, `K` is perturbed by the noise model into one of
+                the workspace's buffers rather than into a new tensor. Ignored
+                if `K` is a :class:`~MuyGPyS.gp.factor.KernelFactor`.
 
         Returns:
             A matrix of shape `(batch_count, response_count)` whose rows are
             the predicted response for each of the given indices.
         """
-        return self._mean_fn(K, Kcross, batch_nn_targets)
+        return self._mean_fn(
+            K, Kcross, batch_nn_targets, **_perturb_kwargs(K, workspace)
+        )
 
     def posterior_variance(
         self,
-        K: mm.ndarray,
+        K: Union[mm.ndarray, KernelFactor],
         Kcross: mm.ndarray,
+        workspace: Optional[Workspace] = None,
     ) -> mm.ndarray:
         """
         Returns the posterior variance from the provided covariance and
@@ -241,21 +291,83 @@ class MuyGPS:
             K:
                 A tensor of shape `(batch_count, nn_count, nn_count)` containing
                 the `(nn_count, nn_count)`-shaped kernel matrices corresponding
-                to each of the batch elements.
+                to each of the batch elements, or their
+                :class:`~MuyGPyS.gp.factor.KernelFactor`, such as the
+                :class:`~MuyGPyS.gp.factor.CholeskyFactor` returned by
+                :func:`factor`.
             Kcross:
                 A matrix of shape `(batch_count, nn_count)` whose rows consist
                 of `(1, nn_count)`-shaped cross-covariance vector corresponding
                 to each of the batch elements and its nearest neighbors.
+            workspace:
+                If provided, `K` is perturbed by the noise model into one of
+                the workspace's buffers rather than into a new tensor. Ignored
+                if `K` is a :class:`~MuyGPyS.gp.factor.KernelFactor`.
 
         Returns:
             A vector of shape `(batch_count, response_count)` consisting of the
             diagonal elements of the posterior variance.
         """
-        return self._var_fn(K, Kcross)
+        return self._var_fn(K, Kcross, **_perturb_kwargs(K, workspace))
+
+    def posterior(
+        self,
+        K: Union[mm.ndarray, KernelFactor],
+        Kcross: mm.ndarray,
+        batch_nn_targets: mm.ndarray,
+        workspace: Optional[Workspace] = None,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        """
+        Returns the posterior mean and variance from the provided covariance,
+        cross-covariance, and target tensors.
+
+        Equivalent to calling :func:`posterior_mean` and then
+        :func:`posterior_variance` upon the same `K` and `Kcross`, save that
+        `K` is perturbed and factored only once, and the targets and
+        cross-covariance are solved against it together.
+
+        Example:
+            >>> K = muygps.kernel(pairwise_diffs)
+            >>> Kcross = muygps.kernel(crosswise_diffs)
+            >>> mean, variance = muygps.posterior(K, Kcross, batch_nn_targets)
+
+        Args:
+            K:
+                A tensor of shape `(batch_count, nn_count, nn_count)` containing
+                the `(nn_count, nn_count)`-shaped kernel matrices corresponding
+                to each of the batch elements, or their
+                :class:`~MuyGPyS.gp.factor.KernelFactor`, such as the
+                :class:`~MuyGPyS.gp.factor.CholeskyFactor` returned by
+                :func:`factor`.
+            Kcross:
+                A matrix of shape `(batch_count, nn_count)` whose rows consist
+                of `(1, nn_count)`-shaped cross-covariance vector corresponding
+                to each of the batch elements and its nearest neighbors.
+            batch_nn_targets:
+                A tensor of shape `(batch_count, nn_count, response_count)`
+                whose last dimension lists the vector-valued responses for the
+                nearest neighbors of each batch element.
+            workspace:
+                If provided, `K` is perturbed by the noise model into one of
+                the workspace's buffers rather than into a new tensor. Ignored
+                if `K` is a :class:`~MuyGPyS.gp.factor.KernelFactor`.
+
+        Returns
+        -------
+            mean:
+                A matrix of shape `(batch_count, response_count)` whose rows are
+                the predicted response for each of the given indices.
+            variance:
+                A vector of shape `(batch_count, response_count)` consisting of
+                the diagonal elements of the posterior variance.
+        """
+        return self._posterior_fn(
+            K, Kcross, batch_nn_targets, **_perturb_kwargs(K, workspace)
+        )
 
     def fast_coefficients(
         self,
-        K: mm.ndarray,
+        K: Union[mm.ndarray, KernelFactor],
         train_nn_targets_fast: mm.ndarray,
     ) -> mm.ndarray:
         """
@@ -278,7 +390,10 @@ class MuyGPS:
             K:
                 A tensor of shape `(batch_count, nn_count, nn_count)` containing
                 the `(nn_count, nn_count)`-shaped kernel matrices corresponding
-                to each of the batch elements.
+                to each of the batch elements, or their
+                :class:`~MuyGPyS.gp.factor.KernelFactor`, such as the
+                :class:`~MuyGPyS.gp.factor.CholeskyFactor` returned by
+                :func:`factor`.
             Kcross:
                 A matrix of shape `(batch_count, nn_count)` whose rows consist
                 of `(1, nn_count)`-shaped cross-covariance vector corresponding
@@ -366,6 +481,22 @@ class MuyGPS:
         """
         return self._var_fn.get_opt_fn()
 
+    def get_opt_posterior_fn(self) -> Callable:
+        """
+        Return a combined posterior mean and variance function for use in
+        optimization.
+
+        Assumes that optimization parameter literals will be passed as keyword
+        arguments.
+
+        Returns:
+            A function implementing :func:`posterior`, where `noise` is either
+            fixed or takes updating values during optimization. The function
+            expects keyword arguments corresponding to current hyperparameter
+            values for unfixed parameters.
+        """
+        return self._posterior_fn.get_opt_fn()
+
     def optimize_scale(
         self, pairwise_diffs: mm.ndarray, nn_targets: mm.ndarray
     ):
@@ -413,3 +544,12 @@ class MuyGPS:
             )
         else:
             return False
+
+
+def _perturb_kwargs(
+    K: Union[mm.ndarray, KernelFactor], workspace: Optional[Workspace]
+) -> Dict:
+    # Direct the noise perturbation of `K` into a workspace buffer, if any.
+    if workspace is None or isinstance(K, KernelFactor):
+        return dict()
+    return {"out": workspace.buffer("perturbed_K", K.shape)}
@@ -9,11 +9,12 @@ Noise modeling
 Defines data structures and functors that handle noise priors for MuyGPs models.
 """
 
-from typing import Callable
+from typing import Callable, Optional
 
 import MuyGPyS._src.math as mm
 
 from MuyGPyS._src.gp.noise import _heteroscedastic_perturb
+from MuyGPyS._src.gp.tensors import _expand_kernel_tensor
 from MuyGPyS.gp.hyperparameter import TensorParam
 from MuyGPyS.gp.noise.noise_fn import NoiseFn
 
@@ -45,7 +46,9 @@ class HeteroscedasticNoise(TensorParam, NoiseFn):
             )
         self._perturb_fn = _backend_fn
 
-    def perturb(self, K: mm.ndarray, **kwargs) -> mm.ndarray:
+    def perturb(
+        self, K: mm.ndarray, out: Optional[mm.ndarray] = None, **kwargs
+    ) -> mm.ndarray:
         """
         Perturb a kernel tensor with heteroscedastic noise.
 
@@ -58,14 +61,19 @@ class HeteroscedasticNoise(TensorParam, NoiseFn):
             K:
                 A tensor of shape `(batch_count, nn_count, nn_count)` containing
                 the `(nn_count, nn_count)`-shaped kernel matrices corresponding
-                to each of the batch elements.
+                to each of the batch elements, or their packed upper triangles
+                of shape `(batch_count, nn_count * (nn_count + 1) // 2)`.
+            out:
+                If provided, a tensor shaped like `K` into which to write the
+                perturbed tensor, which is then returned. Honored by the numpy
+                and torch backends. `K` is left unchanged unless `out` is `K`.
 
         Returns:
             A tensor of shape `(batch_count, nn_count, nn_count)` where the
             final two dimensions consist of the perturbed matrices of the input
-            :math:`K`.
+            :math:`K`. Packed if `K` is packed.
         """
-        return self._perturb_fn(K, self._val)
+        return self._perturb_fn(K, self._val, out=out)
 
     def perturb_fn(self, fn: Callable) -> Callable:
         """
@@ -85,11 +93,17 @@ class HeteroscedasticNoise(TensorParam, NoiseFn):
 
         Returns:
             A Callable with the same signature that applies a homoscedastic
-            perturbation to its first argument.
+            perturbation to its first argument, expanding it if it is packed.
+            Also adds an `out` keyword argument that is forwarded to
+            :func:`perturb`.
         """
 
-        def perturbed_fn(K, *args, **kwargs):
-            return fn(self.perturb(K), *args, **kwargs)
+        def perturbed_fn(K, *args, out=None, **kwargs):
+            return fn(
+                _expand_kernel_tensor(self.perturb(K, out=out)),
+                *args,
+                **kwargs,
+            )
 
         return perturbed_fn
 
@@ -14,6 +14,7 @@ from typing import Callable, Optional, Tuple, Union
 import MuyGPyS._src.math as mm
 
 from MuyGPyS._src.gp.noise import _homoscedastic_perturb
+from MuyGPyS._src.gp.tensors import _expand_kernel_tensor
 from MuyGPyS.gp.hyperparameter import ScalarParam
 from MuyGPyS.gp.noise.noise_fn import NoiseFn
 
@@ -56,7 +57,11 @@ class HomoscedasticNoise(ScalarParam, NoiseFn):
         self._perturb_fn = _backend_fn
 
     def perturb(
-        self, K: mm.ndarray, noise: Optional[float] = None, **kwargs
+        self,
+        K: mm.ndarray,
+        noise: Optional[float] = None,
+        out: Optional[mm.ndarray] = None,
+        **kwargs,
     ) -> mm.ndarray:
         """
         Perturb a kernel tensor with homoscedastic noise.
@@ -71,20 +76,25 @@ class HomoscedasticNoise(ScalarParam, NoiseFn):
             K:
                 A tensor of shape `(batch_count, nn_count, nn_count)` containing
                 the `(nn_count, nn_count)`-shaped kernel matrices corresponding
-                to each of the batch elements.
+                to each of the batch elements, or their packed upper triangles
+                of shape `(batch_count, nn_count * (nn_count + 1) // 2)`.
             noise:
                 A floating-point value for the noise variance prior, or `None`.
                 `None` prompts the use of the stored value, whereas supplying
                 alternative values is employed during optimization.
+            out:
+                If provided, a tensor shaped like `K` into which to write the
+                perturbed tensor, which is then returned. Honored by the numpy
+                and torch backends. `K` is left unchanged unless `out` is `K`.
 
         Returns:
             A tensor of shape `(batch_count, nn_count, nn_count)` where the
             final two dimensions consist of the perturbed matrices of the input
-            :math:`K`.
+            :math:`K`. Packed if `K` is packed.
         """
         if noise is None:
             noise = self._val
-        return self._perturb_fn(K, noise)
+        return self._perturb_fn(K, noise, out=out)
 
     def perturb_fn(self, fn: Callable) -> Callable:
         """
@@ -104,11 +114,17 @@ class HomoscedasticNoise(ScalarParam, NoiseFn):
 
         Returns:
             A Callable with the same signature that applies a homoscedastic
-            perturbation to its first argument. Also adds a `noise` keyword
-            argument that is only used for optimization.
+            perturbation to its first argument, expanding it if it is packed.
+            Also adds a `noise` keyword argument that is only used for
+            optimization, and an `out` keyword argument that is forwarded to
+            :func:`perturb`.
         """
 
-        def perturbed_fn(K, *args, noise=None, **kwargs):
-            return fn(self.perturb(K, noise=noise), *args, **kwargs)
+        def perturbed_fn(K, *args, noise=None, out=None, **kwargs):
+            return fn(
+                _expand_kernel_tensor(self.perturb(K, noise=noise, out=out)),
+                *args,
+                **kwargs,
+            )
 
         return perturbed_fn
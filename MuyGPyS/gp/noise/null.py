@@ -12,6 +12,7 @@ Defines data structures and functors that handle noise priors for MuyGPs models.
 from typing import Callable
 
 import MuyGPyS._src.math as mm
+from MuyGPyS._src.gp.tensors import _expand_kernel_tensor
 
 from MuyGPyS.gp.hyperparameter import ScalarParam
 from MuyGPyS.gp.noise.noise_fn import NoiseFn
@@ -47,4 +48,8 @@ class NullNoise(ScalarParam, NoiseFn):
         return K
 
     def perturb_fn(self, fn: Callable) -> Callable:
-        return fn
+        def perturbed_fn(K, *args, out=None, **kwargs):
+            # There is nothing to perturb, so `out` is unused.
+            return fn(_expand_kernel_tensor(K), *args, **kwargs)
+
+        return perturbed_fn
@@ -0,0 +1,59 @@
+# Copyright 2021-2023 Lawrence Livermore National Security, LLC and other
+# MuyGPyS Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+MuyGPs implementation
+"""
+
+from typing import Callable, Tuple
+
+import MuyGPyS._src.math as mm
+from MuyGPyS._src.gp.muygps import (
+    _muygps_posterior,
+    _muygps_whitened_diagonal_variance,
+    _muygps_whitened_posterior_mean,
+)
+from MuyGPyS.gp.factor import KernelFactor
+from MuyGPyS.gp.hyperparameter import ScaleFn
+from MuyGPyS.gp.noise import NoiseFn
+
+
+class Posterior:
+    def __init__(
+        self,
+        noise: NoiseFn,
+        scale: ScaleFn,
+        apply_scale: bool = True,
+        _backend_fn: Callable = _muygps_posterior,
+        _backend_whitened_mean_fn: Callable = _muygps_whitened_posterior_mean,
+        _backend_whitened_var_fn: Callable = _muygps_whitened_diagonal_variance,
+    ):
+        self._fn = _backend_fn
+        self._fn = noise.perturb_fn(self._fn)
+        self._whitened_mean_fn = _backend_whitened_mean_fn
+        self._whitened_var_fn = _backend_whitened_var_fn
+        self._scale_fn = lambda variance: variance
+        if apply_scale is True:
+            self._scale_fn = scale.scale_fn(self._scale_fn)
+
+    def __call__(
+        self,
+        K: mm.ndarray,
+        Kcross: mm.ndarray,
+        batch_nn_targets: mm.ndarray,
+        **kwargs,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        if isinstance(K, KernelFactor):
+            Kcross_whitened = K.whiten(Kcross)
+            mean = self._whitened_mean_fn(
+                Kcross_whitened, K.whiten(batch_nn_targets)
+            )
+            variance = self._whitened_var_fn(Kcross_whitened)
+        else:
+            mean, variance = self._fn(K, Kcross, batch_nn_targets, **kwargs)
+        return mean, self._scale_fn(variance)
+
+    def get_opt_fn(self) -> Callable:
+        return self.__call__
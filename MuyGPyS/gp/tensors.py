@@ -71,23 +71,178 @@ The helper functions :func:`MuyGPyS.gp.tensors.make_predict_tensors`,
 also return the nearest neighbors sets' training targets and (in the latter
 case) the training targets of the training batch. These functions are convenient
 as the difference and target tensors are usually needed together.
+
+Isotropic kernels only depend upon the distances between points, so the
+`(batch_count, nn_count, nn_count, feature_count)` pairwise difference tensor is
+wasteful when `feature_count` is large. Pass `tensor_form="sq_dists"` to
+:func:`MuyGPyS.gp.tensors.make_predict_tensors` or
+:func:`MuyGPyS.gp.tensors.make_train_tensors` to instead obtain squared distance
+tensors of shapes `(batch_count, nn_count)` and
+`(batch_count, nn_count, nn_count)`, and pass the same `tensor_form` to the
+kernel.
+
+Example:
+    >>> from MuyGPyS.gp.tensors import make_train_tensors
+    >>> (
+    ...     crosswise_sq_dists,
+    ...     pairwise_sq_dists,
+    ...     batch_targets,
+    ...     batch_nn_targets,
+    ... ) = make_train_tensors(
+    ...     batch_indices,
+    ...     batch_nn_indices,
+    ...     train_features,
+    ...     train_targets,
+    ...     tensor_form="sq_dists",
+    ... )
+    >>> K = muygps.kernel(pairwise_sq_dists, tensor_form="sq_dists")
+
+The pairwise tensors are symmetric in their nearest neighbor dimensions. Pass
+`packed=True` to these functions to instead obtain only their row-major upper
+triangles (including the diagonal), with shape
+`(batch_count, nn_count * (nn_count + 1) // 2, ...)`. These are formed
+directly from the nearest neighbors' features, so that the dense pairwise
+tensors are never allocated. Kernels evaluate packed tensors as is, producing
+packed kernel tensors that noise models perturb in place and that
+:class:`~MuyGPyS.gp.muygps.MuyGPS` only expands immediately prior to its
+batched solves.
+
+When only the kernel tensors are needed, use
+:func:`MuyGPyS.gp.tensors.make_predict_kernels` to evaluate them directly from
+the neighbor indices. It gathers the features and evaluates the kernel in tiles
+of batch elements, so that the difference tensors are never materialized for the
+whole batch at once.
+
+Example:
+    >>> from MuyGPyS.gp.tensors import make_predict_kernels
+    >>> K, Kcross = make_predict_kernels(
+    ...     muygps.kernel,
+    ...     batch_indices,
+    ...     batch_nn_indices,
+    ...     test_features,
+    ...     train_features,
+    ... )
+
+Serving loops that repeatedly predict batches of the same shape can pass a
+:class:`MuyGPyS.gp.tensors.Workspace` to
+:func:`MuyGPyS.gp.tensors.make_predict_tensors` and
+:func:`MuyGPyS.gp.tensors.make_predict_kernels`, which then write their outputs
+into the workspace's buffers rather than allocating new tensors upon each call.
+The same workspace can be passed to the posterior functions of
+:class:`MuyGPyS.gp.muygps.MuyGPS` to hold the noise-perturbed kernel tensor.
+
+Example:
+    >>> from MuyGPyS.gp.tensors import Workspace
+    >>> workspace = Workspace()
+    >>> for batch_indices, batch_nn_indices in batches:
+    ...     K, Kcross = make_predict_kernels(
+    ...         muygps.kernel,
+    ...         batch_indices,
+    ...         batch_nn_indices,
+    ...         test_features,
+    ...         train_features,
+    ...         workspace=workspace,
+    ...     )
+    ...     mean, variance = muygps.posterior(
+    ...         K, Kcross, batch_nn_targets, workspace=workspace
+    ...     )
 """
 
-from typing import Optional, Tuple
+from typing import Callable, Optional, Tuple
 
 import MuyGPyS._src.math as mm
 from MuyGPyS._src.gp.tensors import (
     _make_fast_predict_tensors,
     _make_predict_tensors,
     _make_train_tensors,
+    _make_predict_sq_dists_tensors,
+    _make_train_sq_dists_tensors,
+    _make_predict_kernels,
     _batch_features_tensor,
     _crosswise_tensor,
     _pairwise_tensor,
+    _crosswise_sq_dists_tensor,
+    _pairwise_sq_dists_tensor,
     _fast_nn_update,
+    _fast_coefficients_tensor,
+    _locality_order,
+    _inverse_order,
     _make_heteroscedastic_tensor,
+    _pack_pairwise_tensor,
+    _unpack_pairwise_tensor,
 )
 
 
+class Workspace:
+    """
+    Reusable output buffers for repeated tensor construction.
+
+    Owns floating point buffers keyed by a name, shape, and dtype. Functions
+    that accept a workspace request their output buffers from it and write into
+    them in place, so that repeated calls with identical shapes reuse the same
+    memory. These are :func:`make_predict_tensors`,
+    :func:`make_predict_kernels`, and the
+    :class:`~MuyGPyS.gp.muygps.MuyGPS` posterior functions, which perturb `K`
+    by the noise model into a buffer. The kernel functors and noise models
+    accept an `out` tensor to the same end.
+
+    The workspace does not cover the batched linear solves of the posterior
+    functions, whose factorizations and solutions are allocated anew by the
+    linear algebra routines upon each call, nor the expansion of a packed `K`
+    prior to solving.
+
+    Tensors returned by a function given a workspace alias the workspace's
+    buffers, and so are overwritten by the next such call of the same shape.
+    Copy any results that must outlive that call. The jax backend does not
+    support in-place updates and ignores the workspace. The mpi backend builds
+    each rank's chunk of the tensors locally, so the batch-shaped buffers of
+    :func:`make_predict_tensors` and :func:`make_predict_kernels` do not match
+    the chunks and are ignored, whereas the posterior functions operate upon
+    each rank's local tensors and use the workspace.
+    """
+
+    def __init__(self):
+        self._buffers = dict()
+
+    def buffer(self, name: str, shape: Tuple[int, ...]) -> mm.ndarray:
+        """
+        Retrieve a buffer, allocating it upon first use.
+
+        Args:
+            name:
+                The name of the buffer, which distinguishes buffers of the
+                same shape.
+            shape:
+                The shape of the buffer.
+
+        Returns:
+            A tensor of the given shape and of dtype `mm.ftype`. Its contents
+            are whatever was last written into it.
+        """
+        key = (name, tuple(shape), mm.ftype)
+        if key not in self._buffers:
+            self._buffers[key] = mm.zeros(shape)
+        return self._buffers[key]
+
+    def clear(self) -> None:
+        """
+        Release all of the buffers.
+        """
+        self._buffers.clear()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        The total size of the buffers in bytes.
+        """
+        return sum(
+            buffer.numel() * buffer.element_size()
+            if hasattr(buffer, "element_size")
+            else buffer.nbytes
+            for buffer in self._buffers.values()
+        )
+
+
 def make_heteroscedastic_tensor(
     measurement_noise: mm.ndarray,
     batch_nn_indices: mm.ndarray,
@@ -199,13 +354,91 @@ def make_fast_predict_tensors(
     )
 
 
+def fast_coefficients_tensor(
+    coeffs_tensor: mm.ndarray,
+    closest_index: mm.ndarray,
+) -> mm.ndarray:
+    """
+    Gather the precomputed coefficients of each batch element's closest
+    neighbor.
+
+    Selects the rows of the coefficients created by
+    :func:`MuyGPyS.gp.muygps.MuyGPS.fast_coefficients` that are required by
+    :func:`MuyGPyS.gp.muygps.MuyGPS.fast_posterior_mean`. In the mpi backend,
+    each rank holds only the coefficients of its chunk of the training data,
+    and requests the rows of its chunk of the batch from the ranks that own
+    them.
+
+    Args:
+        coeffs_tensor:
+            A tensor of shape `(train_count, nn_count, response_count)` listing
+            the precomputed coefficients of each training element.
+        closest_index:
+            A vector of integers of shape `(batch_count,)` listing the index of
+            the nearest training element of each batch element.
+
+    Returns:
+        A tensor of shape `(batch_count, nn_count, response_count)` listing
+        the coefficients of each batch element's nearest training element.
+    """
+    return _fast_coefficients_tensor(coeffs_tensor, closest_index)
+
+
+def locality_order(
+    batch_features: mm.ndarray,
+) -> Tuple[mm.ndarray, mm.ndarray]:
+    """
+    Compute a locality-preserving ordering of a batch.
+
+    Gathering `train_features[batch_nn_indices]` for a randomly ordered batch
+    reads the training data in random order. Ordering the batch along a Z-order
+    (Morton) curve through the features of its elements instead places
+    elements that are close together in feature space, and therefore share
+    most of their nearest neighbors, next to each other. Gathering the training
+    data for a run of consecutive elements then rereads the same rows while
+    they are still in cache. Apply `order` to the batch before gathering, and
+    `inverse` to the predictions to restore the original order.
+
+    Example:
+        >>> order, inverse = locality_order(test_features[batch_indices])
+        >>> posterior_mean = posterior_mean_from_indices(
+        ...     muygps,
+        ...     batch_indices[order],
+        ...     batch_nn_indices[order],
+        ...     test_features,
+        ...     train_features,
+        ...     train_targets,
+        ... )[inverse]
+
+    Args:
+        batch_features:
+            A matrix of floats of shape `(batch_count, feature_count)` listing
+            the features of each element of the batch. At most 62 features are
+            used, and the curve is coarser the more features there are.
+
+    Returns
+    -------
+    order:
+        A permutation vector of shape `(batch_count,)` listing the batch in
+        locality order.
+    inverse:
+        The inverse permutation of `order`.
+    """
+    order = _locality_order(batch_features)
+    return order, _inverse_order(order)
+
+
 def make_predict_tensors(
     batch_indices: mm.ndarray,
     batch_nn_indices: mm.ndarray,
     test_features: Optional[mm.ndarray],
     train_features: mm.ndarray,
     train_targets: mm.ndarray,
-) -> Tuple[mm.ndarray, mm.ndarray, mm.ndarray]:
+    tensor_form: str = "diffs",
+    packed: bool = False,
+    workspace: Optional[Workspace] = None,
+    reorder: bool = False,
+) -> Tuple[mm.ndarray, ...]:
     """
     Create the difference and target tensors for prediction.
 
@@ -229,30 +462,96 @@ def make_predict_tensors(
         train_targets:
             A matrix of shape `(train_count, feature_count)` whose rows are
             vector-valued responses for each training element.
+        tensor_form:
+            Either `"diffs"` or `"sq_dists"`. If `"sq_dists"`, return squared
+            distance tensors in place of difference tensors. These are only
+            usable by isotropic kernels.
+        packed:
+            If `True`, return only the packed upper triangles of the pairwise
+            tensor.
+        workspace:
+            If provided, write the outputs into the workspace's buffers rather
+            than allocating them.
+        reorder:
+            If `True`, gather the tensors in the order given by
+            :func:`~MuyGPyS.gp.tensors.locality_order` of the batch's test
+            features, which improves the locality of the gathers when
+            `train_features` is large. The tensors are returned in that order,
+            together with `order` and `inverse`. Apply `inverse` to the
+            predictions made from them to restore the original batch order.
+            Not supported by the mpi backend.
 
     Returns
     -------
     crosswise_diffs:
         A tensor of shape `(batch_count, nn_count, feature_count)` whose last
         two dimensions list the difference between each feature of each batch
-        element element and its nearest neighbors.
+        element element and its nearest neighbors. A matrix of shape
+        `(batch_count, nn_count)` of squared distances if
+        `tensor_form="sq_dists"`.
     pairwise_diffs:
         A tensor of shape `(batch_count, nn_count, nn_count, feature_count)`
         containing the `(nn_count, nn_count, feature_count)`-shaped pairwise
         nearest neighbor difference tensors corresponding to each of the
-        batch elements.
+        batch elements. A tensor of shape `(batch_count, nn_count, nn_count)`
+        of squared distances if `tensor_form="sq_dists"`. Packed along its
+        second and third dimensions if `packed=True`.
     batch_nn_targets:
         Tensor of floats of shape `(batch_count, nn_count, response_count)`
         containing the expected response for each nearest neighbor of each batch
         element.
+    order:
+        The permutation vector of shape `(batch_count,)` that puts the batch in
+        locality order. Only returned if `reorder=True`.
+    inverse:
+        The inverse permutation of `order`. Only returned if `reorder=True`.
     """
-    return _make_predict_tensors(
+    if tensor_form == "diffs":
+        make_fn = _make_predict_tensors
+    elif tensor_form == "sq_dists":
+        make_fn = _make_predict_sq_dists_tensors
+    else:
+        raise ValueError(f"Unsupported tensor form {tensor_form}")
+    if reorder is True:
+        batch_features = (
+            train_features if test_features is None else test_features
+        )[batch_indices]
+        order, inverse = locality_order(batch_features)
+        batch_indices = batch_indices[order]
+        batch_nn_indices = batch_nn_indices[order]
+    out = None
+    if workspace is not None:
+        batch_count, nn_count = batch_nn_indices.shape
+        _, feature_count = train_features.shape
+        _, response_count = train_targets.shape
+        if packed is True:
+            pairwise_shape = (batch_count, nn_count * (nn_count + 1) // 2)
+        else:
+            pairwise_shape = (batch_count, nn_count, nn_count)
+        if tensor_form == "diffs":
+            crosswise_shape = (batch_count, nn_count, feature_count)
+            pairwise_shape += (feature_count,)
+        else:
+            crosswise_shape = (batch_count, nn_count)
+        out = (
+            workspace.buffer("crosswise", crosswise_shape),
+            workspace.buffer("pairwise", pairwise_shape),
+            workspace.buffer(
+                "batch_nn_targets", (batch_count, nn_count, response_count)
+            ),
+        )
+    crosswise_diffs, pairwise_diffs, batch_nn_targets = make_fn(
         batch_indices,
         batch_nn_indices,
         test_features,
         train_features,
         train_targets,
+        out=out,
+        packed=packed,
     )
+    if reorder is True:
+        return crosswise_diffs, pairwise_diffs, batch_nn_targets, order, inverse
+    return crosswise_diffs, pairwise_diffs, batch_nn_targets
 
 
 def make_train_tensors(
@@ -260,7 +559,10 @@ def make_train_tensors(
     batch_nn_indices: mm.ndarray,
     train_features: mm.ndarray,
     train_targets: mm.ndarray,
-) -> Tuple[mm.ndarray, mm.ndarray, mm.ndarray, mm.ndarray]:
+    tensor_form: str = "diffs",
+    packed: bool = False,
+    reorder: bool = False,
+) -> Tuple[mm.ndarray, ...]:
     """
     Create the difference and target tensors needed for training.
 
@@ -281,18 +583,36 @@ def make_train_tensors(
         train_targets:
             A matrix of shape `(train_count, feature_count)` whose rows are
             vector-valued responses for each training element.
+        tensor_form:
+            Either `"diffs"` or `"sq_dists"`. If `"sq_dists"`, return squared
+            distance tensors in place of difference tensors. These are only
+            usable by isotropic kernels.
+        packed:
+            If `True`, return only the packed upper triangles of the pairwise
+            tensor.
+        reorder:
+            If `True`, gather the tensors in the order given by
+            :func:`~MuyGPyS.gp.tensors.locality_order` of the batch's features
+            and return them in that order, together with `order` and
+            `inverse`. Leave-one-out objectives sum over the batch, so the
+            reordered tensors can be optimized upon directly. Not supported by
+            the mpi backend.
 
     Returns
     -------
     crosswise_diffs:
         A tensor of shape `(batch_count, nn_count, feature_count)` whose last
         two dimensions list the difference between each feature of each batch
-        element element and its nearest neighbors.
+        element element and its nearest neighbors. A matrix of shape
+        `(batch_count, nn_count)` of squared distances if
+        `tensor_form="sq_dists"`.
     pairwise_diffs:
         A tensor of shape `(batch_count, nn_count, nn_count, feature_count)`
         containing the `(nn_count, nn_count, feature_count)`-shaped pairwise
         nearest neighbor difference tensors corresponding to each of the batch
-        elements.
+        elements. A tensor of shape `(batch_count, nn_count, nn_count)` of
+        squared distances if `tensor_form="sq_dists"`. Packed along its second
+        and third dimensions if `packed=True`.
     batch_targets:
         Matrix of floats of shape `(batch_count, response_count)` whose rows
         give the expected response for each batch element.
@@ -300,9 +620,129 @@ def make_train_tensors(
         Tensor of floats of shape `(batch_count, nn_count, response_count)`
         containing the expected response for each nearest neighbor of each batch
         element.
+    order:
+        The permutation vector of shape `(batch_count,)` that puts the batch in
+        locality order. Only returned if `reorder=True`.
+    inverse:
+        The inverse permutation of `order`. Only returned if `reorder=True`.
     """
-    return _make_train_tensors(
-        batch_indices, batch_nn_indices, train_features, train_targets
+    if tensor_form == "diffs":
+        make_fn = _make_train_tensors
+    elif tensor_form == "sq_dists":
+        make_fn = _make_train_sq_dists_tensors
+    else:
+        raise ValueError(f"Unsupported tensor form {tensor_form}")
+    if reorder is True:
+        order, inverse = locality_order(train_features[batch_indices])
+        batch_indices = batch_indices[order]
+        batch_nn_indices = batch_nn_indices[order]
+    crosswise_diffs, pairwise_diffs, batch_targets, batch_nn_targets = make_fn(
+        batch_indices,
+        batch_nn_indices,
+        train_features,
+        train_targets,
+        packed=packed,
+    )
+    if reorder is True:
+        return (
+            crosswise_diffs,
+            pairwise_diffs,
+            batch_targets,
+            batch_nn_targets,
+            order,
+            inverse,
+        )
+    return crosswise_diffs, pairwise_diffs, batch_targets, batch_nn_targets
+
+
+# Approximate byte budget of the intermediate tensors of each kernel tile, chosen
+# to fit within a typical L2 cache.
+_KERNEL_TILE_BYTES = 2**20
+
+
+def make_predict_kernels(
+    kernel: Callable,
+    batch_indices: mm.ndarray,
+    batch_nn_indices: mm.ndarray,
+    test_features: Optional[mm.ndarray],
+    train_features: mm.ndarray,
+    tile_count: Optional[int] = None,
+    workspace: Optional[Workspace] = None,
+) -> Tuple[mm.ndarray, mm.ndarray]:
+    """
+    Evaluate the kernel tensors for prediction directly from neighbor indices.
+
+    Equivalent to evaluating `kernel` upon the tensors returned by
+    :func:`~MuyGPyS.gp.tensors.make_predict_tensors`, but gathers the features,
+    forms the differences (or squared distances, if the kernel's deformation
+    supports them) and evaluates the kernel `tile_count` batch elements at a
+    time. Peak intermediate memory therefore depends upon `tile_count` rather
+    than `batch_count`.
+
+    Args:
+        kernel:
+            The kernel functor, e.g. `muygps.kernel`.
+        batch_indices:
+            A vector of integers of shape `(batch_count,)` identifying the
+            batch of observations to be approximated.
+        batch_nn_indices:
+            A matrix of integers of shape `(batch_count, nn_count)` listing the
+            nearest neighbor indices for all observations in the batch.
+        test_features:
+            The full floating point testing data matrix of shape
+            `(test_count, feature_count)`. If `None`, the batch is drawn from
+            `train_features`.
+        train_features:
+            The full floating point training data matrix of shape
+            `(train_count, feature_count)`.
+        tile_count:
+            The number of batch elements to evaluate at a time. If `None`, it
+            is chosen so that each tile's intermediate tensors fit within a
+            cache-sized budget.
+        workspace:
+            If provided, write the kernel tensors into the workspace's buffers
+            rather than allocating them.
+
+    Returns
+    -------
+    K:
+        A tensor of shape `(batch_count, nn_count, nn_count)` containing the
+        kernel matrices of each batch element's nearest neighbors.
+    Kcross:
+        A matrix of shape `(batch_count, nn_count)` containing the
+        cross-covariances between each batch element and its nearest
+        neighbors.
+    """
+    if kernel.deformation.supports("sq_dists"):
+        tensor_form = "sq_dists"
+    else:
+        tensor_form = "diffs"
+    batch_count, nn_count = batch_nn_indices.shape
+    if tile_count is None:
+        _, feature_count = train_features.shape
+        if tensor_form == "sq_dists":
+            elements = nn_count * feature_count + 2 * nn_count**2
+        else:
+            elements = (
+                nn_count**2 + nn_count
+            ) * feature_count + nn_count**2
+        itemsize = mm.zeros(1).dtype.itemsize
+        tile_count = max(1, _KERNEL_TILE_BYTES // (elements * itemsize))
+    out = None
+    if workspace is not None:
+        out = (
+            workspace.buffer("K", (batch_count, nn_count, nn_count)),
+            workspace.buffer("Kcross", (batch_count, nn_count)),
+        )
+    return _make_predict_kernels(
+        kernel,
+        batch_indices,
+        batch_nn_indices,
+        test_features,
+        train_features,
+        tensor_form,
+        tile_count,
+        out=out,
     )
 
 
@@ -395,3 +835,105 @@ def pairwise_tensor(
         batch elements.
     """
     return _pairwise_tensor(data, nn_indices)
+
+
+def crosswise_sq_dists_tensor(
+    data: mm.ndarray,
+    nn_data: mm.ndarray,
+    data_indices: mm.ndarray,
+    nn_indices: mm.ndarray,
+) -> mm.ndarray:
+    """
+    Compute a matrix of squared distances between data and their neighbors.
+
+    The squared distance analogue of
+    :func:`~MuyGPyS.gp.tensors.crosswise_tensor`.
+
+    Args:
+        data:
+            The data matrix of shape `(data_count, feature_count)` containing
+            batch elements.
+        nn_data:
+            The data matrix of shape `(candidate_count, feature_count)`
+            containing the universe of candidate neighbors for the batch
+            elements. Might be the same as `data`.
+        indices:
+            An integral vector of shape `(batch_count,)` containing the indices
+            of the batch.
+        nn_indices:
+            An integral matrix of shape (batch_count, nn_count) listing the
+            nearest neighbor indices for the batch of data points.
+
+    Returns:
+        A matrix of shape `(batch_count, nn_count)` listing the squared
+        Euclidean distance between each batch element and its nearest
+        neighbors.
+    """
+    return _crosswise_sq_dists_tensor(data, nn_data, data_indices, nn_indices)
+
+
+def pairwise_sq_dists_tensor(
+    data: mm.ndarray,
+    nn_indices: mm.ndarray,
+) -> mm.ndarray:
+    """
+    Compute a tensor of pairwise squared distances among nearest neighbors.
+
+    The squared distance analogue of
+    :func:`~MuyGPyS.gp.tensors.pairwise_tensor`. Uses the Gram matrix identity
+    :math:`\\|x - y\\|^2 = \\|x\\|^2 + \\|y\\|^2 - 2 x^\\top y` upon
+    each centered nearest neighbor set, and so never forms the pairwise
+    difference tensor.
+
+    Args:
+        data:
+            The data matrix of shape `(batch_count, feature_count)` containing
+            batch elements.
+        nn_indices:
+            An integral matrix of shape (batch_count, nn_count) listing the
+            nearest neighbor indices for the batch of data points.
+
+    Returns:
+        A tensor of shape `(batch_count, nn_count, nn_count)` whose last two
+        dimensions are the squared Euclidean distance matrices of each nearest
+        neighbor set.
+    """
+    return _pairwise_sq_dists_tensor(data, nn_indices)
+
+
+def pack_pairwise_tensor(tensor: mm.ndarray) -> mm.ndarray:
+    """
+    Pack a pairwise tensor into its upper triangles.
+
+    Keeps the row-major upper triangle, including the diagonal, of each
+    `(nn_count, nn_count)` block, which roughly halves the memory footprint of
+    the tensor and the cost of evaluating a kernel upon it. The discarded lower
+    triangles of difference tensors are the negated upper triangles, to which
+    kernels are indifferent.
+
+    Args:
+        tensor:
+            A tensor of shape `(batch_count, nn_count, nn_count, ...)`, such as
+            a pairwise difference, squared distance or kernel tensor.
+
+    Returns:
+        A tensor of shape `(batch_count, nn_count * (nn_count + 1) // 2, ...)`.
+    """
+    return _pack_pairwise_tensor(tensor)
+
+
+def unpack_pairwise_tensor(packed: mm.ndarray) -> mm.ndarray:
+    """
+    Expand a packed symmetric kernel tensor.
+
+    The inverse of :func:`~MuyGPyS.gp.tensors.pack_pairwise_tensor` for
+    symmetric tensors without trailing dimensions, such as kernel tensors.
+
+    Args:
+        packed:
+            A tensor of shape `(batch_count, nn_count * (nn_count + 1) // 2)`.
+
+    Returns:
+        A tensor of shape `(batch_count, nn_count, nn_count)`.
+    """
+    return _unpack_pairwise_tensor(packed)
@@ -10,7 +10,11 @@ MuyGPs implementation
 from typing import Callable
 
 import MuyGPyS._src.math as mm
-from MuyGPyS._src.gp.muygps import _muygps_diagonal_variance
+from MuyGPyS._src.gp.muygps import (
+    _muygps_diagonal_variance,
+    _muygps_whitened_diagonal_variance,
+)
+from MuyGPyS.gp.factor import KernelFactor
 from MuyGPyS.gp.hyperparameter import ScaleFn
 from MuyGPyS.gp.noise import NoiseFn
 
@@ -22,11 +26,14 @@ class PosteriorVariance:
         scale: ScaleFn,
         apply_scale: bool = True,
         _backend_fn: Callable = _muygps_diagonal_variance,
+        _backend_whitened_fn: Callable = _muygps_whitened_diagonal_variance,
     ):
         self._fn = _backend_fn
         self._fn = noise.perturb_fn(self._fn)
+        self._whitened_fn = _backend_whitened_fn
         if apply_scale is True:
             self._fn = scale.scale_fn(self._fn)
+            self._whitened_fn = scale.scale_fn(self._whitened_fn)
 
     def __call__(
         self,
@@ -34,7 +41,9 @@ class PosteriorVariance:
         Kcross: mm.ndarray,
         **kwargs,
     ) -> mm.ndarray:
+        if isinstance(K, KernelFactor):
+            return self._whitened_fn(K.whiten(Kcross), **kwargs)
         return self._fn(K, Kcross, **kwargs)
 
     def get_opt_fn(self) -> Callable:
-        return self._fn
+        return self.__call__
@@ -13,21 +13,383 @@ neighbors, and a method string specifying which algorithm to use, as well as any
 additional kwargs used by the methods.
 Currently supported implementations include exact KNN using
 `sklearn <https://scikit-learn.org/stable/modules/generated/sklearn.neighbors.NearestNeighbors.html>`_
-("exact") and approximate KNN using `hnsw <https://github.com/nmslib/hnswlib>`_
-("hnsw").
+("exact"), exact brute force KNN using tiled matrix products ("brute_blas"),
+and approximate KNN using `hnsw <https://github.com/nmslib/hnswlib>`_ ("hnsw").
+
+Queries can be sharded across a pool of worker processes with
+:func:`~MuyGPyS.neighbors.NN_Wrapper.start_workers`. The training data and the
+arrays of the built index are placed in shared memory, so that the workers do
+not each hold a copy of them.
+
+Under the MPI backend, `NN_Wrapper(..., distributed=True)` builds one index per
+rank over that rank's partition of the training data and merges the local
+candidates of every query across ranks, so that each rank only holds its share
+of the training features.
+
+A constructed `NN_Wrapper` can be written to disk with
+:func:`~MuyGPyS.neighbors.NN_Wrapper.save` and restored with
+:func:`~MuyGPyS.neighbors.NN_Wrapper.load`, which avoids rebuilding the lookup
+index in every process that needs it.
+
+Example:
+    >>> from MuyGPyS.neighbors import NN_Wrapper
+    >>> nbrs_lookup = NN_Wrapper(train_features, nn_count, nn_method="exact")
+    >>> nbrs_lookup.save("nbrs_lookup")
+    >>> # Later, possibly in a different process
+    >>> nbrs_lookup = NN_Wrapper.load("nbrs_lookup")
 """
 
+import json
+import multiprocessing
+import os
+import warnings
+import weakref
+
+from joblib import dump as _joblib_dump, load as _joblib_load
+from multiprocessing.shared_memory import SharedMemory
 from sklearn.neighbors import NearestNeighbors
-from typing import Tuple
+from typing import Dict, Generator, List, Optional, Tuple
 
 
 import MuyGPyS._src.math as mm
 import MuyGPyS._src.math.numpy as np
 from MuyGPyS import config
+from MuyGPyS._src.mpi_utils import (
+    _allreduce_nearest,
+    _allreduce_sum_tensor,
+    _is_mpi_mode,
+)
 
 if config.state.hnswlib_enabled is True:
     import hnswlib
 
+# Increment whenever the on-disk layout written by `NN_Wrapper.save` changes.
+_NN_FORMAT_VERSION = 1
+_NN_METADATA_FILE = "metadata.json"
+_NN_TRAIN_FILE = "train.npy"
+_NN_EXACT_INDEX_FILE = "exact_index.joblib"
+_NN_HNSW_INDEX_FILE = "hnsw_index.bin"
+_NN_GRAPH_INDICES_FILE = "train_graph_indices.npy"
+_NN_GRAPH_DISTS_FILE = "train_graph_dists.npy"
+
+# Default number of query rows per block in `NN_Wrapper.get_nns_chunked`.
+_NN_DEFAULT_CHUNK_SIZE = 65536
+
+# Fraction of the indexed training set that the unindexed delta buffer of
+# `nn_method="exact"` may grow to before the tree is rebuilt.
+_NN_DELTA_REBUILD_FRACTION = 0.1
+
+# Growth factor applied to the capacity of the hnsw index when it is resized.
+_NN_HNSW_GROWTH_FACTOR = 1.5
+
+# Default number of training points queried by `NN_Wrapper.calibrate_ef`.
+_NN_HNSW_CALIBRATION_COUNT = 1000
+
+# The lookup datastructure that answers queries within a worker process. Set by
+# `_init_nn_worker`.
+_NN_WORKER_LOOKUP = None
+
+
+class _BruteBLASIndex:
+    """
+    Exact squared Euclidean nearest neighbors by way of tiled matrix products.
+
+    Computes each `(query_tile_size, train_tile_size)` tile of squared
+    distances using the expansion
+    :math:`\\|x - y\\|^2 = \\|x\\|^2 - 2 x \\cdot y + \\|y\\|^2`, so that
+    nearly all of the work happens in a (multithreaded) BLAS matrix product.
+    The running `k` nearest candidates of each query row are merged with those
+    entries of each tile that beat the current `k`-th best distance using
+    `argpartition`, which bounds the working memory by the tile sizes rather
+    than by the training set size.
+
+    Queries may optionally supply per-feature `weights`, in which case the
+    search uses the weighted metric :math:`\\sum_i w_i (x_i - y_i)^2`. Only
+    the query side of each product is reweighted, so the training data is
+    never copied; the weighted training norms of the most recent `weights` are
+    cached.
+
+    Args:
+        train:
+            The training data of shape `(train_count, feature_count)`.
+        query_tile_size:
+            The number of query rows processed at a time.
+        train_tile_size:
+            The number of training rows processed at a time.
+    """
+
+    def __init__(
+        self,
+        train: mm.ndarray,
+        query_tile_size: int = 1024,
+        train_tile_size: int = 8192,
+    ):
+        self.train = np.asarray(train)
+        self.query_tile_size = query_tile_size
+        self.train_tile_size = train_tile_size
+        self.train_sq_norms = np.einsum("ij,ij->i", self.train, self.train)
+        self._weights = None
+        self._weighted_sq_norms = None
+
+    def add(self, train: mm.ndarray) -> None:
+        train = np.asarray(train)
+        self.train = np.concatenate((self.train, train))
+        self.train_sq_norms = np.concatenate(
+            (self.train_sq_norms, np.einsum("ij,ij->i", train, train))
+        )
+        self._weights = None
+        self._weighted_sq_norms = None
+
+    def _train_norms(self, weights: Optional[mm.ndarray]) -> mm.ndarray:
+        if weights is None:
+            return self.train_sq_norms
+        if self._weights is None or not np.array_equal(self._weights, weights):
+            self._weighted_sq_norms = np.einsum(
+                "ij,ij,j->i", self.train, self.train, weights
+            )
+            self._weights = weights.copy()
+        return self._weighted_sq_norms
+
+    def kneighbors(
+        self,
+        samples: mm.ndarray,
+        n_neighbors: int,
+        weights: Optional[mm.ndarray] = None,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        samples = np.asarray(samples)
+        sample_count, _ = samples.shape
+        train_count, _ = self.train.shape
+        if n_neighbors > train_count:
+            raise ValueError(
+                f"Cannot query {n_neighbors} neighbors from only {train_count} "
+                "training points"
+            )
+        train_sq_norms = self._train_norms(weights)
+        nn_dists = np.zeros((sample_count, n_neighbors), dtype=samples.dtype)
+        nn_indices = np.zeros((sample_count, n_neighbors), dtype=np.itype)
+        for q_start in range(0, sample_count, self.query_tile_size):
+            q_end = min(q_start + self.query_tile_size, sample_count)
+            dists, indices = self._query_tile(
+                samples[q_start:q_end], n_neighbors, train_sq_norms, weights
+            )
+            nn_dists[q_start:q_end] = dists
+            nn_indices[q_start:q_end] = indices
+        return nn_dists, nn_indices
+
+    def _query_tile(
+        self,
+        queries: mm.ndarray,
+        n_neighbors: int,
+        train_sq_norms: mm.ndarray,
+        weights: Optional[mm.ndarray] = None,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        query_count, _ = queries.shape
+        train_count, _ = self.train.shape
+        rows = np.arange(query_count)[:, None]
+        if weights is None:
+            weighted_queries = queries
+        else:
+            weighted_queries = queries * weights
+        query_sq_norms = np.einsum("ij,ij->i", weighted_queries, queries)
+        query_sq_norms = query_sq_norms[:, None]
+        scaled_queries = -2.0 * weighted_queries
+        best_dists = np.full(
+            (query_count, n_neighbors), np.inf, dtype=queries.dtype
+        )
+        best_indices = np.zeros((query_count, n_neighbors), dtype=np.itype)
+        thresholds = np.full((query_count, 1), np.inf, dtype=queries.dtype)
+        for t_start in range(0, train_count, self.train_tile_size):
+            t_end = min(t_start + self.train_tile_size, train_count)
+            # The query norms are constant along each row, so we leave them out
+            # of the tile and shift the thresholds instead.
+            dists = scaled_queries @ self.train[t_start:t_end].T
+            dists += train_sq_norms[None, t_start:t_end]
+
+            # Only entries closer than the current k-th best neighbor of their
+            # row can change the result. Comparing is much cheaper than
+            # partitioning the whole tile, so we gather those candidates into a
+            # ragged-to-padded matrix and only partition that.
+            cand_rows, cand_cols = np.nonzero(
+                dists < thresholds - query_sq_norms
+            )
+            if cand_rows.shape[0] == 0:
+                continue
+            counts = np.bincount(cand_rows, minlength=query_count)
+            offsets = np.cumsum(counts) - counts
+            positions = np.arange(cand_rows.shape[0]) - offsets[cand_rows]
+            width = np.max(counts)
+            cand_dists = np.full(
+                (query_count, width), np.inf, dtype=queries.dtype
+            )
+            cand_indices = np.zeros((query_count, width), dtype=np.itype)
+            cand_dists[cand_rows, positions] = (
+                dists[cand_rows, cand_cols] + query_sq_norms[cand_rows, 0]
+            )
+            cand_indices[cand_rows, positions] = cand_cols + t_start
+
+            merged_dists = np.concatenate((best_dists, cand_dists), axis=1)
+            merged_indices = np.concatenate(
+                (best_indices, cand_indices), axis=1
+            )
+            part = np.argpartition(merged_dists, n_neighbors - 1, axis=1)
+            part = part[:, :n_neighbors]
+            best_dists = merged_dists[rows, part]
+            best_indices = merged_indices[rows, part]
+            thresholds = np.max(best_dists, axis=1)[:, None]
+        order = np.argsort(best_dists, axis=1)
+        best_dists = best_dists[rows, order]
+        best_indices = best_indices[rows, order]
+        # Cancellation in the expansion can produce slightly negative values.
+        np.maximum(best_dists, 0.0, out=best_dists)
+        return best_dists, best_indices
+
+
+def _create_shared(shape: Tuple, dtype) -> Tuple[SharedMemory, Tuple]:
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape)) * dtype.itemsize
+    # Zero-byte blocks are not permitted.
+    block = SharedMemory(create=True, size=max(nbytes, 1))
+    return block, (block.name, tuple(shape), dtype)
+
+
+def _share_array(array: mm.ndarray) -> Tuple[SharedMemory, Tuple]:
+    array = np.ascontiguousarray(array)
+    block, spec = _create_shared(array.shape, array.dtype)
+    _, shape, dtype = spec
+    np.ndarray(shape, dtype=dtype, buffer=block.buf)[...] = array
+    return block, spec
+
+
+def _attach_shared(spec: Tuple) -> Tuple[SharedMemory, mm.ndarray]:
+    name, shape, dtype = spec
+    block = SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _release_shared(blocks: List[SharedMemory], unlink: bool) -> None:
+    for block in blocks:
+        block.close()
+        if unlink is True:
+            block.unlink()
+
+
+def _init_nn_worker(state: Dict, specs: Dict) -> None:
+    global _NN_WORKER_LOOKUP
+    arrays = dict()
+    blocks = list()
+    for key, spec in specs.items():
+        block, arrays[key] = _attach_shared(spec)
+        blocks.append(block)
+    _NN_WORKER_LOOKUP = NN_Wrapper._from_worker_state(state, arrays)
+    # The blocks must remain open for as long as the lookup refers to them.
+    _NN_WORKER_LOOKUP._worker_blocks = blocks
+
+
+def _nn_worker_query(
+    samples_spec: Tuple,
+    indices_spec: Tuple,
+    dists_spec: Tuple,
+    start: int,
+    end: int,
+    nn_count: int,
+) -> None:
+    samples_block, samples = _attach_shared(samples_spec)
+    indices_block, indices = _attach_shared(indices_spec)
+    dists_block, dists = _attach_shared(dists_spec)
+    try:
+        nn_indices, nn_dists = _NN_WORKER_LOOKUP._get_nns(
+            samples[start:end], nn_count
+        )
+        indices[start:end] = np.asarray(nn_indices)
+        dists[start:end] = np.asarray(nn_dists)
+    finally:
+        # Views into a block must be released before the block is closed.
+        del samples, indices, dists
+        _release_shared([samples_block, indices_block, dists_block], False)
+
+
+def _close_nn_worker_pool(pool, blocks: List[SharedMemory]) -> None:
+    pool.terminate()
+    pool.join()
+    _release_shared(blocks, True)
+
+
+class _NNWorkerPool:
+    """
+    A pool of worker processes that answer neighbor queries from shared memory.
+
+    Copies the training data and the arrays of the built index into shared
+    memory blocks once, and starts `n_workers` processes that each attach to
+    those blocks and reassemble a read-only copy of the lookup datastructure
+    around them. Each query is itself copied into shared memory and split into
+    contiguous blocks of rows, one per worker, which write their results
+    directly into shared output buffers.
+
+    Args:
+        lookup:
+            The lookup datastructure to serve.
+        n_workers:
+            The number of worker processes.
+        start_method:
+            The `multiprocessing` start method of the workers.
+    """
+
+    def __init__(self, lookup: "NN_Wrapper", n_workers: int, start_method: str):
+        self.n_workers = n_workers
+        self.start_method = start_method
+        state, arrays = lookup._worker_state()
+        blocks = list()
+        specs = dict()
+        for key, array in arrays.items():
+            block, specs[key] = _share_array(array)
+            blocks.append(block)
+        pool = multiprocessing.get_context(start_method).Pool(
+            n_workers, initializer=_init_nn_worker, initargs=(state, specs)
+        )
+        self._finalizer = weakref.finalize(
+            self, _close_nn_worker_pool, pool, blocks
+        )
+        self._pool = pool
+
+    def kneighbors(
+        self, samples: mm.ndarray, nn_count: int
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        samples = np.asarray(samples)
+        sample_count = samples.shape[0]
+        shape = (sample_count, nn_count)
+        samples_block, samples_spec = _share_array(samples)
+        indices_block, indices_spec = _create_shared(shape, np.itype)
+        dists_block, dists_spec = _create_shared(shape, np.ftype)
+        blocks = [samples_block, indices_block, dists_block]
+        try:
+            shard_size = -(-sample_count // self.n_workers)
+            self._pool.starmap(
+                _nn_worker_query,
+                [
+                    (
+                        samples_spec,
+                        indices_spec,
+                        dists_spec,
+                        start,
+                        min(start + shard_size, sample_count),
+                        nn_count,
+                    )
+                    for start in range(0, sample_count, shard_size)
+                ],
+            )
+            nn_indices = np.ndarray(
+                shape, dtype=np.itype, buffer=indices_block.buf
+            ).copy()
+            nn_dists = np.ndarray(
+                shape, dtype=np.ftype, buffer=dists_block.buf
+            ).copy()
+        finally:
+            _release_shared(blocks, True)
+        return nn_indices, nn_dists
+
+    def close(self) -> None:
+        self._finalizer()
+
 
 class NN_Wrapper:
     """
@@ -60,14 +422,33 @@ class NN_Wrapper:
         nn_method:
             Indicates which nearest neighbor algorithm should be used.
             Currently "exact" indicates `sklearn.neighbors.NearestNeighbors`,
-            while "hnsw" indicates `hnswlib.Index` (requires installing MuyGPyS
-            with the "hnswlib" extras flag).
+            "brute_blas" indicates exact brute force search over tiled matrix
+            products, and "hnsw" indicates `hnswlib.Index` (requires installing
+            MuyGPyS with the "hnswlib" extras flag).
+        train_graph:
+            If `True`, :func:`~MuyGPyS.neighbors.NN_Wrapper.get_batch_nns`
+            lazily computes the nearest neighbors of every training point upon
+            its first invocation and answers all subsequent calls by indexing
+            into this cached graph rather than by querying the index.
+        distributed:
+            If `True` (requires the MPI backend), `train` is interpreted as
+            this rank's nonempty partition of the global training data, which
+            consists of the partitions of all ranks concatenated in rank order.
+            Each rank indexes only its own partition. Queries are collective:
+            every rank must issue the same queries, and every rank receives the
+            global nearest neighbors, whose indices refer to the global
+            training data. Incompatible with `train_graph=True`.
         kwargs:
             Additional kwargs used for lookup data structure construction.
             `nn_method="exact"` supports "radius", "algorithm", "leaf_size",
             "metric", "p", "metric_params", and "n_jobs" kwargs.
+            `nn_method="brute_blas"` supports "query_tile_size" and
+            "train_tile_size" kwargs, and always uses the Euclidean metric.
             `nn_method="hnsw"` supports "space", "ef_construction", "M", and
-            "random_seed" kwargs.
+            "random_seed" kwargs, as well as the query-time "ef" kwarg and the
+            "target_recall" and "calibration_count" kwargs, which select "ef"
+            via :func:`~MuyGPyS.neighbors.NN_Wrapper.calibrate_ef` if "ef" is
+            not specified.
     """
 
     def __init__(
@@ -75,6 +456,8 @@ class NN_Wrapper:
         train: mm.ndarray,
         nn_count: int,
         nn_method: str = "exact",
+        train_graph: bool = False,
+        distributed: bool = False,
         **kwargs,
     ):
         """
@@ -84,6 +467,29 @@ class NN_Wrapper:
         self.train_count, self.feature_count = self.train.shape
         self.nn_count = nn_count
         self.nn_method = nn_method.lower()
+        self.train_graph = train_graph
+        self._train_graph_indices = None
+        self._train_graph_dists = None
+        self._indexed_count = self.train_count
+        self._delta_nbrs = None
+        self._scaled_nbrs = None
+        self._workers = None
+        self.ef = None
+        self.distributed = distributed
+        if self.distributed is True:
+            if _is_mpi_mode() is False:
+                raise ValueError(
+                    "Distributed lookups require the mpi backend, not "
+                    f"{config.state.backend}"
+                )
+            if self.train_graph is True:
+                raise ValueError(
+                    "Distributed lookups do not support train_graph=True"
+                )
+            world = config.mpi_state.comm_world
+            counts = world.allgather(self.train_count)
+            self._global_offset = sum(counts[: world.Get_rank()])
+            self._global_count = sum(counts)
         if self.nn_method == "exact":
             exact_kwargs = {
                 k: kwargs[k]
@@ -103,6 +509,13 @@ class NN_Wrapper:
             exact_kwargs["n_neighbors"] = nn_count + 1
             exact_kwargs["n_jobs"] = exact_kwargs.get("n_jobs", -1)
             self.nbrs = NearestNeighbors(**exact_kwargs).fit(self.train)
+        elif self.nn_method == "brute_blas":
+            brute_kwargs = {
+                k: kwargs[k]
+                for k in kwargs
+                if k in {"query_tile_size", "train_tile_size"}
+            }
+            self.nbrs = _BruteBLASIndex(self.train, **brute_kwargs)
         elif self.nn_method == "hnsw":
             if config.state.hnswlib_enabled is True:
                 self.nbrs = hnswlib.Index(
@@ -116,6 +529,14 @@ class NN_Wrapper:
                 hnsw_kwargs["max_elements"] = self.train_count
                 self.nbrs.init_index(**hnsw_kwargs)
                 self.nbrs.add_items(self.train)
+                if "ef" in kwargs:
+                    self.ef = kwargs["ef"]
+                    self.nbrs.set_ef(self.ef)
+                elif "target_recall" in kwargs:
+                    self.calibrate_ef(
+                        kwargs["target_recall"],
+                        calibration_count=kwargs.get("calibration_count"),
+                    )
             else:
                 raise ModuleNotFoundError("Module hnswlib is not installed!")
         else:
@@ -124,9 +545,389 @@ class NN_Wrapper:
                 f"implemented."
             )
 
+    def calibrate_ef(
+        self,
+        target_recall: float,
+        calibration_count: Optional[int] = None,
+    ) -> int:
+        """
+        Select the cheapest hnsw query `ef` that attains a target recall.
+
+        Queries a random sample of the training points for their non-self
+        nearest neighbors, exactly as
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.get_batch_nns` does, and compares
+        the results to exact neighbors found by brute force. Each sampled point
+        is thus held out of its own neighbor set. `ef` is doubled until the
+        mean recall over the sample reaches `target_recall`, and the smallest
+        sufficient value is then found by bisection. If even an exhaustive `ef`
+        falls short of the target, a warning is issued and the largest `ef` is
+        used.
+
+        Invoked at construction time if `target_recall` is passed to an
+        `nn_method="hnsw"` lookup. It can be called again, e.g. after
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.add_training_points`.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> nbrs_lookup = NN_Wrapper(
+            ...         train_features, nn_count, nn_method="hnsw",
+            ...         target_recall=0.99,
+            ... )
+            >>> nbrs_lookup.ef
+            73
+
+        Args:
+            target_recall:
+                The desired fraction of exact neighbors that queries recover,
+                in `(0, 1]`.
+            calibration_count:
+                The number of training points to query. Defaults to 1000.
+
+        Returns:
+            The selected `ef`, which is also stored as `self.ef`.
+        """
+        if self.nn_method != "hnsw":
+            raise ValueError(
+                f"Cannot calibrate ef of nn_method {self.nn_method}"
+            )
+        if not 0.0 < target_recall <= 1.0:
+            raise ValueError(
+                f"target_recall must be in (0, 1], not {target_recall}"
+            )
+        if self.nbrs.space not in {"l2", "cosine"}:
+            raise ValueError(
+                f"Cannot calibrate ef of hnsw space {self.nbrs.space}"
+            )
+        if calibration_count is None:
+            calibration_count = _NN_HNSW_CALIBRATION_COUNT
+        calibration_count = min(calibration_count, self.train_count)
+        nn_count = min(self.nn_count + 1, self.train_count)
+        sample_indices = np.random.choice(
+            self.train_count, calibration_count, replace=False
+        )
+        train = np.asarray(self.train)
+        if self.nbrs.space == "cosine":
+            # Cosine neighbors are the Euclidean neighbors of unit vectors.
+            train = train / np.linalg.norm(train, axis=1, keepdims=True)
+        samples = train[sample_indices]
+        _, exact_indices = _BruteBLASIndex(train).kneighbors(samples, nn_count)
+        self_mask = exact_indices == sample_indices[:, None]
+        exact_indices[self_mask] = -1
+        exact_count = self_mask.size - np.sum(self_mask)
+
+        def _recall(ef):
+            self.nbrs.set_ef(ef)
+            nn_indices, _ = self.nbrs.knn_query(samples, k=nn_count)
+            nn_indices = nn_indices.astype(np.itype)
+            hits = nn_indices[:, :, None] == exact_indices[:, None, :]
+            return np.sum(hits) / exact_count
+
+        # hnswlib searches with max(ef, k), so smaller values are equivalent.
+        lower = None
+        upper = nn_count
+        while _recall(upper) < target_recall:
+            if upper >= self.train_count:
+                warnings.warn(
+                    f"hnsw index cannot attain recall {target_recall}; using "
+                    f"ef={upper}"
+                )
+                break
+            lower = upper
+            upper = min(2 * upper, self.train_count)
+        else:
+            if lower is not None:
+                while upper - lower > 1:
+                    middle = (lower + upper) // 2
+                    if _recall(middle) >= target_recall:
+                        upper = middle
+                    else:
+                        lower = middle
+        self.ef = int(upper)
+        self.nbrs.set_ef(self.ef)
+        return self.ef
+
+    def add_training_points(self, new_train: mm.ndarray) -> None:
+        """
+        Extend the training data without rebuilding the lookup datastructure.
+
+        Appends the rows of `new_train` to `train`, so that they receive the
+        indices `train_count, ..., train_count + new_count - 1`, and makes them
+        available to subsequent queries.
+        For `nn_method="hnsw"`, the index is resized (geometrically, so that
+        repeated insertions amortize) and the new points are inserted in place.
+        For `nn_method="brute_blas"`, the new points and their norms are
+        appended to the search set.
+        For `nn_method="exact"`, the new points are kept in a small delta
+        buffer that is searched by brute force and merged with the tree results
+        at query time. The tree is only rebuilt once the buffer grows beyond a
+        fixed fraction of the indexed training set.
+
+        Any cached training neighbor graph (see
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.build_train_graph`) is discarded,
+        as the new points can alter the neighbors of existing training points.
+        Running query workers (see
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.start_workers`) are restarted
+        around the updated datastructure.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> nbrs_lookup = NN_Wrapper(train_features, nn_count)
+            >>> # More data arrives
+            >>> nbrs_lookup.add_training_points(new_train_features)
+            >>> nn_indices, nn_dists = nbrs_lookup.get_nns(test_features)
+
+        Args:
+            new_train:
+                Data matrix of shape `(new_count, feature_count)` containing the
+                additional training points.
+        """
+        if self.distributed is True:
+            raise NotImplementedError(
+                "Cannot add training points to a distributed lookup"
+            )
+        new_train = np.asarray(new_train)
+        new_count, feature_count = new_train.shape
+        if feature_count != self.feature_count:
+            raise ValueError(
+                f"Cannot add points with {feature_count} features to a lookup "
+                f"datastructure with {self.feature_count} features"
+            )
+        if new_count == 0:
+            return
+        n_workers = None
+        if self._workers is not None:
+            n_workers = self._workers.n_workers
+            start_method = self._workers.start_method
+            self.stop_workers()
+        old_count = self.train_count
+        self.train = np.concatenate((np.asarray(self.train), new_train))
+        self.train_count += new_count
+        self._train_graph_indices = None
+        self._train_graph_dists = None
+        self._scaled_nbrs = None
+        if self.nn_method == "exact":
+            delta_count = self.train_count - self._indexed_count
+            if delta_count > _NN_DELTA_REBUILD_FRACTION * self._indexed_count:
+                self.nbrs = NearestNeighbors(**self.nbrs.get_params()).fit(
+                    self.train
+                )
+                self._indexed_count = self.train_count
+                self._delta_nbrs = None
+            else:
+                self._fit_delta()
+        elif self.nn_method == "brute_blas":
+            self.nbrs.add(new_train)
+            self._indexed_count = self.train_count
+        elif self.nn_method == "hnsw":
+            capacity = self.nbrs.get_max_elements()
+            if self.train_count > capacity:
+                self.nbrs.resize_index(
+                    max(
+                        self.train_count,
+                        int(_NN_HNSW_GROWTH_FACTOR * capacity),
+                    )
+                )
+            self.nbrs.add_items(
+                new_train, np.arange(old_count, self.train_count)
+            )
+            self._indexed_count = self.train_count
+        else:
+            raise NotImplementedError(
+                f"Nearest Neighbor algorithm {self.nn_method} is not "
+                f"implemented."
+            )
+        if n_workers is not None:
+            self.start_workers(n_workers, start_method=start_method)
+
+    def start_workers(
+        self, n_workers: Optional[int] = None, start_method: str = "spawn"
+    ) -> None:
+        """
+        Answer subsequent queries with a pool of worker processes.
+
+        Places the training data and the arrays of the built index in
+        `multiprocessing.shared_memory` and starts `n_workers` processes that
+        attach to them. Until :func:`~MuyGPyS.neighbors.NN_Wrapper.stop_workers`
+        is called, every query issued through
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.get_nns`,
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.get_nns_chunked`,
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.get_batch_nns`, or
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.build_train_graph` has its rows
+        split into one contiguous block per worker, and each worker queries its
+        block with a single thread. Queries with `length_scales` are not
+        distributed.
+
+        For `nn_method="exact"` with a tree algorithm, the workers reassemble
+        the tree around the shared arrays, and for `nn_method="brute_blas"`
+        they share the training norms as well. An `hnswlib` index does not
+        expose its internal buffers, so each worker holds its own copy of the
+        graph in that case.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> nbrs_lookup = NN_Wrapper(train_features, nn_count)
+            >>> nbrs_lookup.start_workers(8)
+            >>> nn_indices, nn_dists = nbrs_lookup.get_nns(test_features)
+            >>> nbrs_lookup.stop_workers()
+
+        Args:
+            n_workers:
+                The number of worker processes. Defaults to the number of
+                available cores.
+            start_method:
+                The `multiprocessing` start method used to launch the workers.
+                Note that `"spawn"` requires the calling script to guard its
+                entry point with `if __name__ == "__main__":`.
+        """
+        self.stop_workers()
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        if n_workers < 1:
+            raise ValueError(f"n_workers must be positive, not {n_workers}")
+        self._workers = _NNWorkerPool(self, n_workers, start_method)
+
+    def stop_workers(self) -> None:
+        """
+        Shut down the query workers and release their shared memory.
+
+        Subsequent queries run in the calling process. Does nothing if no
+        workers are running.
+        """
+        if self._workers is not None:
+            self._workers.close()
+            self._workers = None
+
+    def _worker_state(self) -> Tuple[Dict, Dict]:
+        # Splits the lookup into the small picklable state that is sent to each
+        # worker and the large arrays that are placed in shared memory.
+        state = {
+            "nn_method": self.nn_method,
+            "nn_count": self.nn_count,
+            "train_count": self.train_count,
+            "feature_count": self.feature_count,
+            "indexed_count": self._indexed_count,
+        }
+        arrays = dict()
+        if self.nn_method == "exact":
+            nbrs_state = dict(self.nbrs.__dict__)
+            fit_x = nbrs_state.pop("_fit_X")
+            tree = nbrs_state.pop("_tree")
+            nbrs_state["n_jobs"] = 1
+            state["nbrs"] = nbrs_state
+            arrays["train"] = np.asarray(self.train, dtype=fit_x.dtype)
+            if tree is not None:
+                # The first entry of the tree state is the fit data, which the
+                # workers recover from the shared training data.
+                tree_state = tree.__getstate__()
+                state["tree_type"] = type(tree)
+                state["tree_state"] = [None] + [
+                    None if isinstance(x, mm.ndarray) else x
+                    for x in tree_state[1:]
+                ]
+                for i, x in enumerate(tree_state[1:], start=1):
+                    if isinstance(x, mm.ndarray):
+                        arrays[f"tree_{i}"] = x
+        elif self.nn_method == "brute_blas":
+            state["query_tile_size"] = self.nbrs.query_tile_size
+            state["train_tile_size"] = self.nbrs.train_tile_size
+            arrays["train"] = self.nbrs.train
+            arrays["train_sq_norms"] = self.nbrs.train_sq_norms
+        elif self.nn_method == "hnsw":
+            state["nbrs"] = self.nbrs
+            state["ef"] = self.ef
+            arrays["train"] = self.train
+        else:
+            raise NotImplementedError(
+                f"Nearest Neighbor algorithm {self.nn_method} is not "
+                f"implemented."
+            )
+        return state, arrays
+
+    @classmethod
+    def _from_worker_state(cls, state: Dict, arrays: Dict) -> "NN_Wrapper":
+        ret = cls.__new__(cls)
+        ret.train = arrays["train"]
+        ret.train_count = state["train_count"]
+        ret.feature_count = state["feature_count"]
+        ret.nn_count = state["nn_count"]
+        ret.nn_method = state["nn_method"]
+        ret.train_graph = False
+        ret._train_graph_indices = None
+        ret._train_graph_dists = None
+        ret._indexed_count = state["indexed_count"]
+        ret._delta_nbrs = None
+        ret._scaled_nbrs = None
+        ret._workers = None
+        ret.ef = state.get("ef")
+        ret.distributed = False
+        if ret.nn_method == "exact":
+            ret.nbrs = NearestNeighbors.__new__(NearestNeighbors)
+            ret.nbrs.__dict__.update(state["nbrs"])
+            ret.nbrs._fit_X = ret.train[: ret._indexed_count, :]
+            ret.nbrs._tree = None
+            if "tree_state" in state:
+                tree_state = list(state["tree_state"])
+                tree_state[0] = ret.nbrs._fit_X
+                for i in range(1, len(tree_state)):
+                    if f"tree_{i}" in arrays:
+                        tree_state[i] = arrays[f"tree_{i}"]
+                tree_type = state["tree_type"]
+                ret.nbrs._tree = tree_type.__new__(tree_type)
+                ret.nbrs._tree.__setstate__(tuple(tree_state))
+            ret._fit_delta()
+        elif ret.nn_method == "brute_blas":
+            ret.nbrs = _BruteBLASIndex.__new__(_BruteBLASIndex)
+            ret.nbrs.train = ret.train
+            ret.nbrs.train_sq_norms = arrays["train_sq_norms"]
+            ret.nbrs.query_tile_size = state["query_tile_size"]
+            ret.nbrs.train_tile_size = state["train_tile_size"]
+            ret.nbrs._weights = None
+            ret.nbrs._weighted_sq_norms = None
+        else:
+            ret.nbrs = state["nbrs"]
+            ret.nbrs.set_num_threads(1)
+            if ret.ef is not None:
+                ret.nbrs.set_ef(ret.ef)
+        return ret
+
+    def _fit_delta(self) -> None:
+        # Brute force is the cheapest to "fit" and exact for every metric that
+        # the tree supports.
+        if self._indexed_count == self.train_count:
+            self._delta_nbrs = None
+            return
+        params = self.nbrs.get_params()
+        params["algorithm"] = "brute"
+        self._delta_nbrs = NearestNeighbors(**params).fit(
+            self.train[self._indexed_count :, :]
+        )
+
+    def _exact_kneighbors(
+        self,
+        samples: mm.ndarray,
+        nn_count: int,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        if self._delta_nbrs is None:
+            return self.nbrs.kneighbors(samples, n_neighbors=nn_count)
+        delta_count = self.train_count - self._indexed_count
+        tree_dists, tree_indices = self.nbrs.kneighbors(
+            samples, n_neighbors=min(nn_count, self._indexed_count)
+        )
+        delta_dists, delta_indices = self._delta_nbrs.kneighbors(
+            samples, n_neighbors=min(nn_count, delta_count)
+        )
+        nn_dists = np.concatenate((tree_dists, delta_dists), axis=1)
+        nn_indices = np.concatenate(
+            (tree_indices, delta_indices + self._indexed_count), axis=1
+        )
+        rows = np.arange(nn_dists.shape[0])[:, None]
+        order = np.argsort(nn_dists, axis=1, kind="stable")[:, :nn_count]
+        return nn_dists[rows, order], nn_indices[rows, order]
+
     def get_nns(
         self,
         test: mm.ndarray,
+        length_scales: Optional[mm.ndarray] = None,
     ) -> Tuple[mm.ndarray, mm.ndarray]:
         """
         Get the nearest neighbors for each row of `test` dataset.
@@ -150,6 +951,13 @@ class NN_Wrapper:
         Args:
             test:
                 Testing data matrix of shape `(test_count, feature_count)`.
+            length_scales:
+                Optional per-feature length scales of shape `(feature_count,)`
+                (or a scalar). If specified, neighbors are found with respect
+                to the squared Euclidean distance between `test / length_scales`
+                and `train / length_scales` without rebuilding the lookup
+                datastructure. See
+                :func:`~MuyGPyS.neighbors.NN_Wrapper.get_batch_nns`.
 
         Returns
         -------
@@ -162,11 +970,83 @@ class NN_Wrapper:
             lists the distance to the test element of the corresponding element
             in `nn_indices`.
         """
-        return self._get_nns(test, self.nn_count)
+        return self._get_nns(test, self.nn_count, length_scales=length_scales)
+
+    def get_nns_chunked(
+        self,
+        test: mm.ndarray,
+        chunk_size: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+    ) -> Generator[Tuple[int, mm.ndarray, mm.ndarray], None, None]:
+        """
+        Lazily get the nearest neighbors for blocks of rows of `test`.
+
+        Behaves like :func:`~MuyGPyS.neighbors.NN_Wrapper.get_nns`, but queries
+        the lookup datastructure one block of rows at a time and yields each
+        block's results as it is computed. Peak memory therefore depends upon
+        the block size rather than upon `test_count`, which makes it possible
+        to process (e.g. memory-mapped) test sets whose neighbor matrices do not
+        fit in memory.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> nbrs_lookup = NN_Wrapper(train_features, nn_count)
+            >>> for start, nn_indices, nn_dists in nbrs_lookup.get_nns_chunked(
+            ...         test_features, memory_budget=2**30
+            ... ):
+            ...     end = start + nn_indices.shape[0]
+            ...     process(test_features[start:end], nn_indices, nn_dists)
+
+        Args:
+            test:
+                Testing data matrix of shape `(test_count, feature_count)`.
+            chunk_size:
+                The number of rows of `test` to query at a time. Takes
+                precedence over `memory_budget`.
+            memory_budget:
+                An approximate upper bound, in bytes, on the memory used by the
+                neighbor indices and distances of each block. Used to derive
+                `chunk_size` if it is not specified.
+
+        Yields
+        ------
+        start:
+            The index of the first row of `test` in this block.
+        nn_indices:
+            Matrix of nearest neighbor indices of shape `(chunk, nn_count)`,
+            where `chunk <= chunk_size`.
+        nn_dists:
+            Matrix of distances of shape `(chunk, nn_count)`.
+        """
+        test_count, _ = test.shape
+        if chunk_size is None:
+            if memory_budget is None:
+                chunk_size = _NN_DEFAULT_CHUNK_SIZE
+            else:
+                chunk_size = self._chunk_size_from_budget(memory_budget)
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive, not {chunk_size}")
+        for start in range(0, test_count, chunk_size):
+            nn_indices, nn_dists = self._get_nns(
+                test[start : start + chunk_size], self.nn_count
+            )
+            yield start, nn_indices, nn_dists
+
+    def _chunk_size_from_budget(self, memory_budget: int) -> int:
+        # Each query row produces an index and a distance per neighbor, and we
+        # conservatively assume that both the library output and our converted
+        # copy are alive at the same time.
+        row_bytes = (
+            2
+            * self.nn_count
+            * (np.dtype(np.itype).itemsize + np.dtype(np.ftype).itemsize)
+        )
+        return max(1, int(memory_budget // row_bytes))
 
     def get_batch_nns(
         self,
         batch_indices: mm.ndarray,
+        length_scales: Optional[mm.ndarray] = None,
     ) -> Tuple[mm.ndarray, mm.ndarray]:
         """
         Get the non-self nearest neighbors for indices into the training data.
@@ -187,9 +1067,25 @@ class NN_Wrapper:
             >>> batch_indices = choice(train_count, batch_count, replace=False)
             >>> nn_indices, nn_dists = nbrs_lookup.get_nns(batch_indices)
 
+        Anisotropic models can pass their current `length_scales` in order to
+        find neighborhoods with respect to the scaled features without building
+        a new lookup datastructure, e.g. between the epochs of a mini-batch
+        optimization. The scaled search is an exact tiled brute force search
+        that reweights each query by `1 / length_scales**2`, so that the
+        training data is never rescaled or copied. `nn_method="brute_blas"`
+        reuses its own index, whereas `nn_method="exact"` (with the default
+        Euclidean metric) and `nn_method="hnsw"` (with `space="l2"`) lazily
+        construct a single brute force companion index that is reused across
+        calls with different length scales. The cached training neighbor graph
+        is not used by scaled queries.
+
         Args:
             batch_indices:
                 Indices into the training data of shape `(batch_count,)`.
+            length_scales:
+                Optional per-feature length scales of shape `(feature_count,)`
+                (or a scalar) by which to divide the features prior to
+                computing squared Euclidean distances.
 
         Returns
         -------
@@ -202,16 +1098,254 @@ class NN_Wrapper:
             lists the distance to the batch element of the corresponding element
             in `batch_nn_indices`.
         """
+        if self.distributed is True:
+            batch_nn_indices, batch_nn_dists = self._get_nns(
+                self._gather_train_rows(batch_indices),
+                self.nn_count + 1,
+                length_scales=length_scales,
+            )
+            return batch_nn_indices[:, 1:], batch_nn_dists[:, 1:]
+        if length_scales is not None:
+            batch_nn_indices, batch_nn_dists = self._get_nns(
+                self.train[batch_indices, :],
+                self.nn_count + 1,
+                length_scales=length_scales,
+            )
+            return batch_nn_indices[:, 1:], batch_nn_dists[:, 1:]
+        if self.train_graph is True:
+            if self._train_graph_indices is None:
+                self.build_train_graph()
+            return (
+                mm.iarray(self._train_graph_indices[batch_indices]),
+                mm.array(self._train_graph_dists[batch_indices]),
+            )
         batch_nn_indices, batch_nn_dists = self._get_nns(
             self.train[batch_indices, :],
             self.nn_count + 1,
         )
         return batch_nn_indices[:, 1:], batch_nn_dists[:, 1:]
 
+    def build_train_graph(self, chunk_size: Optional[int] = None) -> None:
+        """
+        Compute and cache the non-self nearest neighbors of every training
+        point.
+
+        Neighbor indices are stored as 32-bit integers whenever `train_count`
+        allows it. Once the graph exists,
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.get_batch_nns` reduces to a gather
+        from it if the wrapper was constructed with `train_graph=True`. This
+        function is invoked automatically in that case, but can be called
+        explicitly in order to control when the cost of the graph construction
+        is paid.
+
+        Args:
+            chunk_size:
+                The number of training points to query at a time.
+        """
+        if self.distributed is True:
+            raise ValueError("Distributed lookups do not support train graphs")
+        if chunk_size is None:
+            chunk_size = _NN_DEFAULT_CHUNK_SIZE
+        index_type = np.int32 if self.train_count < 2**31 else np.int64
+        graph_indices = np.zeros(
+            (self.train_count, self.nn_count), dtype=index_type
+        )
+        graph_dists = np.zeros((self.train_count, self.nn_count))
+        for start in range(0, self.train_count, chunk_size):
+            end = min(start + chunk_size, self.train_count)
+            nn_indices, nn_dists = self._get_nns(
+                self.train[start:end, :], self.nn_count + 1
+            )
+            graph_indices[start:end] = np.asarray(nn_indices)[:, 1:]
+            graph_dists[start:end] = np.asarray(nn_dists)[:, 1:]
+        self._train_graph_indices = graph_indices
+        self._train_graph_dists = graph_dists
+
+    def save(self, path: str) -> None:
+        """
+        Write the lookup datastructure to disk.
+
+        Creates the directory `path` (if necessary) and writes the training
+        data, the built nearest neighbor index, and a versioned metadata file
+        into it. The result can be restored with
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.load` without rebuilding the
+        index.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> train_features = load_train_features()
+            >>> nbrs_lookup = NN_Wrapper(train_features, 10, nn_method="hnsw")
+            >>> nbrs_lookup.save("nbrs_lookup")
+
+        Args:
+            path:
+                The directory into which to write the lookup datastructure.
+        """
+        if self.distributed is True:
+            raise NotImplementedError("Cannot save a distributed lookup")
+        os.makedirs(path, exist_ok=True)
+        metadata = {
+            "format_version": _NN_FORMAT_VERSION,
+            "nn_method": self.nn_method,
+            "nn_count": self.nn_count,
+            "train_count": self.train_count,
+            "feature_count": self.feature_count,
+            "train_graph": self.train_graph,
+            "train_graph_built": self._train_graph_indices is not None,
+            "indexed_count": self._indexed_count,
+        }
+        np.save(os.path.join(path, _NN_TRAIN_FILE), np.asarray(self.train))
+        if self._train_graph_indices is not None:
+            np.save(
+                os.path.join(path, _NN_GRAPH_INDICES_FILE),
+                self._train_graph_indices,
+            )
+            np.save(
+                os.path.join(path, _NN_GRAPH_DISTS_FILE),
+                self._train_graph_dists,
+            )
+        if self.nn_method == "exact":
+            _joblib_dump(self.nbrs, os.path.join(path, _NN_EXACT_INDEX_FILE))
+        elif self.nn_method == "brute_blas":
+            # The index is cheap to rebuild from the training data.
+            metadata["query_tile_size"] = self.nbrs.query_tile_size
+            metadata["train_tile_size"] = self.nbrs.train_tile_size
+        elif self.nn_method == "hnsw":
+            metadata["space"] = self.nbrs.space
+            metadata["ef"] = self.ef
+            self.nbrs.save_index(os.path.join(path, _NN_HNSW_INDEX_FILE))
+        else:
+            raise NotImplementedError(
+                f"Nearest Neighbor algorithm {self.nn_method} does not "
+                f"support serialization."
+            )
+        with open(os.path.join(path, _NN_METADATA_FILE), "w") as f:
+            json.dump(metadata, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "NN_Wrapper":
+        """
+        Read a lookup datastructure previously written by
+        :func:`~MuyGPyS.neighbors.NN_Wrapper.save`.
+
+        The training data and, for `nn_method="exact"`, the arrays of the
+        search tree are memory-mapped by default so that loading is cheap and
+        pages are shared between processes on the same node.
+
+        Example:
+            >>> from MuyGPyS.neighbors import NN_Wrapper
+            >>> nbrs_lookup = NN_Wrapper.load("nbrs_lookup")
+            >>> nn_indices, nn_dists = nbrs_lookup.get_nns(test_features)
+
+        Args:
+            path:
+                The directory containing the saved lookup datastructure.
+            mmap:
+                If `True`, memory-map the stored arrays read-only rather than
+                reading them into memory.
+
+        Returns:
+            The restored `NN_Wrapper` object.
+        """
+        with open(os.path.join(path, _NN_METADATA_FILE), "r") as f:
+            metadata = json.load(f)
+        version = metadata.get("format_version", None)
+        if version != _NN_FORMAT_VERSION:
+            raise ValueError(
+                f"NN_Wrapper at {path} has format version {version}, but this "
+                f"version of MuyGPyS reads format version {_NN_FORMAT_VERSION}"
+            )
+        mmap_mode = "r" if mmap is True else None
+
+        ret = cls.__new__(cls)
+        ret.train = np.load(
+            os.path.join(path, _NN_TRAIN_FILE), mmap_mode=mmap_mode
+        )
+        ret.train_count, ret.feature_count = ret.train.shape
+        ret.nn_count = metadata["nn_count"]
+        ret.nn_method = metadata["nn_method"]
+        ret.train_graph = metadata.get("train_graph", False)
+        ret._indexed_count = metadata.get("indexed_count", ret.train_count)
+        ret._delta_nbrs = None
+        ret._scaled_nbrs = None
+        ret._workers = None
+        ret.ef = None
+        ret.distributed = False
+        ret._train_graph_indices = None
+        ret._train_graph_dists = None
+        if metadata.get("train_graph_built", False) is True:
+            ret._train_graph_indices = np.load(
+                os.path.join(path, _NN_GRAPH_INDICES_FILE),
+                mmap_mode=mmap_mode,
+            )
+            ret._train_graph_dists = np.load(
+                os.path.join(path, _NN_GRAPH_DISTS_FILE), mmap_mode=mmap_mode
+            )
+        if ret.nn_method == "exact":
+            ret.nbrs = _joblib_load(
+                os.path.join(path, _NN_EXACT_INDEX_FILE), mmap_mode=mmap_mode
+            )
+            ret._fit_delta()
+        elif ret.nn_method == "brute_blas":
+            ret.nbrs = _BruteBLASIndex(
+                ret.train,
+                query_tile_size=metadata["query_tile_size"],
+                train_tile_size=metadata["train_tile_size"],
+            )
+        elif ret.nn_method == "hnsw":
+            if config.state.hnswlib_enabled is True:
+                ret.nbrs = hnswlib.Index(
+                    space=metadata["space"], dim=ret.feature_count
+                )
+                ret.nbrs.load_index(
+                    os.path.join(path, _NN_HNSW_INDEX_FILE),
+                    max_elements=ret.train_count,
+                )
+                ret.ef = metadata.get("ef")
+                if ret.ef is not None:
+                    ret.nbrs.set_ef(ret.ef)
+            else:
+                raise ModuleNotFoundError("Module hnswlib is not installed!")
+        else:
+            raise NotImplementedError(
+                f"Nearest Neighbor algorithm {ret.nn_method} is not "
+                f"implemented."
+            )
+        return ret
+
+    def _scaled_kneighbors(
+        self,
+        samples: mm.ndarray,
+        nn_count: int,
+        length_scales: mm.ndarray,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        if self.nn_method == "brute_blas":
+            index = self.nbrs
+        else:
+            if self.nn_method == "exact":
+                euclidean = self.nbrs.metric == "minkowski" and self.nbrs.p == 2
+            else:
+                euclidean = self.nbrs.space == "l2"
+            if not euclidean:
+                raise ValueError(
+                    "Queries with length scales require a Euclidean metric"
+                )
+            if self._scaled_nbrs is None:
+                self._scaled_nbrs = _BruteBLASIndex(self.train)
+            index = self._scaled_nbrs
+        samples = np.asarray(samples)
+        length_scales = np.broadcast_to(
+            np.asarray(length_scales, dtype=samples.dtype),
+            (self.feature_count,),
+        )
+        weights = 1.0 / np.square(length_scales)
+        return index.kneighbors(samples, nn_count, weights=weights)
+
     def _get_nns(
         self,
         samples: mm.ndarray,
         nn_count: int,
+        length_scales: Optional[mm.ndarray] = None,
     ) -> Tuple[mm.ndarray, mm.ndarray]:
         """
         Get the nearest neighbors for each row of `samples` dataset.
@@ -222,6 +1356,9 @@ class NN_Wrapper:
                 include samples to be queried.
             nn_count:
                 The number of nearest neighbors to query.
+            length_scales:
+                Optional per-feature length scales by which to divide the
+                features prior to computing distances.
 
         Returns
         -------
@@ -234,16 +1371,72 @@ class NN_Wrapper:
             lists the distance to the sample element of the corresponding
             element in `nn_indices`.
         """
-        if self.nn_method == "exact":
-            nn_dists, nn_indices = self.nbrs.kneighbors(
-                samples,
-                n_neighbors=nn_count,
+        if self.distributed is True:
+            return self._get_distributed_nns(samples, nn_count, length_scales)
+        return self._get_local_nns(samples, nn_count, length_scales)
+
+    def _gather_train_rows(self, indices: mm.ndarray) -> mm.ndarray:
+        # Every rank contributes the rows that it owns and zeros elsewhere, so
+        # that a sum across ranks assembles the requested rows everywhere.
+        local_indices = np.asarray(indices) - self._global_offset
+        mine = np.logical_and(
+            local_indices >= 0, local_indices < self.train_count
+        )
+        rows = np.zeros(
+            (local_indices.shape[0], self.feature_count),
+            dtype=np.asarray(self.train).dtype,
+        )
+        rows[mine] = np.asarray(self.train)[local_indices[mine]]
+        return _allreduce_sum_tensor(rows)
+
+    def _get_distributed_nns(
+        self,
+        samples: mm.ndarray,
+        nn_count: int,
+        length_scales: Optional[mm.ndarray] = None,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        if nn_count > self._global_count:
+            raise ValueError(
+                f"Cannot query {nn_count} neighbors from only "
+                f"{self._global_count} training points"
+            )
+        sample_count = samples.shape[0]
+        local_count = min(nn_count, self.train_count)
+        nn_dists = np.full((sample_count, nn_count), np.inf, dtype=np.float64)
+        nn_indices = np.full((sample_count, nn_count), -1, dtype=np.itype)
+        local_indices, local_dists = self._get_local_nns(
+            samples, local_count, length_scales
+        )
+        nn_dists[:, :local_count] = np.asarray(local_dists)
+        nn_indices[:, :local_count] = (
+            np.asarray(local_indices) + self._global_offset
+        )
+        nn_dists, nn_indices = _allreduce_nearest(nn_dists, nn_indices)
+        return mm.iarray(nn_indices), mm.array(nn_dists)
+
+    def _get_local_nns(
+        self,
+        samples: mm.ndarray,
+        nn_count: int,
+        length_scales: Optional[mm.ndarray] = None,
+    ) -> Tuple[mm.ndarray, mm.ndarray]:
+        if length_scales is not None:
+            nn_dists, nn_indices = self._scaled_kneighbors(
+                samples, nn_count, length_scales
             )
+        elif self._workers is not None:
+            # The workers have already converted their results.
+            nn_indices, nn_dists = self._workers.kneighbors(samples, nn_count)
+        elif self.nn_method == "exact":
+            nn_dists, nn_indices = self._exact_kneighbors(samples, nn_count)
             if self.nbrs.metric == "minkowski" and self.nbrs.p == 2:
                 # We do this so that both implementations return the squared l2
                 # for downstream consistency. Taking the square root is much
                 # more expensive, so this should not produce much overhead.
-                nn_dists = nn_dists**2
+                np.square(nn_dists, out=nn_dists)
+        elif self.nn_method == "brute_blas":
+            # Squared distances by construction.
+            nn_dists, nn_indices = self.nbrs.kneighbors(samples, nn_count)
         elif self.nn_method == "hnsw":
             # Although hnsw uses 'l2' as the name of its metric, it returns
             # F2 values as distances in order to avoid the square root
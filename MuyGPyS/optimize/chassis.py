@@ -8,6 +8,7 @@ Convenience functions for optimizing :class:`~MuyGPyS.gp.muygps.MuyGPS` objects
 """
 
 
+from functools import partial
 from typing import Dict, Optional
 
 import MuyGPyS._src.math as mm
@@ -16,6 +17,7 @@ from MuyGPyS._src.optimize.chassis import (
     _bayes_opt_optimize,
 )
 from MuyGPyS.gp import MuyGPS
+from MuyGPyS.gp.noise import HomoscedasticNoise
 from MuyGPyS.optimize.objective import make_loo_crossval_fn
 from MuyGPyS.optimize.loss import lool_fn, LossFn
 
@@ -54,6 +56,8 @@ class OptimizeFn:
         loss_fn: LossFn = lool_fn,
         loss_kwargs: Dict = dict(),
         verbose: bool = False,
+        tensor_form: str = "diffs",
+        eigen_cache: bool = False,
         **kwargs,
     ):
         """
@@ -87,6 +91,16 @@ class OptimizeFn:
                 :class:`~MuyGPyS.optimize.loss.LossFn`. Loss function specific.
             verbose:
                 If True, print debug messages.
+            tensor_form:
+                The form of `crosswise_diffs` and `pairwise_diffs`, as passed to
+                :func:`~MuyGPyS.gp.tensors.make_train_tensors`.
+            eigen_cache:
+                If True, eigendecompose the kernel tensor once per value of the
+                kernel hyperparameters and solve each noise value by diagonal
+                rescaling. Much faster when only the noise is optimized, but
+                slower than the default Cholesky solves when every evaluation
+                changes the kernel hyperparameters. Requires a
+                :class:`~MuyGPyS.gp.noise.HomoscedasticNoise` model.
             kwargs:
                 Additional keyword arguments to be passed to the wrapper
                 optimizer.
@@ -95,9 +109,29 @@ class OptimizeFn:
             A new MuyGPs model whose specified hyperparameters have been
             optimized.
         """
+        # Collapse the feature dimension once, if the deformation allows it,
+        # rather than upon every evaluation of the objective.
+        deformation = muygps.kernel.deformation
+        pairwise_diffs, _ = deformation.precompute(pairwise_diffs, tensor_form)
+        crosswise_diffs, tensor_form = deformation.precompute(
+            crosswise_diffs, tensor_form
+        )
+
+        eigen_noise = None
+        if eigen_cache is True:
+            if not isinstance(muygps.noise, HomoscedasticNoise):
+                raise ValueError(
+                    "eigen_cache requires homoscedastic noise, not "
+                    f"{type(muygps.noise).__name__}"
+                )
+            eigen_noise = muygps.noise
+
         kernel_fn = muygps.kernel.get_opt_fn()
+        if tensor_form != "diffs":
+            kernel_fn = partial(kernel_fn, tensor_form=tensor_form)
         mean_fn = muygps.get_opt_mean_fn()
         var_fn = muygps.get_opt_var_fn()
+        posterior_fn = muygps.get_opt_posterior_fn()
         scale_fn = muygps.scale.get_opt_fn(muygps)
 
         obj_fn = self._make_obj_fn(
@@ -112,6 +146,8 @@ class OptimizeFn:
             batch_targets,
             batch_features=batch_features,
             loss_kwargs=loss_kwargs,
+            posterior_fn=posterior_fn,
+            eigen_noise=eigen_noise,
         )
         return self._fn(muygps, obj_fn, verbose=verbose, **kwargs)
 
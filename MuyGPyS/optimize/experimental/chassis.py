@@ -24,8 +24,8 @@ See the `BayesianOptimization <https://github.com/fmfn/BayesianOptimization>`_
 documentation for details.
 """
 
-from copy import deepcopy
 import numpy as np
+from functools import partial
 from time import process_time
 from typing import Dict, Optional, Tuple
 
@@ -189,6 +189,7 @@ def optimize_from_tensors_mini_batch(
     kernel_fn = muygps.kernel.get_opt_fn()
     mean_fn = muygps.get_opt_mean_fn()
     var_fn = muygps.get_opt_var_fn()
+    posterior_fn = muygps.get_opt_posterior_fn()
     scale_fn = muygps.scale.get_opt_fn(muygps)
 
     # Create bayes_opt kwargs
@@ -215,7 +216,7 @@ def optimize_from_tensors_mini_batch(
     nbrs_lookup = NN_Wrapper(
         train_features, nn_count, nn_method="exact", algorithm="ball_tree"
     )
-    new_nbrs_lookup = deepcopy(nbrs_lookup)
+    length_scales = None
     batch_indices = mm.arange(train_count, dtype=mm.itype)
 
     # Run optimization loop
@@ -226,7 +227,9 @@ def optimize_from_tensors_mini_batch(
             batch_indices = mm.iarray(
                 np.random.choice(train_count, batch_count, replace=False)
             )
-        batch_nn_indices, _ = new_nbrs_lookup.get_batch_nns(batch_indices)
+        batch_nn_indices, _ = nbrs_lookup.get_batch_nns(
+            batch_indices, length_scales=length_scales
+        )
 
         # Coalesce distance and target tensors
         (
@@ -241,19 +244,30 @@ def optimize_from_tensors_mini_batch(
             train_responses,
         )
 
+        # Collapse the feature dimension once per batch, if possible
+        deformation = muygps.kernel.deformation
+        batch_pairwise_tensor, _ = deformation.precompute(batch_pairwise_diffs)
+        batch_crosswise_tensor, tensor_form = deformation.precompute(
+            batch_crosswise_diffs
+        )
+        batch_kernel_fn = kernel_fn
+        if tensor_form != "diffs":
+            batch_kernel_fn = partial(kernel_fn, tensor_form=tensor_form)
+
         # Generate the objective function
         obj_fn = make_loo_crossval_fn(
             loss_fn,
-            kernel_fn,
+            batch_kernel_fn,
             mean_fn,
             var_fn,
             scale_fn,
-            batch_pairwise_diffs,
-            batch_crosswise_diffs,
+            batch_pairwise_tensor,
+            batch_crosswise_tensor,
             batch_nn_targets,
             batch_targets,
             batch_features=batch_features,
             loss_kwargs=loss_kwargs,
+            posterior_fn=posterior_fn,
         )
 
         # Setting the function to be optimized for this epoch
@@ -282,7 +296,8 @@ def optimize_from_tensors_mini_batch(
         to_probe.append(optimizer.max["params"])
         optimized_values.append(f"{epoch}, {optimizer.max['params']}")
 
-        # Update neighborhoods using the learned length scales
+        # Update neighborhoods using the learned length scales. The lookup
+        # rescales its queries rather than being rebuilt on scaled features.
         if isinstance(muygps.kernel.deformation, Anisotropy) and (
             epoch < (num_epochs - 1)
         ):
@@ -290,13 +305,6 @@ def optimize_from_tensors_mini_batch(
                 train_features.shape,
                 **optimizer.max["params"],
             )
-            train_features_scaled = train_features / length_scales
-            new_nbrs_lookup = NN_Wrapper(
-                train_features_scaled,
-                nn_count,
-                nn_method="exact",
-                algorithm="ball_tree",
-            )
     time_stop = process_time()
 
     # Print outcomes
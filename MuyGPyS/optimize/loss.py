@@ -10,7 +10,7 @@ MuyGPyS includes predefined loss functions and convenience functions for
 indicating them to optimization.
 """
 
-from typing import Callable
+from typing import Callable, Optional
 
 import MuyGPyS._src.math as mm
 from MuyGPyS._src.optimize.loss import (
@@ -30,6 +30,7 @@ def make_raw_predict_and_loss_fn(
     scale_fn: Callable,
     batch_nn_targets: mm.ndarray,
     batch_targets: mm.ndarray,
+    posterior_fn: Optional[Callable] = None,
     **loss_kwargs,
 ) -> Callable:
     """
@@ -68,6 +69,10 @@ def make_raw_predict_and_loss_fn(
         batch_targets:
             A matrix of shape `(batch_count, response_count)` containing the
             expected response of each batch element.
+        posterior_fn:
+            An optional MuyGPS combined posterior mean and variance function
+            Callable with signature `(K, Kcross, batch_nn_targets)`. Unused by
+            this function, but still accepted by the signature.
         loss_kwargs:
             Additionall keyword arguments used by the loss function.
 
@@ -97,6 +102,7 @@ def make_var_predict_and_loss_fn(
     scale_fn: Callable,
     batch_nn_targets: mm.ndarray,
     batch_targets: mm.ndarray,
+    posterior_fn: Optional[Callable] = None,
     **loss_kwargs,
 ) -> Callable:
     """
@@ -134,6 +140,12 @@ def make_var_predict_and_loss_fn(
         batch_targets:
             A matrix of shape `(batch_count, response_count)` containing the
             expected response of each batch element.
+        posterior_fn:
+            An optional MuyGPS combined posterior mean and variance function
+            Callable with signature `(K, Kcross, batch_nn_targets)`, as returned
+            by :func:`~MuyGPyS.gp.muygps.MuyGPS.get_opt_posterior_fn`. If
+            given, it replaces `mean_fn` and `var_fn` so that each evaluation
+            factors `K` only once.
         loss_kwargs:
             Additionall keyword arguments used by the loss function.
 
@@ -144,16 +156,20 @@ def make_var_predict_and_loss_fn(
     """
 
     def predict_and_loss_fn(K, Kcross, *args, **kwargs):
-        predictions = mean_fn(
-            K,
-            Kcross,
-            batch_nn_targets,
-            **kwargs,
-        )
+        if posterior_fn is None:
+            predictions = mean_fn(
+                K,
+                Kcross,
+                batch_nn_targets,
+                **kwargs,
+            )
+            variances = var_fn(K, Kcross, **kwargs)
+        else:
+            predictions, variances = posterior_fn(
+                K, Kcross, batch_nn_targets, **kwargs
+            )
         scale = scale_fn(K, batch_nn_targets, **kwargs)
 
-        variances = var_fn(K, Kcross, **kwargs)
-
         return -loss_fn(
             predictions, batch_targets, variances, scale, **loss_kwargs
         )
@@ -177,7 +193,7 @@ class LossFn:
             can implement different `kwargs` as needed.
         make_precit_and_loss_fn:
             A Callable with signature
-            `(loss_fn, mean_fn, var_fn, scale_fn, batch_nn_targets, batch_targets, **loss_kwargs)`
+            `(loss_fn, mean_fn, var_fn, scale_fn, batch_nn_targets, batch_targets, posterior_fn=None, **loss_kwargs)`
             that produces a function that computes posterior predictions and
             scores them using the loss function.
             :func:~MuyGPyS.optimize.loss._make_raw_predict_and_loss_fn` and
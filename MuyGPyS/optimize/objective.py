@@ -14,6 +14,8 @@ from typing import Callable, Dict, Optional
 
 import MuyGPyS._src.math as mm
 
+from MuyGPyS.gp.factor import EigenFactor
+from MuyGPyS.gp.noise import HomoscedasticNoise
 from MuyGPyS.optimize.loss import LossFn
 
 
@@ -29,6 +31,8 @@ def make_loo_crossval_fn(
     batch_targets: mm.ndarray,
     batch_features: Optional[mm.ndarray] = None,
     loss_kwargs: Dict = dict(),
+    posterior_fn: Optional[Callable] = None,
+    eigen_noise: Optional[HomoscedasticNoise] = None,
 ) -> Callable:
     """
     Prepare a leave-one-out cross validation function as a function purely of
@@ -73,11 +77,36 @@ def make_loo_crossval_fn(
             give the features for each batch element.
         loss_kwargs:
             A dict listing any additional kwargs to pass to the loss function.
+        posterior_fn:
+            An optional function that realizes the MuyGPs posterior mean and
+            variance together given a noise model. Loss functions that need
+            both use it in place of `mean_fn` and `var_fn`.
+        eigen_noise:
+            An optional homoscedastic noise model. If given, the kernel tensor
+            is eigendecomposed once per value of the kernel hyperparameters
+            and passed on as an :class:`~MuyGPyS.gp.factor.EigenFactor`
+            perturbed by the current `noise` value, or by the value of
+            `eigen_noise` if the noise is fixed. Evaluations that only change
+            the noise then avoid factoring the kernel tensor. See
+            :func:`make_eigen_kernels_fn`.
 
     Returns:
         A Callable `objective_fn`.
     """
-    kernels_fn = make_kernels_fn(kernel_fn, pairwise_diffs, crosswise_diffs)
+    if eigen_noise is None:
+        kernels_fn = make_kernels_fn(kernel_fn, pairwise_diffs, crosswise_diffs)
+    else:
+        kernels_fn = make_eigen_kernels_fn(
+            kernel_fn, pairwise_diffs, crosswise_diffs, eigen_noise
+        )
+        noise_scale_fn = scale_fn
+
+        # The scale optimization of the default objective perturbs the kernel
+        # tensor with the model's stored noise rather than the value being
+        # optimized. Do the same, so that both objectives agree.
+        def scale_fn(K, *args, **kwargs):
+            return noise_scale_fn(K.perturb(eigen_noise()), *args, **kwargs)
+
     # This is ad-hoc, and might need to be revisited.
     predict_and_loss_fn = loss_fn.make_predict_and_loss_fn(
         mean_fn,
@@ -85,6 +114,7 @@ def make_loo_crossval_fn(
         scale_fn,
         batch_nn_targets,
         batch_targets,
+        posterior_fn=posterior_fn,
         **loss_kwargs,
     )
 
@@ -106,3 +136,69 @@ def make_kernels_fn(
         return K, Kcross
 
     return kernels_fn
+
+
+def make_eigen_kernels_fn(
+    kernel_fn: Callable,
+    pairwise_diffs: mm.ndarray,
+    crosswise_diffs: mm.ndarray,
+    eigen_noise: HomoscedasticNoise,
+) -> Callable:
+    """
+    Prepare a kernels function that reuses eigendecompositions across noise
+    values.
+
+    The returned function realizes the kernel tensors like the function
+    returned by :func:`make_kernels_fn`, but returns an
+    :class:`~MuyGPyS.gp.factor.EigenFactor` in place of `K`. It remembers the
+    factor of the most recent kernel hyperparameter values, so a following
+    evaluation that only changes the `noise` keyword argument, e.g. when only
+    the noise is optimized or during a finite difference or line search step
+    in the noise, rescales the existing eigendecomposition instead of
+    realizing and factoring a new kernel tensor. The hyperparameter values are
+    compared as floats, so they must be scalars.
+
+    Args:
+        kernel_fn:
+            A function that realizes kernel tensors given a list of the free
+            parameters.
+        pairwise_diffs:
+            A tensor of shape `(batch_count, nn_count, nn_count, feature_count)`
+            containing the `(nn_count, nn_count, feature_count)`-shaped pairwise
+            nearest neighbor difference tensors corresponding to each of the
+            batch elements.
+        crosswise_diffs:
+            A tensor of shape `(batch_count, nn_count, feature_count)` whose
+            last two dimensions list the difference between each feature of each
+            batch element element and its nearest neighbors.
+        eigen_noise:
+            The homoscedastic noise model, whose current value is used if
+            `noise` is not passed as a keyword argument.
+
+    Returns:
+        A Callable with signature `(*args, **kwargs) -> (factor, Kcross)`.
+    """
+    cached_key = None
+    cached_factor = None
+    cached_Kcross = None
+
+    def kernels_fn(*args, noise=None, batch_features=None, **kwargs):
+        nonlocal cached_key, cached_factor, cached_Kcross
+        if noise is None:
+            noise = eigen_noise()
+        key = (
+            tuple(float(arg) for arg in args),
+            tuple((name, float(val)) for name, val in sorted(kwargs.items())),
+        )
+        if cached_factor is None or key != cached_key:
+            K = kernel_fn(
+                pairwise_diffs, *args, batch_features=batch_features, **kwargs
+            )
+            cached_Kcross = kernel_fn(
+                crosswise_diffs, *args, batch_features=batch_features, **kwargs
+            )
+            cached_factor = EigenFactor(K, noise)
+            cached_key = key
+        return cached_factor.perturb(noise), cached_Kcross
+
+    return kernels_fn
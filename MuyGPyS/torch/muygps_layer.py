@@ -150,10 +150,4 @@ class MuyGPs_layer(nn.Module):
         Kcross = self.muygps_model.kernel(crosswise_diffs)
         K = self.muygps_model.kernel(pairwise_diffs)
 
-        predictions = self.muygps_model.posterior_mean(
-            K, Kcross, self.batch_nn_targets
-        )
-
-        variances = self.muygps_model.posterior_variance(K, Kcross)
-
-        return predictions, variances
+        return self.muygps_model.posterior(K, Kcross, self.batch_nn_targets)
@@ -0,0 +1,454 @@
+# Copyright 2021-2023 Lawrence Livermore National Security, LLC and other
+# MuyGPyS Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Recall-vs-throughput benchmark of nearest neighbor lookup choices
+
+Builds an :class:`~MuyGPyS.neighbors.NN_Wrapper` for each requested
+`nn_method` variant (including a grid over the hnsw parameters `M`,
+`ef_construction`, and the query-time `ef`) and reports its build time, query
+throughput, peak memory, recall@k against exact neighbors, and the downstream
+error of a fixed :class:`~MuyGPyS.gp.muygps.MuyGPS` model's posterior mean.
+
+Peak memory is reported both as the peak of the allocations traced by
+`tracemalloc`, which covers numpy and scikit-learn but not the internal
+allocations of hnswlib, and as the growth of the maximum resident set size
+while benchmarking each variant. Each lookup is built, swept over its query
+`ef` values and released in a fresh child process, so that the resident set
+growth of a variant does not include the indexes of earlier ones.
+
+By default the benchmark runs upon synthetic data, so no data files are
+required, e.g.
+
+    $ python performance/nn_benchmark.py -n 100000 -t 10000 -d 3 -k 30
+
+The Heaton data used by `performance/benchmark.py` can be supplied with
+`--file` instead.
+"""
+
+import argparse
+import multiprocessing
+import pickle
+import resource
+import tracemalloc
+
+from time import perf_counter_ns
+
+import numpy as np
+
+import MuyGPyS._src.math as mm
+from MuyGPyS import config
+from MuyGPyS._src.mpi_utils import _rank0, _print0
+from MuyGPyS.gp import MuyGPS
+from MuyGPyS.gp.deformation import Isotropy, l2
+from MuyGPyS.gp.hyperparameter import Parameter
+from MuyGPyS.gp.kernels import Matern
+from MuyGPyS.gp.noise import HomoscedasticNoise
+from MuyGPyS.gp.tensors import make_predict_tensors
+from MuyGPyS.neighbors import NN_Wrapper
+
+
+def print_line():
+    _print0(
+        "=================================================="
+        "=================================================="
+    )
+
+
+def make_synthetic_data(train_count, test_count, feature_count, noise, seed):
+    rng = np.random.default_rng(seed)
+
+    def _responses(features):
+        return mm.array(
+            np.sum(np.sin(2 * np.pi * features), axis=1, keepdims=True)
+            / np.sqrt(feature_count)
+        )
+
+    train_features = mm.array(rng.uniform(size=(train_count, feature_count)))
+    test_features = mm.array(rng.uniform(size=(test_count, feature_count)))
+    train_responses = _responses(train_features) + mm.array(
+        rng.normal(scale=np.sqrt(noise), size=(train_count, 1))
+    )
+    test_responses = _responses(test_features)
+    return train_features, train_responses, test_features, test_responses
+
+
+def load_data(args):
+    if args.file is None:
+        return make_synthetic_data(
+            args.train_count,
+            args.test_count,
+            args.feature_count,
+            args.noise,
+            args.seed,
+        )
+    # Only require h5py if a file is actually provided.
+    from benchmark import extract_data
+
+    (
+        train_features,
+        train_responses,
+        _,
+        test_features,
+        test_responses,
+        _,
+        _,
+    ) = extract_data(args.file)
+    return train_features, train_responses, test_features, test_responses
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the recall and throughput of NN_Wrapper methods"
+    )
+    parser.add_argument(
+        "-f",
+        "--file",
+        type=str,
+        default=None,
+        help="optional hdf5 data file. Synthetic data is used if omitted.",
+    )
+    parser.add_argument(
+        "-o",
+        "--out-file",
+        type=str,
+        default=None,
+        help="pickle archive file for results.",
+    )
+    parser.add_argument(
+        "-n",
+        "--train-count",
+        type=int,
+        default=20000,
+        help="number of synthetic training points.",
+    )
+    parser.add_argument(
+        "-t",
+        "--test-count",
+        type=int,
+        default=2000,
+        help="number of synthetic test points.",
+    )
+    parser.add_argument(
+        "-d",
+        "--feature-count",
+        type=int,
+        default=2,
+        help="number of synthetic features.",
+    )
+    parser.add_argument(
+        "-k",
+        "--nn-count",
+        type=int,
+        default=30,
+        help="number of nearest neighbors to query.",
+    )
+    parser.add_argument(
+        "-l",
+        "--length-scale",
+        type=float,
+        default=0.1,
+        help="length scale of the fixed Matérn model.",
+    )
+    parser.add_argument(
+        "-s",
+        "--smoothness",
+        type=float,
+        default=1.5,
+        help="Matérn smoothness parameter.",
+    )
+    parser.add_argument(
+        "--noise",
+        type=float,
+        default=1e-3,
+        help="noise variance of the synthetic responses and the model.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed of the synthetic data.",
+    )
+    parser.add_argument(
+        "-m",
+        "--methods",
+        type=str,
+        nargs="+",
+        default=["exact", "brute_blas", "hnsw"],
+        help="nn_method variants to benchmark.",
+    )
+    parser.add_argument(
+        "--hnsw-M",
+        type=int,
+        nargs="+",
+        default=[16],
+        help="hnsw M values to benchmark.",
+    )
+    parser.add_argument(
+        "--hnsw-ef-construction",
+        type=int,
+        nargs="+",
+        default=[100, 200],
+        help="hnsw ef_construction values to benchmark.",
+    )
+    parser.add_argument(
+        "--hnsw-ef",
+        type=int,
+        nargs="+",
+        default=None,
+        help="hnsw query ef values to benchmark. Defaults to multiples of "
+        "nn_count.",
+    )
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        type=int,
+        default=1,
+        help="number of timing iterations to run.",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        default=False,
+        help="if set, print verbose messages.",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    muygps = MuyGPS(
+        Matern(
+            deformation=Isotropy(l2, length_scale=Parameter(args.length_scale)),
+            smoothness=Parameter(args.smoothness),
+        ),
+        noise=HomoscedasticNoise(args.noise),
+    )
+
+    pipeline = NNBenchmarkPipeline(muygps, args)
+
+    pipeline()
+    pipeline.report()
+    pipeline.serialize()
+
+
+def get_variants(params):
+    variants = list()
+    for method in params.methods:
+        if method == "exact":
+            variants.append(
+                (
+                    "exact",
+                    {"nn_method": "exact", "algorithm": "ball_tree"},
+                    None,
+                )
+            )
+        elif method == "brute_blas":
+            variants.append(("brute_blas", {"nn_method": "brute_blas"}, None))
+        elif method == "hnsw":
+            if config.state.hnswlib_enabled is False:
+                _print0("hnswlib is not installed; skipping hnsw variants")
+                continue
+            efs = params.hnsw_ef
+            if efs is None:
+                efs = [params.nn_count * m for m in [1, 2, 4, 8]]
+            for M in params.hnsw_M:
+                for ef_construction in params.hnsw_ef_construction:
+                    for ef in efs:
+                        variants.append(
+                            (
+                                f"hnsw(M={M}, efc={ef_construction}, ef={ef})",
+                                {
+                                    "nn_method": "hnsw",
+                                    "space": "l2",
+                                    "M": M,
+                                    "ef_construction": ef_construction,
+                                },
+                                ef,
+                            )
+                        )
+        else:
+            raise ValueError(f"Unsupported nn_method {method}")
+    return variants
+
+
+def recall_at_k(nn_indices, exact_indices):
+    nn_indices = np.asarray(nn_indices)
+    exact_indices = np.asarray(exact_indices)
+    count, nn_count = exact_indices.shape
+    hits = sum(
+        np.intersect1d(nn_indices[i], exact_indices[i]).shape[0]
+        for i in range(count)
+    )
+    return hits / (count * nn_count)
+
+
+def max_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class NNBenchmarkPipeline:
+    def __init__(self, muygps, params):
+        self._muygps = muygps
+        self._params = params
+        (
+            self._train_features,
+            self._train_responses,
+            self._test_features,
+            self._test_responses,
+        ) = load_data(params)
+        self.results = dict()
+
+    def build(self, nn_kwargs):
+        tracemalloc.start()
+        start_time = perf_counter_ns()
+        nbrs_lookup = NN_Wrapper(
+            self._train_features, self._params.nn_count, **nn_kwargs
+        )
+        end_time = perf_counter_ns()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return nbrs_lookup, (end_time - start_time) / 1e9, peak / 2**20
+
+    def query(self, nbrs_lookup):
+        tracemalloc.start()
+        timing = 0.0
+        for _ in range(self._params.iterations):
+            start_time = perf_counter_ns()
+            nn_indices, nn_dists = nbrs_lookup.get_nns(self._test_features)
+            end_time = perf_counter_ns()
+            timing += (end_time - start_time) / 1e9
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return nn_indices, timing / self._params.iterations, peak / 2**20
+
+    def posterior_mean(self, nn_indices):
+        test_count, _ = self._test_features.shape
+        (
+            crosswise_diffs,
+            pairwise_diffs,
+            nn_targets,
+        ) = make_predict_tensors(
+            mm.arange(test_count),
+            nn_indices,
+            self._test_features,
+            self._train_features,
+            self._train_responses,
+        )
+        K = self._muygps.kernel(pairwise_diffs)
+        Kcross = self._muygps.kernel(crosswise_diffs)
+        return self._muygps.posterior_mean(K, Kcross, nn_targets)
+
+    def __call__(self):
+        train_count, feature_count = self._train_features.shape
+        test_count, _ = self._test_features.shape
+        _print0(
+            f"Benchmarking {train_count} train and {test_count} test points "
+            f"with {feature_count} features and nn_count "
+            f"{self._params.nn_count}"
+        )
+        print_line()
+        exact_lookup = NN_Wrapper(
+            self._train_features,
+            self._params.nn_count,
+            nn_method="exact",
+            algorithm="ball_tree",
+        )
+        exact_indices, _ = exact_lookup.get_nns(self._test_features)
+        exact_mean = self.posterior_mean(exact_indices)
+        del exact_lookup
+
+        # Group the variants that share a lookup, so that each lookup is built
+        # once and then swept over its query ef values.
+        builds = dict()
+        for name, nn_kwargs, ef in get_variants(self._params):
+            build_key = str(sorted(nn_kwargs.items()))
+            builds.setdefault(build_key, (nn_kwargs, list()))[1].append(
+                (name, ef)
+            )
+        # Benchmark each lookup in a fresh process, which releases it before
+        # the next one is built and isolates its maximum resident set size.
+        context = multiprocessing.get_context("fork")
+        for nn_kwargs, queries in builds.values():
+            results = context.Queue()
+            process = context.Process(
+                target=self._benchmark_lookup,
+                args=(nn_kwargs, queries, exact_indices, exact_mean, results),
+            )
+            process.start()
+            self.results.update(results.get())
+            process.join()
+
+    def _benchmark_lookup(
+        self, nn_kwargs, queries, exact_indices, exact_mean, results
+    ):
+        test_count, _ = self._test_features.shape
+        lookup_results = dict()
+        rss_before = max_rss_mb()
+        nbrs_lookup, build_time, build_peak = self.build(nn_kwargs)
+        for name, ef in queries:
+            if ef is not None:
+                nbrs_lookup.nbrs.set_ef(ef)
+            nn_indices, query_time, query_peak = self.query(nbrs_lookup)
+            mean = self.posterior_mean(nn_indices)
+            result = {
+                "build time (s)": build_time,
+                "queries per second": test_count / query_time,
+                "peak traced memory (MB)": max(build_peak, query_peak),
+                "max rss growth (MB)": max_rss_mb() - rss_before,
+                "recall@k": recall_at_k(nn_indices, exact_indices),
+                "posterior mean rmse": float(
+                    np.sqrt(
+                        np.mean(
+                            (
+                                np.asarray(mean)
+                                - np.asarray(self._test_responses)
+                            )
+                            ** 2
+                        )
+                    )
+                ),
+                "max posterior mean change": float(
+                    np.max(np.abs(np.asarray(mean) - np.asarray(exact_mean)))
+                ),
+            }
+            lookup_results[name] = result
+            if self._params.verbose is True:
+                _print0(f"{name} : {result}")
+        results.put(lookup_results)
+
+    def report(self):
+        columns = [
+            "build time (s)",
+            "queries per second",
+            "peak traced memory (MB)",
+            "max rss growth (MB)",
+            "recall@k",
+            "posterior mean rmse",
+            "max posterior mean change",
+        ]
+        name_width = max(len(name) for name in self.results) + 2
+        _print0(
+            "method".ljust(name_width)
+            + "".join(f"{column:>26}" for column in columns)
+        )
+        print_line()
+        for name, result in self.results.items():
+            _print0(
+                name.ljust(name_width)
+                + "".join(f"{result[column]:>26.6g}" for column in columns)
+            )
+
+    def serialize(self):
+        if self._params.out_file is not None and _rank0() is True:
+            with open(self._params.out_file, "wb") as f:
+                pickle.dump(self.results, f)
+
+
+if __name__ == "__main__":
+    main()
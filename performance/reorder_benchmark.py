@@ -0,0 +1,166 @@
+# Copyright 2021-2023 Lawrence Livermore National Security, LLC and other
+# MuyGPyS Project Developers. See the top-level COPYRIGHT file for details.
+#
+# SPDX-License-Identifier: MIT
+
+"""
+Benchmark of locality-ordered prediction tensor construction
+
+Times the gather of the neighbors' training features, which is the access that
+locality ordering targets, and the whole of
+:func:`~MuyGPyS.gp.tensors.make_predict_tensors`, upon a randomly ordered batch
+of test points with and without `reorder=True`, and reports the speedups. The
+reordered timings include computing the
+:func:`~MuyGPyS.gp.tensors.locality_order`, but not the nearest neighbor
+queries, which are shared. The training data is randomly ordered, so the
+benefit comes from consecutive test points sharing their neighbors' training
+data rather than from reading the training data sequentially. The gather is a
+minor part of building the tensors when there are few features, and random
+gathers are only slow once the training data greatly exceeds the cache, so
+whether reordering pays off depends upon the machine and the data, e.g.
+
+    $ python performance/reorder_benchmark.py -n 1000000 -t 20000 -k 30
+"""
+
+import argparse
+
+from time import perf_counter
+
+import numpy as np
+
+import MuyGPyS._src.math as mm
+from MuyGPyS._src.mpi_utils import _print0
+from MuyGPyS.gp import MuyGPS
+from MuyGPyS.gp.kernels import RBF
+from MuyGPyS.gp.noise import HomoscedasticNoise
+from MuyGPyS.gp.tensors import locality_order, make_predict_tensors
+from MuyGPyS.neighbors import NN_Wrapper
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Benchmark locality-ordered prediction tensors"
+    )
+    parser.add_argument(
+        "-n",
+        "--train-count",
+        type=int,
+        default=1000000,
+        help="number of synthetic training points.",
+    )
+    parser.add_argument(
+        "-t",
+        "--test-count",
+        type=int,
+        default=20000,
+        help="number of synthetic test points.",
+    )
+    parser.add_argument(
+        "-d",
+        "--feature-count",
+        type=int,
+        default=3,
+        help="number of synthetic features.",
+    )
+    parser.add_argument(
+        "-k",
+        "--nn-count",
+        type=int,
+        default=30,
+        help="number of nearest neighbors.",
+    )
+    parser.add_argument(
+        "-i",
+        "--iterations",
+        type=int,
+        default=3,
+        help="number of timing iterations, of which the best is reported.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed of the synthetic data.",
+    )
+    return parser.parse_args()
+
+
+def best_time(fn, iterations):
+    timings = list()
+    for _ in range(iterations):
+        start = perf_counter()
+        result = fn()
+        timings.append(perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    train_features = mm.array(
+        rng.uniform(size=(args.train_count, args.feature_count))
+    )
+    train_targets = mm.array(rng.normal(size=(args.train_count, 1)))
+    test_features = mm.array(
+        rng.uniform(size=(args.test_count, args.feature_count))
+    )
+    test_indices = mm.arange(args.test_count)
+    nn_indices, _ = NN_Wrapper(
+        train_features, args.nn_count, nn_method="exact", algorithm="ball_tree"
+    ).get_nns(test_features)
+    muygps = MuyGPS(kernel=RBF(), noise=HomoscedasticNoise(1e-3))
+
+    def predict(crosswise, pairwise, batch_nn_targets):
+        return muygps.posterior_mean(
+            muygps.kernel(pairwise, tensor_form="sq_dists"),
+            muygps.kernel(crosswise, tensor_form="sq_dists"),
+            batch_nn_targets,
+        )
+
+    def build(reorder):
+        return make_predict_tensors(
+            test_indices,
+            nn_indices,
+            test_features,
+            train_features,
+            train_targets,
+            tensor_form="sq_dists",
+            reorder=reorder,
+        )
+
+    def gather_reordered():
+        order, _ = locality_order(test_features)
+        return train_features[nn_indices[order]]
+
+    def build_reordered():
+        *tensors, _, inverse = build(True)
+        return tensors, inverse
+
+    random_gather_time, _ = best_time(
+        lambda: train_features[nn_indices], args.iterations
+    )
+    ordered_gather_time, _ = best_time(gather_reordered, args.iterations)
+    random_time, tensors = best_time(lambda: build(False), args.iterations)
+    ordered_time, (ordered_tensors, inverse) = best_time(
+        build_reordered, args.iterations
+    )
+    random_mean = predict(*tensors)
+    ordered_mean = predict(*ordered_tensors)[inverse]
+    assert np.allclose(random_mean, ordered_mean)
+
+    _print0(
+        f"{args.test_count} test points, {args.train_count} training points, "
+        f"{args.feature_count} features, nn_count {args.nn_count}"
+    )
+    for name, random, ordered in (
+        ("feature gather", random_gather_time, ordered_gather_time),
+        ("predict tensors", random_time, ordered_time),
+    ):
+        _print0(
+            f"{name:>16}: random order {random:.4f}s, locality order "
+            f"{ordered:.4f}s, speedup {random / ordered:.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -11,12 +11,18 @@ from MuyGPyS import config
 from MuyGPyS._src.gp.tensors.numpy import (
     _F2 as F2_n,
     _l2 as l2_n,
+    _crosswise_tensor as crosswise_tensor_n,
+    _fast_nn_update as fast_nn_update_n,
+    _make_fast_predict_tensors as make_fast_predict_tensors_n,
     _make_train_tensors as make_train_tensors_n,
     _make_predict_tensors as make_predict_tensors_n,
 )
 from MuyGPyS._src.gp.tensors.mpi import (
     # _F2 as F2_m,
     # _l2 as l2_m,
+    _crosswise_tensor as crosswise_tensor_m,
+    _fast_coefficients_tensor as fast_coefficients_tensor_m,
+    _make_fast_predict_tensors as make_fast_predict_tensors_m,
     _make_train_tensors as make_train_tensors_m,
     _make_predict_tensors as make_predict_tensors_m,
 )
@@ -37,13 +43,23 @@ from MuyGPyS._src.gp.kernels.numpy import (
 #     _matern_inf_fn as matern_inf_fn_m,
 #     _matern_gen_fn as matern_gen_fn_m,
 # )
-from MuyGPyS._src.mpi_utils import _chunk_tensor
+import MuyGPyS._src.mpi_utils as mpi_utils
+from MuyGPyS._src.mpi_utils import (
+    _allgather_tensor,
+    _bcast_tensor,
+    _chunk_tensor,
+    _get_chunk_sizes,
+)
 from MuyGPyS._src.gp.muygps.numpy import (
     _muygps_diagonal_variance as muygps_diagonal_variance_n,
+    _muygps_fast_posterior_mean as muygps_fast_posterior_mean_n,
+    _muygps_fast_posterior_mean_precompute as muygps_fast_precompute_n,
     _muygps_posterior_mean as muygps_posterior_mean_n,
 )
 from MuyGPyS._src.gp.muygps.mpi import (
     _muygps_diagonal_variance as muygps_diagonal_variance_m,
+    _muygps_fast_posterior_mean as muygps_fast_posterior_mean_m,
+    _muygps_fast_posterior_mean_precompute as muygps_fast_precompute_m,
     _muygps_posterior_mean as muygps_posterior_mean_m,
 )
 from MuyGPyS._src.gp.noise.numpy import (
@@ -57,6 +73,7 @@ from MuyGPyS._src.optimize.scale.numpy import (
 )
 from MuyGPyS._src.optimize.scale.mpi import (
     _analytic_scale_optim as analytic_scale_optim_m,
+    _analytic_scale_optim_whitened as analytic_scale_optim_whitened_m,
 )
 from MuyGPyS._src.optimize.loss.numpy import (
     _cross_entropy_fn as cross_entropy_fn_n,
@@ -89,6 +106,7 @@ from MuyGPyS._test.utils import (
 from MuyGPyS.gp import MuyGPS
 from MuyGPyS.gp.deformation import Anisotropy, Isotropy
 from MuyGPyS.gp.hyperparameter import AnalyticScale, ScalarParam
+from MuyGPyS.gp.factor import CholeskyFactor
 from MuyGPyS.gp.kernels import Matern, RBF
 from MuyGPyS.gp.noise import HomoscedasticNoise
 from MuyGPyS.neighbors import NN_Wrapper
@@ -339,6 +357,7 @@ class TensorsTestCase(parameterized.TestCase):
             cls.train_responses,
         )
         cls.test_responses_chunk = _chunk_tensor(cls.test_responses)
+        cls.test_nn_indices = test_nn_indices
 
     def _compare_tensors(self, tensor, tensor_chunks):
         recovered_tensor = world.gather(tensor_chunks, root=0)
@@ -387,6 +406,117 @@ class TensorsTest(TensorsTestCase):
     def test_test_nn_targets(self):
         self._compare_tensors(self.test_nn_targets, self.test_nn_targets_chunk)
 
+    def test_replicated_predict_tensors(self):
+        # Every rank holds the data, so each builds its chunk without
+        # communication.
+        (
+            test_crosswise_diffs_chunk,
+            test_pairwise_diffs_chunk,
+            test_nn_targets_chunk,
+        ) = make_predict_tensors_m(
+            np.arange(self.test_count),
+            world.bcast(self.test_nn_indices, root=0),
+            world.bcast(self.test_features, root=0),
+            world.bcast(self.train_features, root=0),
+            world.bcast(self.train_responses, root=0),
+        )
+        self._compare_tensors(
+            self.test_crosswise_diffs, test_crosswise_diffs_chunk
+        )
+        self._compare_tensors(
+            self.test_pairwise_diffs, test_pairwise_diffs_chunk
+        )
+        self._compare_tensors(self.test_nn_targets, test_nn_targets_chunk)
+
+
+class CommunicationTest(parameterized.TestCase):
+    @parameterized.parameters(
+        (
+            (shape, dtype, message_bytes)
+            for shape, dtype in (
+                ((17,), np.itype),
+                ((10, 3, 2), np.ftype),
+                ((3, 4), np.ftype),
+            )
+            for message_bytes in [mpi_utils._MPI_MESSAGE_BYTES, 64, 1]
+        )
+    )
+    def test_scatter_gather(self, shape, dtype, message_bytes):
+        # Shrinking the message size forces transfers to span several rounds.
+        default_bytes = mpi_utils._MPI_MESSAGE_BYTES
+        mpi_utils._MPI_MESSAGE_BYTES = message_bytes
+        try:
+            tensor = np.arange(int(np.prod(shape))).reshape(shape).astype(dtype)
+            chunk = _chunk_tensor(tensor if rank == 0 else None)
+            chunk_sizes = _get_chunk_sizes(shape[0], size)
+            offset = sum(chunk_sizes[:rank])
+            self.assertEqual(chunk.dtype, tensor.dtype)
+            self.assertTrue(
+                np.array_equal(
+                    chunk, tensor[offset : offset + chunk_sizes[rank]]
+                )
+            )
+            self.assertTrue(np.array_equal(_allgather_tensor(chunk), tensor))
+            self.assertTrue(
+                np.array_equal(
+                    _bcast_tensor(tensor if rank == 0 else None), tensor
+                )
+            )
+        finally:
+            mpi_utils._MPI_MESSAGE_BYTES = default_bytes
+
+
+class DistributedNeighborsTest(parameterized.TestCase):
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in [
+                _exact_nn_kwarg_options[0],
+                {"nn_method": "brute_blas"},
+            ]
+        )
+    )
+    def test_distributed_nns(
+        self, train_count, feature_count, nn_count, test_count, nn_kwargs
+    ):
+        if rank == 0:
+            train = _make_gaussian_matrix(train_count, feature_count)
+            test = _make_gaussian_matrix(test_count, feature_count)
+            batch_indices = np.iarray(
+                np.random.choice(train_count, test_count, replace=False)
+            )
+        else:
+            train = None
+            test = None
+            batch_indices = None
+        train = world.bcast(train, root=0)
+        test = world.bcast(test, root=0)
+        batch_indices = world.bcast(batch_indices, root=0)
+
+        chunk_sizes = _get_chunk_sizes(train_count, size)
+        offset = sum(chunk_sizes[:rank])
+        distributed_lookup = NN_Wrapper(
+            train[offset : offset + chunk_sizes[rank]],
+            nn_count,
+            distributed=True,
+            **nn_kwargs,
+        )
+        serial_lookup = NN_Wrapper(train, nn_count, **nn_kwargs)
+
+        nn_indices, nn_dists = distributed_lookup.get_nns(test)
+        serial_indices, serial_dists = serial_lookup.get_nns(test)
+        self.assertTrue(np.all(nn_indices == serial_indices))
+        self.assertTrue(np.allclose(nn_dists, serial_dists))
+
+        nn_indices, nn_dists = distributed_lookup.get_batch_nns(batch_indices)
+        serial_indices, serial_dists = serial_lookup.get_batch_nns(
+            batch_indices
+        )
+        self.assertTrue(np.all(nn_indices == serial_indices))
+        self.assertTrue(np.allclose(nn_dists, serial_dists))
+
 
 class KernelTestCase(TensorsTestCase):
     @classmethod
@@ -1072,6 +1202,95 @@ class MuyGPSTest(MuyGPSTestCase):
             )
             self.assertAlmostEqual(serial_scale[0], parallel_scale[0])
 
+    def test_whitened_scale_optim(self):
+        parallel_scale = analytic_scale_optim_whitened_m(
+            CholeskyFactor(
+                self.batch_homoscedastic_covariance_gen_chunk
+            ).whiten(self.batch_nn_targets_chunk)
+        )
+
+        if rank == 0:
+            serial_scale = analytic_scale_optim_n(
+                self.batch_homoscedastic_covariance_gen,
+                self.batch_nn_targets,
+            )
+            self.assertAlmostEqual(serial_scale[0], parallel_scale[0])
+
+
+class FastPosteriorMeanTest(TensorsTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(FastPosteriorMeanTest, cls).setUpClass()
+
+    def test_fast_posterior_mean(self):
+        muygps = self.muygps_15
+        test_indices = np.arange(self.test_count)
+        if rank == 0:
+            nbrs_lookup = NN_Wrapper(
+                self.train_features,
+                self.nn_count,
+                **_exact_nn_kwarg_options[0],
+            )
+            train_nn_indices, _ = nbrs_lookup.get_batch_nns(
+                np.arange(self.train_count)
+            )
+            test_nn_indices, _ = nbrs_lookup.get_nns(self.test_features)
+            closest_index = test_nn_indices[:, 0]
+            closest_set = fast_nn_update_n(train_nn_indices)[closest_index]
+
+            pairwise_diffs, nn_targets = make_fast_predict_tensors_n(
+                train_nn_indices, self.train_features, self.train_responses
+            )
+            coeffs = muygps_fast_precompute_n(
+                homoscedastic_perturb_n(
+                    muygps.kernel(pairwise_diffs), muygps.noise()
+                ),
+                nn_targets,
+            )
+            Kcross = muygps.kernel(
+                crosswise_tensor_n(
+                    self.test_features,
+                    self.train_features,
+                    test_indices,
+                    closest_set,
+                )
+            )
+            prediction = muygps_fast_posterior_mean_n(
+                Kcross, coeffs[closest_index]
+            )
+        else:
+            train_nn_indices = None
+            closest_index = None
+            closest_set = None
+            coeffs = None
+            prediction = None
+
+        # Each rank owns the coefficients of its chunk of the training data.
+        pairwise_diffs_chunk, nn_targets_chunk = make_fast_predict_tensors_m(
+            train_nn_indices, self.train_features, self.train_responses
+        )
+        coeffs_chunk = muygps_fast_precompute_m(
+            homoscedastic_perturb_m(
+                muygps.kernel(pairwise_diffs_chunk), muygps.noise()
+            ),
+            nn_targets_chunk,
+        )
+        self._compare_tensors(coeffs, coeffs_chunk)
+
+        Kcross_chunk = muygps.kernel(
+            crosswise_tensor_m(
+                self.test_features,
+                self.train_features,
+                test_indices,
+                closest_set,
+            )
+        )
+        prediction_chunk = muygps_fast_posterior_mean_m(
+            Kcross_chunk,
+            fast_coefficients_tensor_m(coeffs_chunk, closest_index),
+        )
+        self._compare_tensors(prediction, prediction_chunk)
+
 
 class OptimTestCase(MuyGPSTestCase):
     @classmethod
@@ -28,6 +28,11 @@ from MuyGPyS._test.utils import (
     _make_heteroscedastic_test_nugget,
     _precision_assert,
 )
+from MuyGPyS.examples.from_indices import (
+    posterior_mean_from_indices,
+    posterior_variance_from_indices,
+    regress_from_indices,
+)
 from MuyGPyS.examples.regress import make_regressor
 from MuyGPyS.examples.classify import make_classifier
 from MuyGPyS.gp import MuyGPS
@@ -37,12 +42,18 @@ from MuyGPyS.gp.deformation import (
     F2,
     l2,
 )
+from MuyGPyS.gp.factor import CholeskyFactor, EigenFactor
 from MuyGPyS.gp.hyperparameter import AnalyticScale, FixedScale, ScalarParam
 from MuyGPyS.gp.kernels import Matern, RBF
 from MuyGPyS.gp.noise import HomoscedasticNoise, HeteroscedasticNoise
 from MuyGPyS.gp.tensors import (
+    locality_order,
     make_train_tensors,
+    make_predict_kernels,
     make_predict_tensors,
+    pack_pairwise_tensor,
+    unpack_pairwise_tensor,
+    Workspace,
 )
 from MuyGPyS.neighbors import NN_Wrapper
 from MuyGPyS.optimize.loss import mse_fn
@@ -470,6 +481,137 @@ class HeteroscedasticNoiseTest(GPTestCase):
         return perturbed_K, Kcross
 
 
+class PackedTensorTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, r, nn, nn_kwargs, kernel, noise_type, tensor_form)
+            for f in [10, 1]
+            for r in [2, 1]
+            for nn in [10, 1]
+            for nn_kwargs in [_basic_nn_kwarg_options[0]]
+            for kernel, tensor_form in (
+                (Matern(smoothness=ScalarParam(1.5)), "diffs"),
+                (Matern(smoothness=ScalarParam(0.7)), "sq_dists"),
+                (RBF(), "sq_dists"),
+            )
+            for noise_type in ["homoscedastic", "heteroscedastic"]
+        )
+    )
+    def test_packed(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        nn_kwargs,
+        kernel,
+        noise_type,
+        tensor_form,
+    ):
+        if noise_type == "homoscedastic":
+            noise = HomoscedasticNoise(1e-3)
+        else:
+            noise = HeteroscedasticNoise(
+                _make_heteroscedastic_test_nugget(test_count, nn_count, 1e-3)
+            )
+        muygps = MuyGPS(kernel, noise=noise, scale=AnalyticScale())
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, response_count
+        )
+        nbrs_lookup = NN_Wrapper(train["input"], nn_count, **nn_kwargs)
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        indices = mm.arange(test_count)
+        tensors = [
+            make_predict_tensors(
+                indices,
+                test_nn_indices,
+                test["input"],
+                train["input"],
+                train["output"],
+                tensor_form=tensor_form,
+                packed=packed,
+            )
+            for packed in [False, True]
+        ]
+        (crosswise, pairwise, nn_targets), (_, packed_pairwise, _) = tensors
+        packed_count = nn_count * (nn_count + 1) // 2
+        self.assertEqual(packed_pairwise.shape[:2], (test_count, packed_count))
+        self.assertTrue(
+            mm.allclose(packed_pairwise, pack_pairwise_tensor(pairwise))
+        )
+        train_pairwise, packed_train_pairwise = (
+            make_train_tensors(
+                indices,
+                test_nn_indices,
+                train["input"],
+                train["output"],
+                tensor_form=tensor_form,
+                packed=packed,
+            )[1]
+            for packed in [False, True]
+        )
+        self.assertTrue(
+            mm.allclose(
+                packed_train_pairwise, pack_pairwise_tensor(train_pairwise)
+            )
+        )
+
+        # The packed tensor is written directly into a packed buffer, without
+        # allocating a dense one.
+        workspace = Workspace()
+        _, workspace_pairwise, _ = make_predict_tensors(
+            indices,
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+            tensor_form=tensor_form,
+            packed=True,
+            workspace=workspace,
+        )
+        self.assertTrue(mm.allclose(workspace_pairwise, packed_pairwise))
+        if config.state.backend == "numpy":
+            self.assertEqual(len(workspace._buffers), 3)
+            self.assertIs(
+                workspace_pairwise,
+                workspace.buffer("pairwise", packed_pairwise.shape),
+            )
+
+        K = muygps.kernel(pairwise, tensor_form=tensor_form)
+        Kcross = muygps.kernel(crosswise, tensor_form=tensor_form)
+        packed_K = muygps.kernel(packed_pairwise, tensor_form=tensor_form)
+        _check_ndarray(
+            self.assertEqual,
+            packed_K,
+            mm.ftype,
+            shape=(test_count, packed_count),
+        )
+        self.assertTrue(mm.allclose(unpack_pairwise_tensor(packed_K), K))
+        self.assertTrue(
+            mm.allclose(
+                muygps.noise.perturb(packed_K),
+                pack_pairwise_tensor(muygps.noise.perturb(K)),
+            )
+        )
+        self.assertTrue(
+            mm.allclose(
+                muygps.posterior_mean(packed_K, Kcross, nn_targets),
+                muygps.posterior_mean(K, Kcross, nn_targets),
+            )
+        )
+        self.assertTrue(
+            mm.allclose(
+                muygps.posterior_variance(packed_K, Kcross),
+                muygps.posterior_variance(K, Kcross),
+            )
+        )
+        scale_fn = muygps.scale.get_opt_fn(muygps)
+        self.assertTrue(
+            mm.allclose(scale_fn(packed_K, nn_targets), scale_fn(K, nn_targets))
+        )
+
+
 class GPSolveTest(GPTestCase):
     @parameterized.parameters(
         (
@@ -867,5 +1009,718 @@ class GPScaleTest(GPTestCase):
             )
 
 
+class FusedKernelTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, nn, kernel, tile_count)
+            for f in [10, 1]
+            for nn in [10, 1]
+            for kernel in (
+                Matern(smoothness=ScalarParam(1.5)),
+                RBF(),
+                Matern(
+                    smoothness=ScalarParam(0.5),
+                    deformation=Anisotropy(
+                        l2,
+                        length_scale0=ScalarParam(0.5),
+                        length_scale1=ScalarParam(2.0),
+                    ),
+                ),
+            )
+            for tile_count in [None, 1, 7, 1000]
+        )
+    )
+    def test_fused(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        nn_count,
+        kernel,
+        tile_count,
+    ):
+        if isinstance(kernel.deformation, Anisotropy):
+            feature_count = 2
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, 1
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        indices = mm.arange(test_count)
+        crosswise_diffs, pairwise_diffs, _ = make_predict_tensors(
+            indices,
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+        )
+        K, Kcross = make_predict_kernels(
+            kernel,
+            indices,
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            tile_count=tile_count,
+        )
+        _check_ndarray(
+            self.assertEqual,
+            K,
+            mm.ftype,
+            shape=(test_count, nn_count, nn_count),
+        )
+        _check_ndarray(
+            self.assertEqual, Kcross, mm.ftype, shape=(test_count, nn_count)
+        )
+        self.assertTrue(mm.allclose(K, kernel(pairwise_diffs)))
+        self.assertTrue(mm.allclose(Kcross, kernel(crosswise_diffs)))
+
+
+class WorkspaceTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, r, nn, tensor_form)
+            for f in [10, 1]
+            for r in [2, 1]
+            for nn in [10, 1]
+            for tensor_form in ["diffs", "sq_dists"]
+        )
+    )
+    def test_workspace(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        tensor_form,
+    ):
+        kernel = Matern(smoothness=ScalarParam(1.5))
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, response_count
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        indices = mm.arange(test_count)
+        args = (
+            indices,
+            test_nn_indices,
+            test["input"],
+            train["input"],
+        )
+        tensors = make_predict_tensors(
+            *args, train["output"], tensor_form=tensor_form
+        )
+        kernels = make_predict_kernels(kernel, *args)
+
+        workspace = Workspace()
+        for _ in range(2):
+            workspace_tensors = make_predict_tensors(
+                *args,
+                train["output"],
+                tensor_form=tensor_form,
+                workspace=workspace,
+            )
+            workspace_kernels = make_predict_kernels(
+                kernel, *args, workspace=workspace
+            )
+            for expected, actual in zip(
+                tensors + kernels, workspace_tensors + workspace_kernels
+            ):
+                self.assertTrue(mm.allclose(expected, actual))
+            if config.state.backend == "numpy":
+                self.assertEqual(len(workspace._buffers), 5)
+                self.assertIs(
+                    workspace_kernels[0],
+                    workspace.buffer("K", (test_count, nn_count, nn_count)),
+                )
+        workspace.clear()
+        self.assertEqual(workspace.nbytes, 0)
+
+    @parameterized.parameters(
+        (
+            (kernel, tensor_form)
+            for kernel in [
+                RBF(),
+                Matern(smoothness=ScalarParam(0.5)),
+                Matern(smoothness=ScalarParam(1.5)),
+                Matern(smoothness=ScalarParam(2.5)),
+                Matern(smoothness=ScalarParam(mm.inf)),
+                Matern(smoothness=ScalarParam(0.7)),
+            ]
+            for tensor_form in ["diffs", "sq_dists"]
+        )
+    )
+    def test_kernel_out(self, kernel, tensor_form):
+        train_count, test_count, feature_count, nn_count = 1000, 100, 10, 10
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, 1
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        crosswise, pairwise, _ = make_predict_tensors(
+            mm.arange(test_count),
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+            tensor_form=tensor_form,
+        )
+        for diffs in [crosswise, pairwise]:
+            expected = kernel(diffs, tensor_form=tensor_form)
+            out = mm.zeros(expected.shape)
+            actual = kernel(diffs, tensor_form=tensor_form, out=out)
+            self.assertTrue(mm.allclose(expected, actual))
+            if config.state.backend == "numpy":
+                self.assertIs(actual, out)
+
+    @parameterized.parameters(
+        (
+            (noise_type, packed)
+            for noise_type in ["homoscedastic", "heteroscedastic"]
+            for packed in [False, True]
+        )
+    )
+    def test_posterior_workspace(self, noise_type, packed):
+        train_count, test_count, feature_count, nn_count = 1000, 100, 10, 10
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, 2
+        )
+        if noise_type == "homoscedastic":
+            noise = HomoscedasticNoise(1e-3)
+        else:
+            noise = HeteroscedasticNoise(1e-3 * mm.ones((test_count, nn_count)))
+        muygps = MuyGPS(Matern(smoothness=ScalarParam(1.5)), noise=noise)
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        crosswise, pairwise, nn_targets = make_predict_tensors(
+            mm.arange(test_count),
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+            packed=packed,
+        )
+        K = muygps.kernel(pairwise)
+        Kcross = muygps.kernel(crosswise)
+        K_copy = muygps.kernel(pairwise)
+
+        perturbed = noise.perturb(K)
+        out = mm.zeros(K.shape)
+        perturbed_out = noise.perturb(K, out=out)
+        self.assertTrue(mm.allclose(perturbed, perturbed_out))
+        self.assertTrue(mm.allclose(K, K_copy))
+        if config.state.backend == "numpy":
+            self.assertIs(perturbed_out, out)
+
+        mean = muygps.posterior_mean(K, Kcross, nn_targets)
+        variance = muygps.posterior_variance(K, Kcross)
+        workspace = Workspace()
+        for _ in range(2):
+            self.assertTrue(
+                mm.allclose(
+                    mean,
+                    muygps.posterior_mean(
+                        K, Kcross, nn_targets, workspace=workspace
+                    ),
+                )
+            )
+            self.assertTrue(
+                mm.allclose(
+                    variance,
+                    muygps.posterior_variance(K, Kcross, workspace=workspace),
+                )
+            )
+            workspace_mean, workspace_variance = muygps.posterior(
+                K, Kcross, nn_targets, workspace=workspace
+            )
+            self.assertTrue(mm.allclose(mean, workspace_mean))
+            self.assertTrue(mm.allclose(variance, workspace_variance))
+        self.assertTrue(mm.allclose(K, K_copy))
+        self.assertEqual(len(workspace._buffers), 1)
+
+
+class ReorderTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, nn, tensor_form)
+            for f in [10, 2]
+            for nn in [10, 1]
+            for tensor_form in ["diffs", "sq_dists"]
+        )
+    )
+    def test_reorder(
+        self, train_count, batch_count, feature_count, nn_count, tensor_form
+    ):
+        train = _make_gaussian_dict(train_count, feature_count, 2)
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        batch_indices = mm.iarray(
+            np.random.choice(train_count, batch_count, replace=False)
+        )
+        batch_nn_indices, _ = nbrs_lookup.get_batch_nns(batch_indices)
+
+        batch_features = train["input"][batch_indices]
+        order, inverse = locality_order(batch_features)
+        self.assertTrue(mm.all(order[inverse] == mm.arange(batch_count)))
+        if feature_count == 2:
+            # Consecutive elements along the curve are much closer together
+            # than consecutive elements of the random batch.
+            def mean_step(features):
+                steps = features[1:] - features[:-1]
+                return np.mean(np.sqrt(np.sum(steps**2, axis=1)))
+
+            self.assertLess(
+                mean_step(batch_features[order]), mean_step(batch_features) / 2
+            )
+
+        args = (batch_indices, batch_nn_indices, train["input"])
+        expected_tensors = make_train_tensors(
+            *args, train["output"], tensor_form=tensor_form
+        )
+        reordered_tensors = make_train_tensors(
+            *args, train["output"], tensor_form=tensor_form, reorder=True
+        )
+        self.assertEqual(len(reordered_tensors), 6)
+        self.assertTrue(mm.all(reordered_tensors[4] == order))
+        self.assertTrue(mm.all(reordered_tensors[5] == inverse))
+        for expected, actual in zip(expected_tensors, reordered_tensors):
+            self.assertTrue(mm.allclose(expected[order], actual))
+
+        expected_tensors = make_predict_tensors(
+            *args, train["input"], train["output"], tensor_form=tensor_form
+        )
+        reordered_tensors = make_predict_tensors(
+            *args,
+            train["input"],
+            train["output"],
+            tensor_form=tensor_form,
+            reorder=True,
+        )
+        self.assertEqual(len(reordered_tensors), 5)
+        for expected, actual in zip(expected_tensors, reordered_tensors):
+            self.assertTrue(mm.allclose(expected[order], actual))
+
+        # Predictions made upon the reordered tensors only need their small
+        # outputs restored to the original order.
+        muygps = MuyGPS(
+            kernel=Matern(smoothness=ScalarParam(1.5)),
+            noise=HomoscedasticNoise(1e-3),
+        )
+        if tensor_form == "sq_dists":
+            muygps = MuyGPS(kernel=RBF(), noise=HomoscedasticNoise(1e-3))
+
+        def predict(crosswise, pairwise, batch_nn_targets, *_):
+            return muygps.posterior_mean(
+                muygps.kernel(pairwise, tensor_form=tensor_form),
+                muygps.kernel(crosswise, tensor_form=tensor_form),
+                batch_nn_targets,
+            )
+
+        self.assertTrue(
+            mm.allclose(
+                predict(*expected_tensors),
+                predict(*reordered_tensors)[inverse],
+            )
+        )
+
+
+class CholeskyFactorTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, r, nn, kwargs)
+            for f in [10, 1]
+            for r in [2, 1]
+            for nn in [10, 3]
+            for kwargs in (
+                {
+                    "kernel": Matern(smoothness=ScalarParam(1.5)),
+                    "noise": HomoscedasticNoise(1e-3),
+                },
+                {
+                    "kernel": RBF(),
+                    "noise": HomoscedasticNoise(1e-3),
+                },
+            )
+        )
+    )
+    def test_factor(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        kwargs,
+    ):
+        muygps = MuyGPS(
+            **kwargs, scale=AnalyticScale(response_count=response_count)
+        )
+        K, Kcross, batch_nn_targets, _, _, _ = self._prepare_tensors(
+            muygps,
+            train_count,
+            test_count,
+            feature_count,
+            response_count,
+            nn_count,
+            _basic_nn_kwarg_options[0],
+        )
+        factor = muygps.factor(K)
+        self.assertEqual(factor.L.shape, (test_count, nn_count, nn_count))
+
+        scale_fn = muygps.scale.get_opt_fn(muygps)
+        self.assertTrue(
+            mm.allclose(
+                scale_fn(factor, batch_nn_targets),
+                scale_fn(K, batch_nn_targets),
+            )
+        )
+        muygps.scale._set(scale_fn(factor, batch_nn_targets))
+        muygps._make()
+        for expected, actual in (
+            (
+                muygps.posterior_mean(K, Kcross, batch_nn_targets),
+                muygps.posterior_mean(factor, Kcross, batch_nn_targets),
+            ),
+            (
+                muygps.posterior_variance(K, Kcross),
+                muygps.posterior_variance(factor, Kcross),
+            ),
+            (
+                muygps.fast_coefficients(K, batch_nn_targets),
+                muygps.fast_coefficients(factor, batch_nn_targets),
+            ),
+        ):
+            self.assertEqual(expected.shape, actual.shape)
+            _check_ndarray(self.assertEqual, actual, mm.ftype)
+            self.assertTrue(mm.allclose(expected, actual))
+        self.assertIs(factor.whiten(Kcross), factor.whiten(Kcross))
+
+    @parameterized.parameters(((nn, r) for nn in [10, 3] for r in [2, 1]))
+    def test_singular_factor(self, nn_count, response_count):
+        if config.state.backend != "numpy":
+            return
+        batch_count = 5
+        K = mm.ones((batch_count, 1, 1)) * mm.eye(nn_count)
+        factor = CholeskyFactor(K)
+        factor.L[1, nn_count - 1, nn_count - 1] = 0.0
+        B = mm.ones((batch_count, nn_count, response_count))
+        with self.assertRaises(np.linalg.LinAlgError):
+            factor.whiten(B)
+        with self.assertRaises(np.linalg.LinAlgError):
+            factor.solve(B)
+
+
+class EigenFactorTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, r, nn, kernel)
+            for f in [10, 1]
+            for r in [2, 1]
+            for nn in [10, 3]
+            for kernel in [Matern(smoothness=ScalarParam(1.5)), RBF()]
+        )
+    )
+    def test_eigen_factor(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        kernel,
+    ):
+        muygps = MuyGPS(
+            kernel=kernel,
+            noise=HomoscedasticNoise(1e-3),
+            scale=AnalyticScale(response_count=response_count),
+        )
+        K, Kcross, batch_nn_targets, _, _, _ = self._prepare_tensors(
+            muygps,
+            train_count,
+            test_count,
+            feature_count,
+            response_count,
+            nn_count,
+            _basic_nn_kwarg_options[0],
+        )
+        factor = EigenFactor(K, 1e-3)
+        self.assertEqual(factor.eigenvalues.shape, (test_count, nn_count))
+        for noise in [1e-4, 1e-2, 1e-1]:
+            noise_muygps = MuyGPS(
+                kernel=kernel,
+                noise=HomoscedasticNoise(noise),
+                scale=AnalyticScale(response_count=response_count),
+            )
+            noise_factor = factor.perturb(noise)
+            self.assertTrue(
+                mm.allclose(noise_factor.K, noise_muygps.noise.perturb(K))
+            )
+            scale_fn = noise_muygps.scale.get_opt_fn(noise_muygps)
+            for expected, actual in (
+                (
+                    scale_fn(K, batch_nn_targets),
+                    scale_fn(noise_factor, batch_nn_targets),
+                ),
+                (
+                    noise_muygps.posterior_mean(K, Kcross, batch_nn_targets),
+                    noise_muygps.posterior_mean(
+                        noise_factor, Kcross, batch_nn_targets
+                    ),
+                ),
+                (
+                    noise_muygps.posterior_variance(K, Kcross),
+                    noise_muygps.posterior_variance(noise_factor, Kcross),
+                ),
+                (
+                    noise_muygps.fast_coefficients(K, batch_nn_targets),
+                    noise_muygps.fast_coefficients(
+                        noise_factor, batch_nn_targets
+                    ),
+                ),
+            ):
+                self.assertEqual(expected.shape, actual.shape)
+                _check_ndarray(self.assertEqual, actual, mm.ftype)
+                self.assertTrue(mm.allclose(expected, actual))
+        self.assertIs(
+            factor.perturb(1e-1)._rotate(Kcross), factor._rotate(Kcross)
+        )
+
+
+class PosteriorTest(GPTestCase):
+    @parameterized.parameters(
+        (
+            (1000, 100, f, r, nn, kwargs)
+            for f in [10, 1]
+            for r in [2, 1]
+            for nn in [10, 3]
+            for kwargs in (
+                {
+                    "kernel": Matern(smoothness=ScalarParam(1.5)),
+                    "noise": HomoscedasticNoise(1e-3),
+                },
+                {
+                    "kernel": RBF(),
+                    "noise": HomoscedasticNoise(1e-3),
+                },
+            )
+        )
+    )
+    def test_posterior(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        kwargs,
+    ):
+        muygps = MuyGPS(
+            **kwargs, scale=FixedScale(response_count=response_count)
+        )
+        muygps.scale._set(mm.arange(1, response_count + 1) * 0.5)
+        muygps._make()
+        K, Kcross, batch_nn_targets, _, _, _ = self._prepare_tensors(
+            muygps,
+            train_count,
+            test_count,
+            feature_count,
+            response_count,
+            nn_count,
+            _basic_nn_kwarg_options[0],
+        )
+        expected = (
+            muygps.posterior_mean(K, Kcross, batch_nn_targets),
+            muygps.posterior_variance(K, Kcross),
+        )
+        for actual in (
+            muygps.posterior(K, Kcross, batch_nn_targets),
+            muygps.posterior(muygps.factor(K), Kcross, batch_nn_targets),
+            muygps.get_opt_posterior_fn()(
+                K, Kcross, batch_nn_targets, noise=muygps.noise()
+            ),
+        ):
+            for e, a in zip(expected, actual):
+                self.assertEqual(e.shape, a.shape)
+                _check_ndarray(self.assertEqual, a, mm.ftype)
+                self.assertTrue(mm.allclose(e, a))
+
+
+class ChunkedPredictionTest(parameterized.TestCase):
+    @parameterized.parameters(
+        (
+            (1000, 101, f, r, 10, chunk_kwargs)
+            for f in [10, 1]
+            for r in [2, 1]
+            for chunk_kwargs in (
+                {"chunk_size": 1},
+                {"chunk_size": 25},
+                {"chunk_size": 1000},
+                {"memory_budget": 2**16},
+                {"memory_budget": 1},
+                {"workers": 3},
+                {"chunk_size": 7, "workers": 2},
+                {"memory_budget": 2**16, "workers": 4},
+            )
+        )
+    )
+    def test_chunked(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        chunk_kwargs,
+    ):
+        muygps = MuyGPS(
+            kernel=Matern(smoothness=ScalarParam(1.5)),
+            noise=HomoscedasticNoise(1e-3),
+        )
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, response_count
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        args = (
+            muygps,
+            mm.arange(test_count),
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+        )
+        expected_mean, expected_variance = regress_from_indices(*args)
+        mean, variance = regress_from_indices(*args, **chunk_kwargs)
+        for expected, actual in (
+            (expected_mean, mean),
+            (expected_variance, variance),
+            (expected_mean, posterior_mean_from_indices(*args, **chunk_kwargs)),
+            (
+                expected_variance,
+                posterior_variance_from_indices(*args, **chunk_kwargs),
+            ),
+        ):
+            self.assertEqual(expected.shape, actual.shape)
+            _check_ndarray(self.assertEqual, actual, mm.ftype)
+            self.assertTrue(mm.allclose(expected, actual))
+
+    @parameterized.parameters(
+        (
+            (1000, 101, 10, 2, 10, workers, chunk_size)
+            for workers in [2, 3, 4]
+            for chunk_size in [None, 7, 13, 40]
+        )
+    )
+    def test_threaded(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        workers,
+        chunk_size,
+    ):
+        muygps = MuyGPS(
+            kernel=Matern(smoothness=ScalarParam(1.5)),
+            noise=HomoscedasticNoise(1e-3),
+            scale=FixedScale(response_count=response_count),
+        )
+        muygps.scale._set(mm.arange(1, response_count + 1) * 0.5)
+        muygps._make()
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, response_count
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        args = (
+            muygps,
+            mm.arange(test_count),
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+        )
+        for fn in (
+            regress_from_indices,
+            posterior_mean_from_indices,
+            posterior_variance_from_indices,
+        ):
+            serial = fn(*args, chunk_size=chunk_size)
+            threaded = fn(*args, chunk_size=chunk_size, workers=workers)
+            if not isinstance(serial, tuple):
+                serial, threaded = (serial,), (threaded,)
+            for expected, actual in zip(serial, threaded):
+                self.assertEqual(expected.shape, actual.shape)
+                _check_ndarray(self.assertEqual, actual, mm.ftype)
+                self.assertTrue(mm.allclose(expected, actual))
+
+    @parameterized.parameters(
+        (
+            (1000, 101, 10, 2, 10, chunk_kwargs)
+            for chunk_kwargs in ({}, {"chunk_size": 25})
+        )
+    )
+    def test_kwargs(
+        self,
+        train_count,
+        test_count,
+        feature_count,
+        response_count,
+        nn_count,
+        chunk_kwargs,
+    ):
+        muygps = MuyGPS(
+            kernel=Matern(smoothness=ScalarParam(1.5)),
+            noise=HomoscedasticNoise(1e-3),
+        )
+        train, test = _make_gaussian_data(
+            train_count, test_count, feature_count, response_count
+        )
+        nbrs_lookup = NN_Wrapper(
+            train["input"], nn_count, **_basic_nn_kwarg_options[0]
+        )
+        test_nn_indices, _ = nbrs_lookup.get_nns(test["input"])
+        args = (
+            muygps,
+            mm.arange(test_count),
+            test_nn_indices,
+            test["input"],
+            train["input"],
+            train["output"],
+        )
+        expected_mean, expected_variance = regress_from_indices(*args)
+
+        posterior = muygps.posterior
+        forwarded = list()
+
+        def recording_posterior(K, Kcross, batch_nn_targets, **kwargs):
+            forwarded.append(kwargs)
+            return posterior(K, Kcross, batch_nn_targets)
+
+        muygps.posterior = recording_posterior
+        mean, variance = regress_from_indices(
+            *args, **chunk_kwargs, flag="value"
+        )
+        self.assertGreater(len(forwarded), 0)
+        for kwargs in forwarded:
+            self.assertEqual(kwargs, {"flag": "value"})
+        self.assertTrue(mm.allclose(expected_mean, mean))
+        self.assertTrue(mm.allclose(expected_variance, variance))
+
+
 if __name__ == "__main__":
     absltest.main()
@@ -20,7 +20,13 @@ from MuyGPyS._test.utils import (
     _consistent_assert,
     _make_gaussian_matrix,
 )
-from MuyGPyS.gp.tensors import crosswise_tensor, pairwise_tensor
+from MuyGPyS.gp.tensors import (
+    crosswise_sq_dists_tensor,
+    crosswise_tensor,
+    make_train_tensors,
+    pairwise_sq_dists_tensor,
+    pairwise_tensor,
+)
 from MuyGPyS.gp.hyperparameter import ScalarParam, FixedScale
 from MuyGPyS.gp.kernels import RBF, Matern
 from MuyGPyS.gp.deformation import Anisotropy, Isotropy, F2, l2
@@ -1067,5 +1073,179 @@ class AnisotropicTest(KernelTest):
         self.assertTrue(mm.allclose(Kcross_iso, Kcross_aniso))
 
 
+class SquaredDistancesTest(KernelTest):
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 10, nn_kwargs, kernel)
+            for f in [100, 10, 2, 1]
+            for nn in [5, 100]
+            for nn_kwargs in [_basic_nn_kwarg_options[0]]
+            for kernel in [
+                RBF(deformation=Isotropy(F2, length_scale=ScalarParam(1.5))),
+                Matern(
+                    smoothness=ScalarParam(0.5),
+                    deformation=Isotropy(l2, length_scale=ScalarParam(0.7)),
+                ),
+                Matern(
+                    smoothness=ScalarParam(2.0),
+                    deformation=Isotropy(l2, length_scale=ScalarParam(1.2)),
+                ),
+            ]
+        )
+    )
+    def test_sq_dists(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        nn_kwargs,
+        kernel,
+    ):
+        train = _make_gaussian_matrix(train_count, feature_count)
+        targets = _make_gaussian_matrix(train_count, 1)
+        nbrs_lookup = NN_Wrapper(train, nn_count, **nn_kwargs)
+        batch_indices = mm.arange(test_count)
+        batch_nn_indices, _ = nbrs_lookup.get_batch_nns(batch_indices)
+        crosswise_diffs, pairwise_diffs, _, _ = make_train_tensors(
+            batch_indices, batch_nn_indices, train, targets
+        )
+        (
+            crosswise_sq_dists,
+            pairwise_sq_dists,
+            _,
+            _,
+        ) = make_train_tensors(
+            batch_indices,
+            batch_nn_indices,
+            train,
+            targets,
+            tensor_form="sq_dists",
+        )
+        _check_ndarray(
+            self.assertEqual,
+            pairwise_sq_dists,
+            mm.ftype,
+            shape=(test_count, nn_count, nn_count),
+        )
+        _check_ndarray(
+            self.assertEqual,
+            crosswise_sq_dists,
+            mm.ftype,
+            shape=(test_count, nn_count),
+        )
+        self.assertTrue(
+            mm.allclose(
+                pairwise_sq_dists,
+                pairwise_sq_dists_tensor(train, batch_nn_indices),
+            )
+        )
+        self.assertTrue(
+            mm.allclose(
+                crosswise_sq_dists,
+                crosswise_sq_dists_tensor(
+                    train, train, batch_indices, batch_nn_indices
+                ),
+            )
+        )
+        self.assertTrue(mm.allclose(pairwise_sq_dists, F2(pairwise_diffs)))
+        self.assertTrue(mm.allclose(crosswise_sq_dists, F2(crosswise_diffs)))
+        self.assertTrue(
+            mm.allclose(
+                kernel(pairwise_sq_dists, tensor_form="sq_dists"),
+                kernel(pairwise_diffs),
+            )
+        )
+        self.assertTrue(
+            mm.allclose(
+                kernel(crosswise_sq_dists, tensor_form="sq_dists"),
+                kernel(crosswise_diffs),
+            )
+        )
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 10, kernel_type, kernel_kwargs, metric)
+            for f in [10, 2]
+            for nn in [5, 100]
+            for kernel_type, kernel_kwargs, metric in [
+                (RBF, dict(), F2),
+                (Matern, {"smoothness": ScalarParam(1.5)}, l2),
+                (Matern, {"smoothness": ScalarParam(0.8)}, l2),
+            ]
+        )
+    )
+    def test_anisotropic_sq_diffs(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        kernel_type,
+        kernel_kwargs,
+        metric,
+    ):
+        train = _make_gaussian_matrix(train_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        nbrs_lookup = NN_Wrapper(train, nn_count, **_basic_nn_kwarg_options[0])
+        nn_indices, _ = nbrs_lookup.get_nns(test)
+        length_scales = {
+            f"length_scale{i}": ScalarParam(0.5 + i)
+            for i in range(feature_count)
+        }
+        kernel = kernel_type(
+            deformation=Anisotropy(metric, **length_scales), **kernel_kwargs
+        )
+        opt_length_scales = {
+            key: 2.0 * param() for key, param in length_scales.items()
+        }
+        for diffs in [
+            pairwise_tensor(train, nn_indices),
+            crosswise_tensor(test, train, np.arange(test_count), nn_indices),
+        ]:
+            sq_diffs, tensor_form = kernel.deformation.precompute(diffs)
+            self.assertEqual(tensor_form, "sq_diffs")
+            self.assertEqual(sq_diffs.shape, diffs.shape)
+            self.assertTrue(
+                mm.allclose(
+                    kernel(sq_diffs, tensor_form=tensor_form),
+                    kernel(diffs),
+                )
+            )
+            opt_fn = kernel.get_opt_fn()
+            self.assertTrue(
+                mm.allclose(
+                    opt_fn(
+                        sq_diffs, tensor_form=tensor_form, **opt_length_scales
+                    ),
+                    opt_fn(diffs, **opt_length_scales),
+                )
+            )
+
+    def test_sq_dists_unsupported(self):
+        sq_dists = mm.ones((5, 3, 3))
+        anisotropic_rbf = RBF(
+            deformation=Anisotropy(
+                F2,
+                length_scale0=ScalarParam(1.0),
+                length_scale1=ScalarParam(1.0),
+            )
+        )
+        with self.assertRaisesRegex(ValueError, "difference tensors"):
+            anisotropic_rbf(sq_dists, tensor_form="sq_dists")
+        with self.assertRaisesRegex(ValueError, "F2 and l2"):
+            Isotropy(lambda diffs: diffs, length_scale=ScalarParam(1.0))(
+                sq_dists, tensor_form="sq_dists"
+            )
+        with self.assertRaisesRegex(ValueError, "Unsupported tensor form"):
+            make_train_tensors(
+                mm.arange(5),
+                mm.zeros((5, 3), dtype=mm.itype),
+                mm.ones((10, 2)),
+                mm.ones((10, 1)),
+                tensor_form="dists",
+            )
+
+
 if __name__ == "__main__":
     absltest.main()
@@ -3,11 +3,14 @@
 #
 # SPDX-License-Identifier: MIT
 
+import tempfile
+
 from absl.testing import absltest
 from absl.testing import parameterized
 
 import MuyGPyS._src.math as mm
 import MuyGPyS._src.math.numpy as np
+from MuyGPyS import config
 from MuyGPyS._test.utils import (
     _basic_nn_kwarg_options,
     _check_ndarray,
@@ -65,6 +68,327 @@ class NeighborsTest(parameterized.TestCase):
         self.assertEqual(nn_indices.shape, (test_count, nn_count))
         self.assertEqual(nn_dists.shape, (test_count, nn_count))
 
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, tile_kwargs)
+            for f in [100, 10, 2, 1]
+            for nn in [5, 10, 100]
+            for tile_kwargs in [
+                {},
+                {"query_tile_size": 17, "train_tile_size": 64},
+                {"query_tile_size": 256, "train_tile_size": 7},
+            ]
+        )
+    )
+    def test_brute_blas_matches_exact(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        tile_kwargs,
+    ):
+        train = _make_gaussian_matrix(train_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        exact_lookup = NN_Wrapper(
+            train, nn_count, nn_method="exact", algorithm="ball_tree"
+        )
+        brute_lookup = NN_Wrapper(
+            train, nn_count, nn_method="brute_blas", **tile_kwargs
+        )
+        exact_indices, exact_dists = exact_lookup.get_nns(test)
+        brute_indices, brute_dists = brute_lookup.get_nns(test)
+        self.assertTrue(mm.all(exact_indices == brute_indices))
+        self.assertTrue(mm.allclose(exact_dists, brute_dists))
+        batch_indices = mm.iarray(
+            np.random.choice(train_count, test_count, replace=False)
+        )
+        exact_indices, exact_dists = exact_lookup.get_batch_nns(batch_indices)
+        brute_indices, brute_dists = brute_lookup.get_batch_nns(batch_indices)
+        self.assertTrue(mm.all(exact_indices == brute_indices))
+        self.assertTrue(mm.allclose(exact_dists, brute_dists))
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in _basic_nn_kwarg_options
+        )
+    )
+    def test_neighbors_length_scales(
+        self, data_count, feature_count, nn_count, batch_count, nn_kwargs
+    ):
+        data = _make_gaussian_matrix(data_count, feature_count)
+        length_scales = mm.array(
+            np.random.uniform(0.1, 10.0, size=feature_count)
+        )
+        nbrs_lookup = NN_Wrapper(data, nn_count, **nn_kwargs)
+        scaled_lookup = NN_Wrapper(
+            data / length_scales, nn_count, nn_method="exact"
+        )
+        batch_indices = mm.iarray(
+            np.random.choice(data_count, batch_count, replace=False)
+        )
+        for _ in range(2):
+            indices, dists = nbrs_lookup.get_batch_nns(
+                batch_indices, length_scales=length_scales
+            )
+            scaled_indices, scaled_dists = scaled_lookup.get_batch_nns(
+                batch_indices
+            )
+            self.assertTrue(mm.all(indices == scaled_indices))
+            self.assertTrue(mm.allclose(dists, scaled_dists))
+            indices, dists = nbrs_lookup.get_nns(
+                data[batch_indices, :] + 0.01, length_scales=length_scales
+            )
+            scaled_indices, scaled_dists = scaled_lookup.get_nns(
+                (data[batch_indices, :] + 0.01) / length_scales
+            )
+            self.assertTrue(mm.all(indices == scaled_indices))
+            self.assertTrue(mm.allclose(dists, scaled_dists))
+            length_scales = 2.0 * length_scales
+            scaled_lookup = NN_Wrapper(
+                data / length_scales, nn_count, nn_method="exact"
+            )
+
+    @parameterized.parameters(
+        (
+            (1000, 10, 10, 101, nn_kwargs)
+            for nn_kwargs in _basic_nn_kwarg_options
+        )
+    )
+    def test_neighbors_workers(
+        self, data_count, feature_count, nn_count, test_count, nn_kwargs
+    ):
+        train = _make_gaussian_matrix(data_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        nbrs_lookup = NN_Wrapper(train, nn_count, **nn_kwargs)
+        batch_indices = mm.arange(test_count)
+        indices, dists = nbrs_lookup.get_nns(test)
+        batch_nn_indices, batch_nn_dists = nbrs_lookup.get_batch_nns(
+            batch_indices
+        )
+        nbrs_lookup.start_workers(2)
+        try:
+            worker_indices, worker_dists = nbrs_lookup.get_nns(test)
+            self.assertTrue(mm.all(indices == worker_indices))
+            self.assertTrue(mm.allclose(dists, worker_dists))
+            worker_nn_indices, worker_nn_dists = nbrs_lookup.get_batch_nns(
+                batch_indices
+            )
+            self.assertTrue(mm.all(batch_nn_indices == worker_nn_indices))
+            self.assertTrue(mm.allclose(batch_nn_dists, worker_nn_dists))
+        finally:
+            nbrs_lookup.stop_workers()
+        self.assertIsNone(nbrs_lookup._workers)
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in _basic_nn_kwarg_options
+        )
+    )
+    def test_neighbors_train_graph(
+        self, data_count, feature_count, nn_count, batch_count, nn_kwargs
+    ):
+        data = _make_gaussian_matrix(data_count, feature_count)
+        nbrs_lookup = NN_Wrapper(data, nn_count, train_graph=True, **nn_kwargs)
+        nbrs_lookup.build_train_graph(chunk_size=128)
+        self.assertEqual(
+            nbrs_lookup._train_graph_indices.shape, (data_count, nn_count)
+        )
+        self.assertEqual(nbrs_lookup._train_graph_indices.dtype, np.int32)
+        for _ in range(2):
+            indices = mm.iarray(
+                np.random.choice(data_count, batch_count, replace=False)
+            )
+            nn_indices, nn_dists = nbrs_lookup.get_batch_nns(indices)
+            _check_ndarray(self.assertEqual, nn_indices, mm.itype)
+            _check_ndarray(self.assertEqual, nn_dists, mm.ftype)
+            self.assertEqual(nn_indices.shape, (batch_count, nn_count))
+            self.assertEqual(nn_dists.shape, (batch_count, nn_count))
+            query_indices, query_dists = nbrs_lookup._get_nns(
+                data[indices, :], nn_count + 1
+            )
+            self.assertTrue(mm.all(nn_indices == query_indices[:, 1:]))
+            self.assertTrue(mm.allclose(nn_dists, query_dists[:, 1:]))
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs, chunk_kwargs)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in _basic_nn_kwarg_options
+            for chunk_kwargs in [
+                {"chunk_size": 7},
+                {"chunk_size": 100},
+                {"memory_budget": 2**12},
+                {},
+            ]
+        )
+    )
+    def test_neighbors_chunked_query(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        nn_kwargs,
+        chunk_kwargs,
+    ):
+        train = _make_gaussian_matrix(train_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        nbrs_lookup = NN_Wrapper(train, nn_count, **nn_kwargs)
+        nn_indices, nn_dists = nbrs_lookup.get_nns(test)
+        expected_start = 0
+        for start, chunk_indices, chunk_dists in nbrs_lookup.get_nns_chunked(
+            test, **chunk_kwargs
+        ):
+            _check_ndarray(self.assertEqual, chunk_indices, mm.itype)
+            _check_ndarray(self.assertEqual, chunk_dists, mm.ftype)
+            self.assertEqual(start, expected_start)
+            end = start + chunk_indices.shape[0]
+            self.assertEqual(chunk_indices.shape, chunk_dists.shape)
+            self.assertTrue(mm.all(chunk_indices == nn_indices[start:end]))
+            self.assertTrue(mm.allclose(chunk_dists, nn_dists[start:end]))
+            expected_start = end
+        self.assertEqual(expected_start, test_count)
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs, add_counts)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in _basic_nn_kwarg_options
+            for add_counts in [[3, 17, 30], [300]]
+        )
+    )
+    def test_neighbors_add_training_points(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        nn_kwargs,
+        add_counts,
+    ):
+        total_count = train_count + sum(add_counts)
+        train = _make_gaussian_matrix(total_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        nbrs_lookup = NN_Wrapper(train[:train_count], nn_count, **nn_kwargs)
+        start = train_count
+        for add_count in add_counts:
+            nbrs_lookup.add_training_points(train[start : start + add_count])
+            start += add_count
+        self.assertEqual(nbrs_lookup.train_count, total_count)
+        self.assertEqual(nbrs_lookup.train.shape, train.shape)
+        self.assertTrue(mm.allclose(nbrs_lookup.train, train))
+
+        nn_indices, nn_dists = nbrs_lookup.get_nns(test)
+        _check_ndarray(self.assertEqual, nn_indices, mm.itype)
+        _check_ndarray(self.assertEqual, nn_dists, mm.ftype)
+        self.assertEqual(nn_indices.shape, (test_count, nn_count))
+        self.assertTrue(mm.all(nn_indices < total_count))
+        batch_indices = mm.arange(train_count - 50, train_count + 50)
+        batch_nn_indices, _ = nbrs_lookup.get_batch_nns(batch_indices)
+        self.assertEqual(batch_nn_indices.shape, (100, nn_count))
+        self.assertFalse(np.any(batch_nn_indices == batch_indices[:, None]))
+
+        if nbrs_lookup.nn_method != "hnsw":
+            full_lookup = NN_Wrapper(train, nn_count, **nn_kwargs)
+            full_indices, full_dists = full_lookup.get_nns(test)
+            self.assertTrue(mm.all(nn_indices == full_indices))
+            self.assertTrue(mm.allclose(nn_dists, full_dists))
+
+    @parameterized.parameters(
+        (
+            (1000, f, nn, 100, nn_kwargs, mmap)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for nn_kwargs in _basic_nn_kwarg_options
+            for mmap in [True, False]
+        )
+    )
+    def test_neighbors_save_load(
+        self,
+        train_count,
+        feature_count,
+        nn_count,
+        test_count,
+        nn_kwargs,
+        mmap,
+    ):
+        train = _make_gaussian_matrix(train_count, feature_count)
+        test = _make_gaussian_matrix(test_count, feature_count)
+        nbrs_lookup = NN_Wrapper(train, nn_count, train_graph=True, **nn_kwargs)
+        nn_indices, nn_dists = nbrs_lookup.get_nns(test)
+        batch_indices = mm.arange(test_count)
+        batch_nn_indices, _ = nbrs_lookup.get_batch_nns(batch_indices)
+        with tempfile.TemporaryDirectory() as path:
+            nbrs_lookup.save(path)
+            loaded_lookup = NN_Wrapper.load(path, mmap=mmap)
+            self.assertEqual(loaded_lookup.nn_count, nn_count)
+            self.assertEqual(loaded_lookup.nn_method, nbrs_lookup.nn_method)
+            self.assertEqual(loaded_lookup.train.shape, train.shape)
+            loaded_indices, loaded_dists = loaded_lookup.get_nns(test)
+            _check_ndarray(self.assertEqual, loaded_indices, mm.itype)
+            _check_ndarray(self.assertEqual, loaded_dists, mm.ftype)
+            self.assertTrue(mm.all(loaded_indices == nn_indices))
+            self.assertTrue(mm.allclose(loaded_dists, nn_dists))
+            self.assertTrue(loaded_lookup.train_graph)
+            loaded_batch_nn_indices, _ = loaded_lookup.get_batch_nns(
+                batch_indices
+            )
+            self.assertTrue(mm.all(loaded_batch_nn_indices == batch_nn_indices))
+            del loaded_lookup
+
+    @parameterized.parameters(
+        (
+            (2000, f, nn, 200, target_recall)
+            for f in [10, 2]
+            for nn in [5, 10]
+            for target_recall in [0.9, 0.99]
+        )
+    )
+    def test_neighbors_hnsw_target_recall(
+        self, train_count, feature_count, nn_count, test_count, target_recall
+    ):
+        if config.state.hnswlib_enabled is False:
+            self.skipTest("hnswlib is not installed")
+        train = _make_gaussian_matrix(train_count, feature_count)
+        nbrs_lookup = NN_Wrapper(
+            train,
+            nn_count,
+            nn_method="hnsw",
+            M=4,
+            ef_construction=20,
+            target_recall=target_recall,
+        )
+        self.assertGreaterEqual(nbrs_lookup.ef, nn_count + 1)
+        self.assertLessEqual(nbrs_lookup.ef, train_count)
+        exact_lookup = NN_Wrapper(train, nn_count, nn_method="exact")
+        batch_indices = mm.iarray(
+            np.random.choice(train_count, test_count, replace=False)
+        )
+        nn_indices, _ = nbrs_lookup.get_batch_nns(batch_indices)
+        exact_indices, _ = exact_lookup.get_batch_nns(batch_indices)
+        hits = sum(
+            len(set(nn_indices[i].tolist()) & set(exact_indices[i].tolist()))
+            for i in range(test_count)
+        )
+        # The calibration sample differs from the batch, so allow some slack.
+        self.assertGreaterEqual(
+            hits / (test_count * nn_count), target_recall - 0.05
+        )
+        with tempfile.TemporaryDirectory() as path:
+            nbrs_lookup.save(path)
+            loaded_lookup = NN_Wrapper.load(path)
+            self.assertEqual(loaded_lookup.ef, nbrs_lookup.ef)
+            del loaded_lookup
+
     # NOTE[bwp] Should we validate actual KNN behavior, or just trust that we
     # are using the APIs correctly and that the libraries work internally? I
     # don't want to try to develop tests for third-party software...
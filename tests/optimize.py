@@ -3,6 +3,8 @@
 #
 # SPDX-License-Identifier: MIT
 
+from functools import partial
+
 from absl.testing import absltest
 from absl.testing import parameterized
 
@@ -21,8 +23,12 @@ from MuyGPyS.gp.deformation import Isotropy, l2
 from MuyGPyS.gp.hyperparameter import AnalyticScale, FixedScale, ScalarParam
 from MuyGPyS.gp.kernels import Matern
 from MuyGPyS.gp.noise import HomoscedasticNoise
+from MuyGPyS.gp.tensors import make_train_tensors
 from MuyGPyS.neighbors import NN_Wrapper
+from MuyGPyS.optimize import L_BFGS_B_optimize
+from MuyGPyS.optimize.batch import sample_batch
 from MuyGPyS.optimize.loss import lool_fn, mse_fn, pseudo_huber_fn, looph_fn
+from MuyGPyS.optimize.objective import make_loo_crossval_fn
 
 if config.state.backend != "numpy":
     raise ValueError("optimize.py only supports the numpy backend at this time")
@@ -225,5 +231,267 @@ class LengthScaleTest(BenchmarkTestCase):
         self.assertLessEqual(median_error, self.length_scale_tol[loss_name])
 
 
+class PrecomputeTest(BenchmarkTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(PrecomputeTest, cls).setUpClass()
+
+    def _make_muygps(self):
+        return MuyGPS(
+            kernel=Matern(
+                smoothness=ScalarParam(self.params["smoothness"]()),
+                deformation=Isotropy(
+                    metric=l2,
+                    length_scale=ScalarParam(
+                        0.5, self.params["length_scale"].get_bounds()
+                    ),
+                ),
+            ),
+            noise=HomoscedasticNoise(self.params["noise"]()),
+        )
+
+    def _sample(self, batch_count, nn_count):
+        nbrs_lookup = NN_Wrapper(
+            self.train_features, nn_count, **_basic_nn_kwarg_options[0]
+        )
+        return sample_batch(nbrs_lookup, batch_count, self.train_count)
+
+    def _make_tensors(self, batch_indices, batch_nn_indices, tensor_form):
+        return make_train_tensors(
+            batch_indices,
+            batch_nn_indices,
+            self.train_features,
+            self.train_responses[0],
+            tensor_form=tensor_form,
+        )
+
+    @parameterized.parameters(
+        (
+            (250, 20, loss_fn, loss_kwargs)
+            for loss_fn, loss_kwargs in [
+                [lool_fn, dict()],
+                [looph_fn, {"boundary_scale": 3.0}],
+            ]
+        )
+    )
+    def test_precomputed_objective(
+        self, batch_count, nn_count, loss_fn, loss_kwargs
+    ):
+        muygps = self._make_muygps()
+        (
+            crosswise_diffs,
+            pairwise_diffs,
+            batch_targets,
+            batch_nn_targets,
+        ) = self._make_tensors(*self._sample(batch_count, nn_count), "diffs")
+        deformation = muygps.kernel.deformation
+        pairwise_sq_dists, _ = deformation.precompute(pairwise_diffs)
+        crosswise_sq_dists, tensor_form = deformation.precompute(
+            crosswise_diffs
+        )
+        self.assertEqual(tensor_form, "sq_dists")
+        self.assertEqual(pairwise_sq_dists.shape, pairwise_diffs.shape[:-1])
+        obj_fns = [
+            make_loo_crossval_fn(
+                loss_fn,
+                kernel_fn,
+                muygps.get_opt_mean_fn(),
+                muygps.get_opt_var_fn(),
+                muygps.scale.get_opt_fn(muygps),
+                pairwise,
+                crosswise,
+                batch_nn_targets,
+                batch_targets,
+                loss_kwargs=loss_kwargs,
+            )
+            for kernel_fn, pairwise, crosswise in [
+                (muygps.kernel.get_opt_fn(), pairwise_diffs, crosswise_diffs),
+                (
+                    partial(muygps.kernel.get_opt_fn(), tensor_form="sq_dists"),
+                    pairwise_sq_dists,
+                    crosswise_sq_dists,
+                ),
+            ]
+        ]
+        for length_scale in [0.01, 0.1, 1.0]:
+            self.assertAlmostEqual(
+                obj_fns[0](length_scale=length_scale),
+                obj_fns[1](length_scale=length_scale),
+            )
+
+    def test_precomputed_optimize(self):
+        batch_indices, batch_nn_indices = self._sample(250, 20)
+        length_scales = list()
+        for tensor_form in ["diffs", "sq_dists"]:
+            (
+                crosswise,
+                pairwise,
+                batch_targets,
+                batch_nn_targets,
+            ) = self._make_tensors(batch_indices, batch_nn_indices, tensor_form)
+            muygps = L_BFGS_B_optimize(
+                self._make_muygps(),
+                batch_targets,
+                batch_nn_targets,
+                crosswise,
+                pairwise,
+                tensor_form=tensor_form,
+            )
+            length_scales.append(muygps.kernel.deformation.length_scale())
+        self.assertAlmostEqual(length_scales[0], length_scales[1])
+
+
+class PosteriorObjectiveTest(BenchmarkTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(PosteriorObjectiveTest, cls).setUpClass()
+
+    @parameterized.parameters(
+        (
+            (250, 20, loss_fn, loss_kwargs)
+            for loss_fn, loss_kwargs in [
+                [lool_fn, dict()],
+                [looph_fn, {"boundary_scale": 3.0}],
+                [mse_fn, dict()],
+            ]
+        )
+    )
+    def test_posterior_objective(
+        self, batch_count, nn_count, loss_fn, loss_kwargs
+    ):
+        muygps = MuyGPS(
+            kernel=Matern(
+                smoothness=ScalarParam(self.params["smoothness"]()),
+                deformation=Isotropy(
+                    metric=l2,
+                    length_scale=ScalarParam(self.params["length_scale"]()),
+                ),
+            ),
+            noise=HomoscedasticNoise(
+                self.params["noise"](), self.params["noise"].get_bounds()
+            ),
+            scale=AnalyticScale(),
+        )
+        nbrs_lookup = NN_Wrapper(
+            self.train_features, nn_count, **_basic_nn_kwarg_options[0]
+        )
+        batch_indices, batch_nn_indices = sample_batch(
+            nbrs_lookup, batch_count, self.train_count
+        )
+        (
+            crosswise_diffs,
+            pairwise_diffs,
+            batch_targets,
+            batch_nn_targets,
+        ) = make_train_tensors(
+            batch_indices,
+            batch_nn_indices,
+            self.train_features,
+            self.train_responses[0],
+        )
+        obj_fns = [
+            make_loo_crossval_fn(
+                loss_fn,
+                muygps.kernel.get_opt_fn(),
+                muygps.get_opt_mean_fn(),
+                muygps.get_opt_var_fn(),
+                muygps.scale.get_opt_fn(muygps),
+                pairwise_diffs,
+                crosswise_diffs,
+                batch_nn_targets,
+                batch_targets,
+                loss_kwargs=loss_kwargs,
+                posterior_fn=posterior_fn,
+            )
+            for posterior_fn in [None, muygps.get_opt_posterior_fn()]
+        ]
+        for noise in [1e-4, 1e-2, 1e-1]:
+            self.assertAlmostEqual(
+                obj_fns[0](noise=noise), obj_fns[1](noise=noise)
+            )
+
+
+class EigenObjectiveTest(BenchmarkTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super(EigenObjectiveTest, cls).setUpClass()
+
+    @parameterized.parameters(
+        (
+            (250, 20, loss_fn, loss_kwargs, scale)
+            for loss_fn, loss_kwargs, scale in [
+                [lool_fn, dict(), AnalyticScale()],
+                [looph_fn, {"boundary_scale": 3.0}, AnalyticScale()],
+                [mse_fn, dict(), FixedScale()],
+            ]
+        )
+    )
+    def test_eigen_objective(
+        self, batch_count, nn_count, loss_fn, loss_kwargs, scale
+    ):
+        muygps = MuyGPS(
+            kernel=Matern(
+                smoothness=ScalarParam(self.params["smoothness"]()),
+                deformation=Isotropy(
+                    metric=l2,
+                    length_scale=ScalarParam(self.params["length_scale"]()),
+                ),
+            ),
+            noise=HomoscedasticNoise(
+                self.params["noise"](), self.params["noise"].get_bounds()
+            ),
+            scale=scale,
+        )
+        nbrs_lookup = NN_Wrapper(
+            self.train_features, nn_count, **_basic_nn_kwarg_options[0]
+        )
+        batch_indices, batch_nn_indices = sample_batch(
+            nbrs_lookup, batch_count, self.train_count
+        )
+        (
+            crosswise_diffs,
+            pairwise_diffs,
+            batch_targets,
+            batch_nn_targets,
+        ) = make_train_tensors(
+            batch_indices,
+            batch_nn_indices,
+            self.train_features,
+            self.train_responses[0],
+        )
+        obj_fns = [
+            make_loo_crossval_fn(
+                loss_fn,
+                muygps.kernel.get_opt_fn(),
+                muygps.get_opt_mean_fn(),
+                muygps.get_opt_var_fn(),
+                muygps.scale.get_opt_fn(muygps),
+                pairwise_diffs,
+                crosswise_diffs,
+                batch_nn_targets,
+                batch_targets,
+                loss_kwargs=loss_kwargs,
+                posterior_fn=muygps.get_opt_posterior_fn(),
+                eigen_noise=eigen_noise,
+            )
+            for eigen_noise in [None, muygps.noise]
+        ]
+        for noise in [1e-4, 1e-2, 1e-1]:
+            self.assertAlmostEqual(
+                obj_fns[0](noise=noise), obj_fns[1](noise=noise)
+            )
+        self.assertAlmostEqual(obj_fns[0](), obj_fns[1]())
+
+        # The eigendecomposed objective reads the noise model when called, so
+        # it follows updates made after it was built.
+        before = obj_fns[1]()
+        muygps.noise._set_val(1e-3)
+        self.assertNotAlmostEqual(before, obj_fns[1]())
+        self.assertAlmostEqual(obj_fns[0](), obj_fns[1]())
+        self.assertAlmostEqual(
+            obj_fns[0](noise=mm.array(1e-4)), obj_fns[1](noise=mm.array(1e-4))
+        )
+
+
 if __name__ == "__main__":
     absltest.main()